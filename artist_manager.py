@@ -0,0 +1,79 @@
+class ArtistManager:
+    """Blits the dynamic artists of a figure over a cached background of its static ones.
+
+    Static geometry (plates, paper, labels, legends, profiles) is drawn once by
+    a full canvas draw and cached. Each frame only restores that background
+    and redraws the dynamic artists, so frame time does not depend on how much
+    static content the figure holds.
+
+    Data that accumulates over a run, such as landed dots, stays in ordinary
+    artists so that full redraws (resizes, video frames) remain correct. New
+    points are painted into the cached background once with bake(), so the
+    per-frame cost does not grow with the number of points either.
+    """
+
+    def __init__(self, fig, dynamic_artists=()):
+        self.fig = fig
+        self.canvas = fig.canvas
+        self.dynamic = []
+        self._background = None
+        self._timer = None
+        for artist in dynamic_artists:
+            self.add_dynamic(artist)
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def add_dynamic(self, artist):
+        """Registers an artist that is redrawn on every frame."""
+        artist.set_animated(True)
+        self.dynamic.append(artist)
+        return artist
+
+    def invalidate(self):
+        """Drops the cached background (e.g. after clearing baked data); the next update redraws fully."""
+        self._background = None
+
+    def _on_draw(self, event):
+        # Full draws skip animated artists: cache what was drawn, then add them
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_dynamic()
+
+    def _draw_dynamic(self):
+        for artist in self.dynamic:
+            self.fig.draw_artist(artist)
+
+    def bake(self, artist):
+        """Paints `artist` (an animated artist holding only new data) into the cached background."""
+        if self._background is None:
+            return  # The next full draw includes the data anyway
+        self.canvas.restore_region(self._background)
+        self.fig.draw_artist(artist)
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+
+    def update(self):
+        """Shows the current state of the dynamic artists."""
+        if self._background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_dynamic()
+        self.canvas.blit(self.fig.bbox)
+        self.canvas.flush_events()
+
+    def play(self, func, frames, interval_ms, init_func=None):
+        """Interactive playback: calls func(frame) on a canvas timer and blits after each frame."""
+        frame_iter = iter(range(frames))
+        if init_func is not None:
+            init_func()
+
+        def step():
+            frame = next(frame_iter, None)
+            if frame is None:
+                self._timer.stop()
+                return
+            func(frame)
+            self.update()
+
+        self._timer = self.canvas.new_timer(interval=max(1, int(interval_ms)))
+        self._timer.add_callback(step)
+        self._timer.start()
+        return self._timer
@@ -0,0 +1,183 @@
+import contextlib
+import inspect
+import itertools
+import json
+import platform
+import sys
+import timeit
+import numpy as np
+
+DEFAULT_BASELINE = 'bench_baseline.json'
+DEFAULT_THRESHOLD = 0.20    # A benchmark regresses when it is >20% slower than its baseline
+
+
+# Benchmarks: each setup function returns the zero-argument callable to time, or yields it
+# when it has to clean up after the timing
+
+def bench_calculate_positions():
+    from trajectory import calculate_positions
+    from printer_config import DEFAULT_CONFIG as p
+    idx = np.arange(p.N_dots_total)
+    t_flight = np.linspace(0, p.T_total_flight, p.N_dots_total)
+    return lambda: calculate_positions(idx, t_flight, p.V_required_full)
+
+
+def _consecutive_frames(animate, start, n_frames):
+    # animate() is stateful, so every call advances to the next frame (wrapping at the end)
+    frames = itertools.cycle(range(start, n_frames))
+    return lambda: animate(next(frames))
+
+
+def bench_script2_animate():
+    import script2
+    script2.init()
+    for frame in range(1000):
+        script2.animate(frame)
+    return _consecutive_frames(script2.animate, 1000, script2.TOTAL_ANIMATION_FRAMES)
+
+
+def bench_script4a_animate():
+    from plate_animation import build_animation
+    from sweep import SCRIPT4_VARIANTS
+    anim = build_animation(SCRIPT4_VARIANTS[0])
+    anim.init()
+    for frame in range(1000):
+        anim.animate(frame)
+    return _consecutive_frames(anim.animate, 1000, anim.frames)
+
+
+def bench_script5_trajectories():
+    from script5 import V1_required, V2_required
+    from trajectory3d import calculate_trajectories
+    return lambda: calculate_trajectories(V1_required, V2_required, num_points=20)
+
+
+def bench_simulate_column():
+    from simulation import simulate
+    return lambda: simulate()
+
+
+def bench_simulate_column_rk4():
+    from simulation import simulate
+    return lambda: simulate(integrator='rk4')
+
+
+def bench_simulate_column_interacting():
+    from simulation import simulate
+    return lambda: simulate(interactions=True)
+
+
+def bench_simulate_column_cached():
+    import tempfile
+    from result_cache import ResultCache
+    with tempfile.TemporaryDirectory(prefix='bench_cache_') as tmp:
+        cache = ResultCache(tmp, analytic=True)
+        cache.simulate()
+        yield lambda: cache.simulate()
+
+
+def bench_printhead_128():
+    from printhead import simulate_printhead
+    return lambda: simulate_printhead(n_nozzles=128)
+
+
+def bench_page_full():
+    from page import simulate_page
+    return lambda: simulate_page()
+
+
+def bench_incremental_charge_edit():
+    from incremental import IncrementalSimulation
+    from printer_config import DEFAULT_CONFIG
+    engine = IncrementalSimulation()
+    halved = DEFAULT_CONFIG.replace(DROPLET_CHARGE=DEFAULT_CONFIG.DROPLET_CHARGE / 2)
+    configs = itertools.cycle([DEFAULT_CONFIG, halved])
+    engine.simulate(next(configs))
+    return lambda: engine.simulate(next(configs))
+
+
+def bench_sweep_script4():
+    from sweep import SCRIPT4_VARIANTS, run_sweep
+    return lambda: run_sweep(SCRIPT4_VARIANTS, workers=1)
+
+
+BENCHMARKS = {
+    'calculate_positions': bench_calculate_positions,
+    'script2_animate': bench_script2_animate,
+    'script4a_animate': bench_script4a_animate,
+    'script5_trajectories': bench_script5_trajectories,
+    'simulate_column': bench_simulate_column,
+    'simulate_column_rk4': bench_simulate_column_rk4,
+    'simulate_column_interacting': bench_simulate_column_interacting,
+    'simulate_column_cached': bench_simulate_column_cached,
+    'printhead_128': bench_printhead_128,
+    'page_full': bench_page_full,
+    'incremental_charge_edit': bench_incremental_charge_edit,
+    'sweep_script4': bench_sweep_script4,
+}
+
+
+def time_call(func, repeats=5):
+    """Best time per call in seconds; each repeat loops for at least 0.2 s."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeats, number=number)) / number
+
+
+def run_benchmark(name, repeats=5):
+    """Seconds per call of benchmark `name`; a generator setup is closed once timed."""
+    setup = BENCHMARKS[name]()
+    if not inspect.isgenerator(setup):
+        return time_call(setup, repeats)
+    with contextlib.closing(setup):
+        return time_call(next(setup), repeats)
+
+
+def run_benchmarks(names=None, repeats=5):
+    """{name: seconds per call} for the selected benchmarks, run on the Agg backend."""
+    import matplotlib
+    matplotlib.use('Agg')
+    return {name: run_benchmark(name, repeats) for name in (names or BENCHMARKS)}
+
+
+def environment():
+    return {'python': platform.python_version(), 'numpy': np.__version__,
+            'machine': platform.machine(), 'processor': platform.processor()}
+
+
+def save_baseline(results, path=DEFAULT_BASELINE):
+    with open(path, 'w') as f:
+        json.dump({'environment': environment(), 'results': results}, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path=DEFAULT_BASELINE):
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Rows (name, baseline_s, new_s, ratio, regressed) for benchmarks present in both."""
+    rows = []
+    for name, seconds in results.items():
+        if name in baseline:
+            ratio = seconds / baseline[name]
+            rows.append((name, baseline[name], seconds, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def report(results, baseline=None, threshold=DEFAULT_THRESHOLD):
+    """Prints the results (against `baseline` if given); returns True if anything regressed."""
+    rows = compare(results, baseline or {}, threshold)
+    compared = {row[0]: row for row in rows}
+    for name, seconds in results.items():
+        line = f"{name:<22} {seconds*1e3:10.3f} ms"
+        if name in compared:
+            _, base, _, ratio, regressed = compared[name]
+            line += f"   baseline {base*1e3:10.3f} ms   x{ratio:.2f}" + ('   REGRESSION' if regressed else '')
+        print(line)
+    return any(row[4] for row in rows)
+
+
+if __name__ == '__main__':
+    results = run_benchmarks(sys.argv[1:] or None)
+    sys.exit(1 if report(results) else 0)
@@ -1,9 +1,12 @@
-import numpy as np
-from constants import * 
+import math
+from constants import *
+
+# Cheap scalars are computed at import; arrays and animation timing are
+# computed on first access by the module __getattr__ below and memoized.
 
 # Droplet Kinematics
 R = DROPLET_DIAMETER / 2
-m = DROPLET_DENSITY * (4/3) * np.pi * R**3 
+m = DROPLET_DENSITY * (4/3) * math.pi * R**3
 q_over_m_abs = abs(DROPLET_CHARGE) / m
 
 # Geometric Parameters (Aliases)
@@ -14,36 +17,103 @@ L_gun_to_cap = D - CAPACITOR_LENGTH - CAPACITOR_DISTANCE
 
 # Time and Firing Parameters (Based on Vx and geometry)
 T_flight_capacitor = CAPACITOR_LENGTH / Vx
-f_fire = 1.0 / T_flight_capacitor 
+f_fire = 1.0 / T_flight_capacitor
 T_interval = T_flight_capacitor
-N_dots_total = int(PAPER_HEIGHT * PRINTER_RESOLUTION) 
+N_dots_total = int(PAPER_HEIGHT * PRINTER_RESOLUTION)
 
-T_total_flight = D / Vx 
-MAX_DROPS_IN_FLIGHT = int(np.ceil(T_total_flight / T_interval)) 
+T_total_flight = D / Vx
+MAX_DROPS_IN_FLIGHT = int(math.ceil(T_total_flight / T_interval))
 
 # Calculate the deflection constant (K_deflect)
 K_deflect = (1.0 / q_over_m_abs) * (W * Vx**2) / (CAPACITOR_LENGTH * (CAPACITOR_LENGTH/2 + CAPACITOR_DISTANCE))
 
 # Target Y-Positions
-paper_height_m = PAPER_HEIGHT * INCHES_2_METERS 
+paper_height_m = PAPER_HEIGHT * INCHES_2_METERS
 y_full_max_deflection = paper_height_m / 2
 N_dots_paper = N_dots_total
-y_positions = np.linspace(-y_full_max_deflection, y_full_max_deflection, N_dots_paper)
+
+# Visual Scaling for Y-axis
+y_min_max_visible = (W / 2) * 1.5
+
+
+def _value(name):
+    return globals()[name] if name in globals() else __getattr__(name)
+
+
+def _y_positions():
+    import numpy as np
+    return np.linspace(-y_full_max_deflection, y_full_max_deflection, N_dots_paper)
+
 
 # Required Voltage Array and Max Voltage
-V_required_full = y_positions * K_deflect * np.sign(DROPLET_CHARGE)
-V_max_practical = np.max(np.abs(V_required_full)) 
+def _V_required_full():
+    import numpy as np
+    return _value('y_positions') * K_deflect * np.sign(DROPLET_CHARGE)
+
+
+def _V_max_practical():
+    import numpy as np
+    return np.max(np.abs(_value('V_required_full')))
+
 
 # Animation Parameters
-animation_indices = np.linspace(0, N_dots_total - 1, N_dots_total, dtype=int)
-y_positions_visible = y_positions[animation_indices] 
+def _animation_indices():
+    import numpy as np
+    return np.linspace(0, N_dots_total - 1, N_dots_total, dtype=int)
+
+
+def _y_positions_visible():
+    return _value('y_positions')[_value('animation_indices')]
 
-# Visual Scaling for Y-axis
-y_min_max_visible = (W / 2) * 1.5 
 
 # Final Animation Timing
-T_last_fire = (N_dots_total - 1) * T_interval
-T_last_land = T_last_fire + T_total_flight
-GLOBAL_TIME_STEP = T_interval / FRAMES_PER_DOT_INTERVAL
-TOTAL_ANIMATION_FRAMES = int(np.ceil(T_last_land / GLOBAL_TIME_STEP))
-interval_ms = (GLOBAL_TIME_STEP * 1000) / ANIMATION_SPEED_FACTOR
\ No newline at end of file
+def _T_last_fire():
+    return (N_dots_total - 1) * T_interval
+
+
+def _T_last_land():
+    return _value('T_last_fire') + T_total_flight
+
+
+def _GLOBAL_TIME_STEP():
+    return T_interval / FRAMES_PER_DOT_INTERVAL
+
+
+def _TOTAL_ANIMATION_FRAMES():
+    return int(math.ceil(_value('T_last_land') / _value('GLOBAL_TIME_STEP')))
+
+
+def _interval_ms():
+    return (_value('GLOBAL_TIME_STEP') * 1000) / ANIMATION_SPEED_FACTOR
+
+
+_LAZY = {
+    'y_positions': _y_positions,
+    'V_required_full': _V_required_full,
+    'V_max_practical': _V_max_practical,
+    'animation_indices': _animation_indices,
+    'y_positions_visible': _y_positions_visible,
+    'T_last_fire': _T_last_fire,
+    'T_last_land': _T_last_land,
+    'GLOBAL_TIME_STEP': _GLOBAL_TIME_STEP,
+    'TOTAL_ANIMATION_FRAMES': _TOTAL_ANIMATION_FRAMES,
+    'interval_ms': _interval_ms,
+}
+
+
+def __getattr__(name):
+    """Computes a lazy attribute on first access and stores it as a plain module global."""
+    try:
+        factory = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = globals()[name] = factory()
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
+# `from calculations import *` still provides every name, lazy ones included
+__all__ = [name for name in globals() if not name.startswith('_') and name != 'math'] + list(_LAZY)
@@ -0,0 +1,411 @@
+import argparse
+import contextlib
+import csv
+import dataclasses
+import sys
+import numpy as np
+from printer_config import PARAMETER_NAMES, PARAMETER_TYPES, as_config
+
+# Peak bytes per droplet of the interaction model (measured with tracemalloc, as page.BYTES_PER_DROPLET)
+INTERACTION_BYTES_PER_DROPLET = 320
+
+# Render targets: the capacitor-plate animation (configurable) and the two module-level scripts
+RENDER_TARGETS = {
+    'plate': 'plate_animation.mp4',
+    'script2': 'q2.mp4',
+    'script5': 'H_letter_animation.mp4',
+}
+
+
+def parse_value(name, text):
+    """`text` as the type of parameter `name`: int parameters such as NOZZLE_COUNT take whole numbers only."""
+    kind = PARAMETER_TYPES[name]
+    try:
+        return kind(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{name} takes {kind.__name__} values, got {text!r}") from None
+
+
+def parse_overrides(assignments):
+    """{'NAME': value} from ['NAME=value', ...]; names must be constants.py parameters."""
+    overrides = {}
+    for assignment in assignments or ():
+        name, sep, value = assignment.partition('=')
+        if not sep or name not in PARAMETER_NAMES:
+            raise argparse.ArgumentTypeError(f"expected NAME=VALUE with NAME one of the constants.py "
+                                             f"parameters, got {assignment!r}")
+        overrides[name] = parse_value(name, value)
+    return overrides
+
+
+def parse_grid(axes):
+    """{'NAME': [values]} from ['NAME=v1,v2,...', ...]."""
+    grid = {}
+    for axis in axes or ():
+        name, sep, values = axis.partition('=')
+        if not sep or name not in PARAMETER_NAMES:
+            raise argparse.ArgumentTypeError(f"expected NAME=v1,v2,... got {axis!r}")
+        grid[name] = [parse_value(name, value) for value in values.split(',')]
+    return grid
+
+
+def _cutoff(args):
+    """--cutoff in metres, which only the --interactions model takes."""
+    if args.cutoff is not None and not args.interactions:
+        raise argparse.ArgumentTypeError("--cutoff applies to --interactions only")
+    return args.cutoff
+
+
+def _result_cache(args):
+    """The on-disk ResultCache unless --no-cache was given; analytic runs only with --cache-analytic."""
+    if args.no_cache:
+        return None
+    from result_cache import ResultCache
+    return ResultCache(analytic=getattr(args, 'cache_analytic', False))
+
+
+def _result_writer(args, config, page=False):
+    """ResultWriter for `simulate --store`, with the run's settings as metadata."""
+    from result_store import PAGE_COLUMNS, RECORD_COLUMNS, ResultWriter
+    metadata = {'config': config.overrides(), 'integrator': args.integrator, 'interactions': args.interactions,
+                'inverse': args.inverse, 'image': args.image, 'threshold': args.threshold}
+    return ResultWriter(args.store, PAGE_COLUMNS if page else RECORD_COLUMNS, metadata=metadata)
+
+
+def _max_slots(args):
+    """Firing slots per simulate() call of an image run that fit in --memory-mb."""
+    from page import BYTES_PER_DROPLET
+    per_slot = INTERACTION_BYTES_PER_DROPLET if args.interactions else BYTES_PER_DROPLET[args.integrator]
+    return max(1, int(args.memory_mb * 2**20 // per_slot))
+
+
+def _slot_runs(schedule, max_slots):
+    """Groups consecutive FiringBatches into lists spanning at most max_slots slots (at least one batch)."""
+    run = []
+    for batch in schedule:
+        if run and batch.slot[-1] + 1 - run[0].slot[0] > max_slots:
+            yield run
+            run = []
+        run.append(batch)
+    if run:
+        yield run
+
+
+# Subcommands
+
+def cmd_simulate(args):
+    from simulation import simulate
+    config = as_config(parse_overrides(args.set))
+    cache = _result_cache(args)
+    if cache is not None:
+        simulate = cache.simulate
+    cutoff = _cutoff(args)
+    table = None
+    if args.inverse:
+        if args.integrator is None:
+            raise argparse.ArgumentTypeError("--inverse needs --integrator: the analytic model is already exact")
+        from inverse import inverse_table
+        table = inverse_table(config, method=args.integrator)
+        print(f"Inverse table: {len(table.y)} samples, reach {table.y_range[0] * 1e3:.3f} to "
+              f"{table.y_range[1] * 1e3:.3f} mm, interpolation error below {table.max_error:.2e} m")
+
+    if args.image is None:
+        voltages = None
+        if table is not None:
+            voltages = table.voltages(config.y_positions)
+            reachable = np.isfinite(voltages)
+            print(f"Unreachable targets: {np.count_nonzero(~reachable)}")
+            voltages = voltages[reachable]
+        result = simulate(config, voltages=voltages, integrator=args.integrator, interactions=args.interactions,
+                          cutoff=cutoff)
+        if args.store:
+            with _result_writer(args, config) as store:
+                store.append_result(result, target_y=None if table is None else config.y_positions[reachable])
+        print(f"Droplets: {result.n_droplets}  landed: {result.n_success}  hit a plate: {result.n_failed}")
+        print(f"Max voltage: {np.max(np.abs(result.voltage)):.2f} V")
+        if table is not None:
+            error = np.abs(result.landing_y - config.y_positions[reachable])
+            print(f"Max landing error: {np.nanmax(error, initial=0.0):.2e} m")
+        if args.output:
+            np.savez(args.output, **{field.name: getattr(result, field.name)
+                                     for field in dataclasses.fields(result)})
+        return 0
+
+    # Page: the image columns' firing slots, simulated a memory-bounded run of columns at a time
+    from droplet_state import LANDED
+    from raster import firing_schedule
+    from result_store import status_codes
+    lines = []
+    with _result_writer(args, config, page=True) if args.store else contextlib.nullcontext() as store:
+        schedule = firing_schedule(args.image, config, threshold=args.threshold, table=table)
+        for batches in _slot_runs(schedule, _max_slots(args)):
+            # Every slot of the run, NaN where no droplet is fired: blank pixels and unreachable targets
+            first = batches[0].slot[0]
+            voltages = np.full(batches[-1].slot[-1] + 1 - first, np.nan)
+            for batch in batches:
+                voltages[batch.slot - first] = batch.voltage
+            result = simulate(config, voltages=voltages, integrator=args.integrator,
+                              interactions=args.interactions, cutoff=cutoff)
+            failed = status_codes(result) != LANDED
+            for batch in batches:
+                reachable = np.isfinite(batch.voltage)
+                index = batch.slot[reachable] - first
+                if store is not None:
+                    store.append_result(result, fire_time=batch.fire_time[reachable],
+                                        target_y=batch.target_y[reachable], index=index,
+                                        row=batch.row[reachable], column=batch.column)
+                lines.append((batch.column, index.size, np.count_nonzero(failed[index]),
+                              np.count_nonzero(~reachable)))
+    n_droplets = sum(line[1] for line in lines)
+    n_failed = sum(line[2] for line in lines)
+    n_unreachable = sum(line[3] for line in lines)
+    print(f"Columns with ink: {len(lines)}  droplets: {n_droplets}  hit a plate: {n_failed}"
+          + (f"  unreachable: {n_unreachable}" if table is not None else ''))
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['column', 'n_droplets', 'n_failed', 'n_unreachable'])
+            writer.writerows(lines)
+    return 0
+
+
+def cmd_sweep(args):
+    from sweep import SCRIPT4_VARIANTS, grid, print_table, run_sweep, save_table
+    fixed = parse_overrides(args.set)
+    axes = parse_grid(args.grid)
+    points = grid(**axes) if axes else SCRIPT4_VARIANTS
+    table = run_sweep([{**fixed, **point} for point in points], workers=args.workers,
+                      interactions=args.interactions, cache=_result_cache(args), cutoff=_cutoff(args))
+    if args.output:
+        save_table(table, args.output)
+    else:
+        print_table(table)
+    return 0
+
+
+def cmd_printhead(args):
+    from printhead import simulate_printhead, throughput
+    from sweep import print_table, save_table
+    config = as_config(parse_overrides(args.set))
+    result = simulate_printhead(config, n_nozzles=args.nozzles, integrator=args.integrator)
+    stats = result.nozzle_table()
+    worst = stats[np.argmin(stats['success_rate'])]
+    print(f"Nozzles: {result.n_nozzles}  droplets per nozzle: {result.n_droplets}  "
+          f"landed: {stats['n_success'].sum()}  hit a plate: {stats['n_failed'].sum()}")
+    print(f"Worst nozzle: {worst['nozzle']} ({worst['success_rate']:.1%} landed)  "
+          f"pass time: {result.pass_time * 1e3:.2f} ms  dots/s: {result.dots_per_second:.4g}")
+    if args.output:
+        save_table(stats, args.output)
+    print_table(throughput(config, sorted({result.n_nozzles, *args.counts})))
+    return 0
+
+
+def cmd_page(args):
+    from page import simulate_page
+    from sweep import save_table
+    config = as_config(parse_overrides(args.set))
+    with contextlib.ExitStack() as stack:
+        store = None
+        if args.store:
+            from result_store import PAGE_COLUMNS, ResultWriter
+            store = stack.enter_context(ResultWriter(args.store, PAGE_COLUMNS, metadata={
+                'config': config.overrides(), 'integrator': args.integrator, 'page': True}))
+        page = simulate_page(config, memory_budget=args.memory_mb * 2**20, integrator=args.integrator, store=store)
+    columns = page.columns
+    column_time = columns['end_time'] - columns['start_time']
+    print(f"Columns: {len(columns)}  passes: {page.timing.passes} of {page.timing.n_nozzles} nozzles  "
+          f"chunks: {len(page.chunk_seconds)} of {page.chunk_size} columns")
+    print(f"Droplets landed: {page.n_success}  hit a plate: {page.n_failed}")
+    print(f"Print time: {page.print_time:.3f} s  (paper feed {page.feed_time:.3f} s)  "
+          f"per column: {column_time.mean() * 1e3:.3f} ms firing to last landing, "
+          f"{page.timing.period * 1e3:.3f} ms per pass with feed")
+    print(f"Compute time: {page.compute_seconds:.3f} s  "
+          f"({page.compute_seconds / len(columns) * 1e3:.3f} ms per column)")
+    if args.output:
+        save_table(columns, args.output)
+    return 0
+
+
+def cmd_render(args):
+    if args.no_display:
+        import matplotlib
+        matplotlib.use('Agg')
+    output = args.output or RENDER_TARGETS[args.target]
+    display = not args.no_display
+
+    if args.target == 'plate':
+        from plate_animation import run_animation
+        run_animation(parse_overrides(args.set), save_path=output, decimate=args.decimate,
+                      display=display, workers=args.workers, cache=_result_cache(args))
+    else:
+        if args.set or args.decimate != 1:
+            print(f"{args.target} has a fixed configuration; --set and --decimate apply to 'plate' only",
+                  file=sys.stderr)
+            return 2
+        import importlib
+        importlib.import_module(args.target).main(save_path=output, display=display, workers=args.workers)
+    return 0
+
+
+def cmd_profile(args):
+    import matplotlib
+    matplotlib.use('Agg')
+    from frame_profiler import FrameProfiler, profile_frames
+    profiler = FrameProfiler(budget_ms=args.budget_ms)
+
+    if args.target == 'plate':
+        from plate_animation import build_animation
+        anim = build_animation(parse_overrides(args.set), decimate=args.decimate, profiler=profiler)
+        fig, init, animate, n_frames, manager = anim.fig, anim.init, anim.animate, anim.frames, anim.manager
+    else:
+        import script2
+        script2.profiler = profiler
+        fig, init, animate, n_frames, manager = (script2.fig, script2.init, script2.animate,
+                                                 script2.TOTAL_ANIMATION_FRAMES, None)
+
+    n_frames = min(n_frames, args.frames or n_frames)
+    profile_frames(fig, init, animate, range(n_frames), profiler, manager=manager)
+
+    print(profiler.summary())
+    slow = profiler.over_budget()
+    if len(slow):
+        print('Slowest frames over budget: ' + ', '.join(
+            f"{frame} ({total:.1f} ms)" for frame, total in
+            sorted(zip(slow['frame'], slow['total_ms']), key=lambda row: -row[1])[:10]))
+    if args.csv:
+        profiler.save_csv(args.csv)
+    if args.histogram:
+        profiler.save_histogram(args.histogram)
+    return 0
+
+
+def cmd_bench(args):
+    import os
+    import bench
+    import import_budget
+    results = bench.run_benchmarks(args.only, repeats=args.repeats)
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.save:
+        baseline = bench.load_baseline(args.baseline)
+    regressed = bench.report(results, baseline, args.threshold)
+    if baseline is None:
+        bench.save_baseline(results, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+
+    for module, (measured, budget) in import_budget.check_budgets(repeats=args.repeats).items():
+        regressed |= measured > budget
+        print(f"import {module:<15} {measured:8.2f} ms  (budget {budget} ms)")
+    return 1 if regressed else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='cli.py', description='Inkjet printer simulation.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    simulate = commands.add_parser('simulate', help='simulate a full column, or a page from a bitmap')
+    simulate.add_argument('--set', action='append', metavar='NAME=VALUE',
+                          help='override a constants.py parameter (repeatable)')
+    simulate.add_argument('--image', help='PBM/PGM/PPM/PNG page to print instead of one column')
+    simulate.add_argument('--integrator', choices=['rk4', 'rk45'],
+                          help='integrate flights numerically with drag and gravity (default: analytic)')
+    simulate.add_argument('--interactions', action='store_true',
+                          help='include Coulomb repulsion between droplets in flight')
+    simulate.add_argument('--cutoff', type=float, metavar='METRES',
+                          help='Coulomb cutoff of --interactions (default: a few droplet pitches; inf: all pairs)')
+    simulate.add_argument('--inverse', action='store_true',
+                          help='solve the voltages for the --integrator model from a cached y-to-V lookup table')
+    simulate.add_argument('--threshold', type=float, default=0.5, help='darkness at which a pixel is inked')
+    simulate.add_argument('--memory-mb', type=float, default=256,
+                          help='working-set budget of one run of image columns (MiB)')
+    simulate.add_argument('--output', '-o', help='write results (.npz for a column, .csv per image column for a page)')
+    simulate.add_argument('--store', metavar='DIR',
+                          help='stream every droplet record to a memory-mappable columnar result store')
+    simulate.add_argument('--no-cache', action='store_true', help='always recompute instead of using .cache/results')
+    simulate.add_argument('--cache-analytic', action='store_true',
+                          help='cache analytic runs too (by default only --integrator and --interactions runs)')
+    simulate.set_defaults(func=cmd_simulate)
+
+    sweep = commands.add_parser('sweep', help='run a parameter sweep (default: the script4 variants)')
+    sweep.add_argument('--grid', action='append', metavar='NAME=V1,V2,...',
+                       help='swept parameter values; several --grid give their Cartesian product')
+    sweep.add_argument('--set', action='append', metavar='NAME=VALUE', help='override applied to every point')
+    sweep.add_argument('--interactions', action='store_true',
+                       help='include Coulomb repulsion between droplets in flight')
+    sweep.add_argument('--cutoff', type=float, metavar='METRES',
+                       help='Coulomb cutoff of --interactions (default: a few droplet pitches; inf: all pairs)')
+    sweep.add_argument('--workers', '-j', type=int, help='worker processes (default: all CPUs)')
+    sweep.add_argument('--output', '-o', help='write the table as CSV instead of printing it')
+    sweep.add_argument('--no-cache', action='store_true', help='always recompute instead of using .cache/results')
+    sweep.set_defaults(func=cmd_sweep)
+
+    printhead = commands.add_parser('printhead', help='simulate a multi-nozzle head and its page throughput')
+    printhead.add_argument('--set', action='append', metavar='NAME=VALUE',
+                           help='override a constants.py parameter (repeatable)')
+    printhead.add_argument('--nozzles', '-n', type=int, help='nozzles on the head (default: NOZZLE_COUNT)')
+    printhead.add_argument('--integrator', choices=['rk4', 'rk45'],
+                           help='integrate flights numerically with drag and gravity (default: analytic)')
+    printhead.add_argument('--counts', type=lambda value: [int(n) for n in value.split(',')],
+                           default=[1, 8, 32, 128, 512], metavar='N1,N2,...',
+                           help='head sizes to list in the throughput table')
+    printhead.add_argument('--output', '-o', help='write the per-nozzle statistics as CSV')
+    printhead.set_defaults(func=cmd_printhead)
+
+    page = commands.add_parser('page', help='print a full page column by column, with paper feed between passes')
+    page.add_argument('--set', action='append', metavar='NAME=VALUE',
+                      help='override a constants.py parameter, e.g. FEED_SPEED or NOZZLE_COUNT (repeatable)')
+    page.add_argument('--integrator', choices=['rk4', 'rk45'],
+                      help='integrate flights numerically with drag and gravity (default: analytic)')
+    page.add_argument('--memory-mb', type=float, default=256, help='working-set budget of one column chunk (MiB)')
+    page.add_argument('--output', '-o', help='write per-column timing and statistics as CSV')
+    page.add_argument('--store', metavar='DIR',
+                      help='stream every droplet record to a memory-mappable columnar result store')
+    page.set_defaults(func=cmd_page)
+
+    render = commands.add_parser('render', help='render an animation to video')
+    render.add_argument('target', choices=sorted(RENDER_TARGETS), nargs='?', default='plate')
+    render.add_argument('--set', action='append', metavar='NAME=VALUE',
+                        help='override a constants.py parameter (plate only)')
+    render.add_argument('--decimate', type=int, default=1, help='keep every n-th frame (plate only)')
+    render.add_argument('--workers', '-j', type=int, help='render processes (default: all CPUs)')
+    render.add_argument('--output', '-o', help='video path (default depends on the target)')
+    render.add_argument('--no-display', action='store_true', help='render headless without opening a window')
+    render.add_argument('--no-cache', action='store_true', help='always recompute instead of using .cache/results')
+    render.add_argument('--cache-analytic', action='store_true',
+                        help='cache the analytic plate job too (slower than recomputing a small one)')
+    render.set_defaults(func=cmd_render)
+
+    profile = commands.add_parser('profile', help='time physics, artist updates and drawing per frame')
+    profile.add_argument('target', choices=['plate', 'script2'], nargs='?', default='plate')
+    profile.add_argument('--set', action='append', metavar='NAME=VALUE',
+                         help='override a constants.py parameter (plate only)')
+    profile.add_argument('--decimate', type=int, default=1, help='keep every n-th frame (plate only)')
+    profile.add_argument('--frames', type=int, help='profile only the first N frames')
+    profile.add_argument('--budget-ms', type=float, help='flag frames slower than this')
+    profile.add_argument('--csv', help='write per-frame timings as CSV')
+    profile.add_argument('--histogram', help='write a frame-time histogram image (e.g. .png)')
+    profile.set_defaults(func=cmd_profile)
+
+    bench = commands.add_parser('bench', help='run the benchmarks and compare them with a JSON baseline')
+    bench.add_argument('--only', action='append', metavar='NAME', help='run only this benchmark (repeatable)')
+    bench.add_argument('--baseline', default='bench_baseline.json',
+                       help='baseline file; written on the first run or with --save')
+    bench.add_argument('--save', action='store_true', help='record this run as the new baseline')
+    bench.add_argument('--threshold', type=float, default=0.2,
+                       help='fractional slowdown reported as a regression (default 0.2)')
+    bench.add_argument('--repeats', type=int, default=5)
+    bench.set_defaults(func=cmd_bench)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        return args.func(args)
+    except argparse.ArgumentTypeError as error:
+        parser.error(str(error))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
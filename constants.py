@@ -1,5 +1,3 @@
-import numpy as np
-
 # Droplet Properties
 DROPLET_DIAMETER = 84E-6        # Diameter of the droplet in meters [m]
 DROPLET_CHARGE = -1.9E-10       # Charge of the droplet in Coulombs [C]
@@ -12,11 +10,19 @@ TOTAL_DISTANCE = 3E-3           # Distance between the droplet gun and the paper
 CAPACITOR_WIDTH = 1E-3          # Width of the capacitor [m]
 CAPACITOR_LENGTH = 0.5E-3       # Length of the capacitor [m]
 CAPACITOR_DISTANCE = 1.25E-3    # Distance between the capacitor and the paper [m]
+NOZZLE_COUNT = 1                # Nozzles on the printhead, each firing its own column [-]
+NOZZLE_PITCH = 2.54E-2 / 300    # Spacing between neighbouring nozzles across the paper [m]
+FEED_SPEED = 0.1                # Paper advance speed between passes of the head [m/s]
 
 # Paper Dimensions
 PAPER_HEIGHT = 11               # Height of the paper in inches [in]
 PAPER_WIDTH = 8.5               # Width of the paper in inches [in]
 
+# Environment (used by the numerical integrator)
+AIR_DENSITY = 1.204             # Density of air at 20 C [kg/m^3]
+AIR_VISCOSITY = 1.81E-5         # Dynamic viscosity of air [Pa s]
+GRAVITY = 9.81                  # Gravitational acceleration, pointing along -y [m/s^2]
+
 # Conversion
 INCHES_2_METERS = 2.54E-2       # Conversion from inches to meters [m]
 
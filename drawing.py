@@ -0,0 +1,35 @@
+from matplotlib.patches import Rectangle 
+from constants import GUN_X_START, GUN_Y_START, GUN_WIDTH, GUN_HEIGHT, TOTAL_DISTANCE, CAPACITOR_WIDTH, CAPACITOR_LENGTH 
+
+
+# Visualization Setup Functions
+def init_gun(ax):
+    """Adds the static visual representation of the Inkjet Droplet Gun to the plot."""
+    inkjet_gun = Rectangle((GUN_X_START, GUN_Y_START), GUN_WIDTH, GUN_HEIGHT, 
+                       color='darkgray', fill=True, ec='black', lw=1, label='Inkjet Gun')
+    ax.add_patch(inkjet_gun)
+
+def init_capacitor(ax, L_gun_to_cap):
+    """Draws the static capacitor plates and marker lines."""
+    
+    W = CAPACITOR_WIDTH # Use explicit variable for readability
+    L = CAPACITOR_LENGTH
+    
+    # Capacitor Plates
+    ax.plot([L_gun_to_cap, L_gun_to_cap + L], [W/2, W/2], 'k-', linewidth=4, label='Capacitor')
+    ax.plot([L_gun_to_cap, L_gun_to_cap + L], [-W/2, -W/2], 'k-', linewidth=4)
+    
+    # Start and End Marker Lines
+    ax.axvline(x=L_gun_to_cap, color='gray', linestyle=':', linewidth=1)
+    ax.axvline(x=L_gun_to_cap + L, color='gray', linestyle=':', linewidth=1)
+
+
+def init_paper(ax):
+    ax.axvline(x=TOTAL_DISTANCE, color='blue', linestyle='--', linewidth=2, label='Paper Target')
+
+
+# Formatting
+
+def mm_formatter(x, pos):
+    """Formats axis labels from meters (m) to millimeters (mm)."""
+    return f'{x*1000:.1f}'
@@ -0,0 +1,78 @@
+import numpy as np
+
+# Status codes stored in DropletStatus.status
+PENDING = 0     # Not fired yet
+FLYING = 1
+LANDED = 2
+FAILED = 3      # Hit a capacitor plate
+LOST = 4        # Driven back or stalled by the other droplets (interaction model)
+
+STATUS_NAMES = ('pending', 'flying', 'landed', 'failed', 'lost')
+
+
+class DropletStatus:
+    """Struct-of-arrays droplet store indexed by droplet number.
+
+    Every update is O(1) per droplet and accepts scalar indices or index
+    arrays. Per-status counts are kept up to date on every status change so
+    count() never scans the arrays.
+    """
+
+    def __init__(self, n_droplets):
+        self.n_droplets = n_droplets
+        self.status = np.zeros(n_droplets, dtype=np.int8)
+        self.position = np.empty((n_droplets, 2))           # Last known (x, y) while flying
+        self.voltage = np.empty(n_droplets)                 # Deflection voltage seen in flight
+        self.failure_position = np.empty((n_droplets, 2))   # Where the droplet hit a plate
+        self._counts = np.zeros(len(STATUS_NAMES), dtype=np.int64)
+        self.reset()
+
+    def reset(self):
+        """Marks every droplet as pending and clears the stored positions."""
+        self.status[:] = PENDING
+        self.position[:] = np.nan
+        self.voltage[:] = np.nan
+        self.failure_position[:] = np.nan
+        self._counts[:] = 0
+        self._counts[PENDING] = self.n_droplets
+
+    def set_status(self, idx, status):
+        """Moves the droplets in `idx` (unique indices) to `status`."""
+        idx = np.asarray(idx, dtype=np.intp)
+        if idx.size == 0:
+            return
+        old = self.status[idx]
+        self._counts -= np.bincount(old.ravel(), minlength=len(STATUS_NAMES))
+        self.status[idx] = status
+        self._counts[status] += idx.size
+
+    def update_flying(self, idx, x, y, V):
+        """Stores the current position and voltage of droplets in flight."""
+        self.position[idx, 0] = x
+        self.position[idx, 1] = y
+        self.voltage[idx] = V
+        self.set_status(idx, FLYING)
+
+    def mark_failed(self, idx, x, y):
+        """Records droplets that hit a capacitor plate at (x, y)."""
+        self.failure_position[idx, 0] = x
+        self.failure_position[idx, 1] = y
+        self.position[idx] = np.nan
+        self.voltage[idx] = np.nan
+        self.set_status(idx, FAILED)
+
+    def mark_landed(self, idx):
+        """Records droplets that reached the paper."""
+        self.set_status(idx, LANDED)
+
+    def count(self, status):
+        """Number of droplets currently in `status`."""
+        return int(self._counts[status])
+
+    def counts(self):
+        """Number of droplets per status name."""
+        return dict(zip(STATUS_NAMES, self._counts.tolist()))
+
+    def indices(self, status):
+        """Sorted indices of the droplets in `status`."""
+        return np.flatnonzero(self.status == status)
@@ -0,0 +1,161 @@
+import time
+from contextlib import contextmanager, nullcontext
+import numpy as np
+from series_buffer import SeriesBuffer
+
+# Per-frame phases: physics blocks marked inside animate(), the rest of animate()
+# (artist updates), and drawing (canvas draws, blits and background bakes)
+PHASES = ('physics', 'artists', 'draw')
+_FRAME, _PHYSICS, _ARTISTS, _DRAW = range(4)
+
+
+class NullProfiler:
+    """Default profiler: phase() is a reusable no-op context, so uninstrumented runs pay nothing."""
+    _null = nullcontext()
+
+    def phase(self, name):
+        return self._null
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class FrameProfiler:
+    """Opt-in per-frame timing of the init/animate callbacks and the draw step.
+
+    Wrap the callbacks with wrap_init(), wrap_animate() and wrap_draw(); code
+    inside animate() marks its physics with `with profiler.phase('physics'):`.
+    Whatever else animate() spends is attributed to artist updates. Durations
+    are kept in milliseconds, one row per frame.
+    """
+
+    def __init__(self, budget_ms=None):
+        self.budget_ms = budget_ms
+        self.init_ms = 0.0
+        self._rows = SeriesBuffer(1 + len(PHASES))
+        self._current = None
+
+    # Instrumentation
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self._current is not None:
+                self._current[1 + PHASES.index(name)] += (time.perf_counter() - start) * 1e3
+
+    def _commit(self):
+        if self._current is not None:
+            self._rows.append(*self._current)
+            self._current = None
+
+    def wrap_init(self, init):
+        def wrapped():
+            start = time.perf_counter()
+            result = init()
+            self.init_ms += (time.perf_counter() - start) * 1e3
+            return result
+        return wrapped
+
+    def wrap_animate(self, animate):
+        def wrapped(frame):
+            self._commit()
+            self._current = [frame, 0.0, 0.0, 0.0]
+            start = time.perf_counter()
+            result = animate(frame)
+            elapsed = (time.perf_counter() - start) * 1e3
+            # Drawing done inside animate (e.g. background bakes) was timed by wrap_draw
+            self._current[_ARTISTS] += elapsed - self._current[_PHYSICS] - self._current[_DRAW]
+            return result
+        return wrapped
+
+    def wrap_draw(self, draw):
+        def wrapped(*args, **kwargs):
+            start = time.perf_counter()
+            result = draw(*args, **kwargs)
+            if self._current is not None:
+                self._current[_DRAW] += (time.perf_counter() - start) * 1e3
+            return result
+        return wrapped
+
+    # Results
+
+    def frame_table(self):
+        """Structured array with frame, physics_ms, artists_ms, draw_ms and total_ms columns."""
+        self._commit()
+        frame, physics, artists, draw = self._rows.columns()
+        table = np.zeros(len(frame), dtype=[('frame', np.int64)] +
+                         [(f'{phase}_ms', np.float64) for phase in PHASES + ('total',)])
+        table['frame'] = frame
+        table['physics_ms'] = physics
+        table['artists_ms'] = artists
+        table['draw_ms'] = draw
+        table['total_ms'] = physics + artists + draw
+        return table
+
+    def over_budget(self):
+        """Rows of the frames whose total time exceeded budget_ms."""
+        table = self.frame_table()
+        if self.budget_ms is None:
+            return table[:0]
+        return table[table['total_ms'] > self.budget_ms]
+
+    def save_csv(self, path):
+        table = self.frame_table()
+        np.savetxt(path, table, delimiter=',', header=','.join(table.dtype.names), comments='',
+                   fmt=['%d'] + ['%.4f'] * (len(table.dtype.names) - 1))
+
+    def save_histogram(self, path, bins=50):
+        """Writes per-phase frame-time histograms to an image file."""
+        from matplotlib.figure import Figure
+        table = self.frame_table()
+        fig = Figure(figsize=(8, 6))
+        ax = fig.add_subplot()
+        edges = np.histogram_bin_edges(table['total_ms'], bins=bins)
+        for phase in PHASES + ('total',):
+            ax.hist(table[f'{phase}_ms'], bins=edges, histtype='step', linewidth=1.5, label=phase)
+        if self.budget_ms is not None:
+            ax.axvline(self.budget_ms, color='red', linestyle='--', label=f'budget {self.budget_ms} ms')
+        ax.set_xlabel('Time per frame (ms)')
+        ax.set_ylabel('Frames')
+        ax.set_yscale('log')
+        ax.legend()
+        fig.savefig(path)
+
+    def summary(self):
+        """Text table of mean/median/p95/max per phase plus the frames over budget."""
+        table = self.frame_table()
+        lines = [f"{'phase':<8} {'mean':>9} {'median':>9} {'p95':>9} {'max':>9}  (ms, {len(table)} frames)"]
+        for phase in PHASES + ('total',):
+            values = table[f'{phase}_ms']
+            if len(values):
+                lines.append(f"{phase:<8} {values.mean():9.3f} {np.median(values):9.3f} "
+                             f"{np.percentile(values, 95):9.3f} {values.max():9.3f}")
+        lines.append(f"init     {self.init_ms:9.3f}")
+        if self.budget_ms is not None:
+            slow = self.over_budget()
+            lines.append(f"{len(slow)} frames over the {self.budget_ms} ms budget"
+                         + (f", worst at frame {slow['frame'][np.argmax(slow['total_ms'])]}" if len(slow) else ''))
+        return '\n'.join(lines)
+
+
+def profile_frames(fig, init, animate, frames, profiler, manager=None):
+    """Drives `frames` of an animation headlessly, timing each phase of every frame.
+
+    Frames are drawn the way playback draws them: through the ArtistManager
+    blit path when `manager` is given, otherwise with a full canvas draw.
+    """
+    if manager is not None:
+        manager.bake = profiler.wrap_draw(manager.bake)
+        draw = profiler.wrap_draw(manager.update)
+    else:
+        draw = profiler.wrap_draw(fig.canvas.draw)
+    animate = profiler.wrap_animate(animate)
+    if init is not None:
+        profiler.wrap_init(init)()
+    for frame in frames:
+        animate(frame)
+        draw()
+    return profiler
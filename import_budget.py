@@ -0,0 +1,38 @@
+import os
+import re
+import subprocess
+import sys
+
+# Cumulative import time allowed per module, in ms (best of several fresh interpreters).
+# calculations must stay free of numpy at import; its arrays are built on first access.
+BUDGETS_MS = {
+    'constants': 5,
+    'calculations': 20,
+}
+
+
+def measure_import(module, repeats=5):
+    """Best cumulative `python -X importtime` time of `module` in fresh interpreters, in ms."""
+    pattern = re.compile(r'^import time:\s+\d+ \|\s+(\d+) \| ' + re.escape(module) + r'$', re.MULTILINE)
+    best = float('inf')
+    for _ in range(repeats):
+        stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stderr
+        match = pattern.search(stderr)
+        best = min(best, int(match.group(1)) / 1000)
+    return best
+
+
+def check_budgets(budgets=BUDGETS_MS, repeats=5):
+    """{module: (measured_ms, budget_ms)} for every budgeted module."""
+    return {module: (measure_import(module, repeats), budget) for module, budget in budgets.items()}
+
+
+if __name__ == '__main__':
+    over = False
+    for module, (measured, budget) in check_budgets().items():
+        status = 'ok' if measured <= budget else 'OVER BUDGET'
+        over |= measured > budget
+        print(f"{module:<15} {measured:8.2f} ms  (budget {budget} ms)  {status}")
+    sys.exit(1 if over else 0)
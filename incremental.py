@@ -0,0 +1,300 @@
+import numpy as np
+from printer_config import PARAMETER_NAMES, as_config
+from simulation import SimulationResult
+
+# The ideal model as a graph of named quantities. Every node lists its inputs
+# (constants.py parameters or other nodes) and is recomputed only when one of
+# the parameters it depends on changes. Firing the full column, the voltage of
+# every dot is chosen so that q/m * V/W is independent of the charge: a charge
+# edit recomputes only q_over_m, volts_per_meter and voltage, and every
+# collision and landing is kept. With a custom voltage sequence the
+# acceleration scales with q/m, so a charge edit reaches the collisions too.
+# Geometry and velocity edits invalidate the time bases and with them nearly
+# everything.
+_NODES = {}
+
+# Nodes that take another form when a custom voltage sequence is fired
+_CUSTOM_NODES = {}
+
+# Pseudo-parameter standing for a custom voltage sequence
+VOLTAGES = 'voltages'
+
+
+def _node(*inputs):
+    def register(func):
+        _NODES[func.__name__] = (inputs, func)
+        return func
+    return register
+
+
+def _custom_node(name, *inputs):
+    """Registers the form of node `name` used with a custom voltage sequence."""
+    def register(func):
+        _CUSTOM_NODES[name] = (inputs, func)
+        return func
+    return register
+
+
+# Droplet and time bases (scalars)
+
+@_node('DROPLET_DIAMETER')
+def R(d):
+    return d / 2
+
+
+@_node('DROPLET_DENSITY', 'R')
+def m(density, r):
+    return density * (4/3) * np.pi * r**3
+
+
+@_node('DROPLET_CHARGE', 'm')
+def q_over_m(charge, mass):
+    return charge / mass
+
+
+@_node('CAPACITOR_LENGTH', 'DROPLET_VELOCITY')
+def t_cap(length, vx):
+    return length / vx
+
+
+@_node('TOTAL_DISTANCE', 'CAPACITOR_LENGTH', 'CAPACITOR_DISTANCE')
+def L_gun_to_cap(total, length, distance):
+    return total - length - distance
+
+
+@_node('L_gun_to_cap', 'DROPLET_VELOCITY')
+def t_gun_to_cap(l_gun, vx):
+    return l_gun / vx
+
+
+@_node('TOTAL_DISTANCE', 'DROPLET_VELOCITY')
+def T_total_flight(total, vx):
+    return total / vx
+
+
+@_node('t_cap', 'T_total_flight', 't_gun_to_cap', 'L_gun_to_cap', 'CAPACITOR_LENGTH', 'DROPLET_VELOCITY',
+       'TOTAL_DISTANCE')
+def landing_gain(t_c, t_total, t_gun, l_gun, length, vx, total):
+    """Landing y per unit transverse acceleration, by where the paper sits relative to the capacitor."""
+    if total <= l_gun:
+        return 0.0
+    if total <= l_gun + length:
+        return 0.5 * (t_total - t_gun)**2
+    return 0.5 * t_c**2 + t_c * (t_total - (l_gun + length) / vx)
+
+
+@_node('CAPACITOR_WIDTH', 'R')
+def gap(width, r):
+    return np.maximum(width / 2 - r, 0.0)
+
+
+@_node('L_gun_to_cap', 'CAPACITOR_LENGTH')
+def plates_reachable(l_gun, length):
+    return l_gun + length >= 0
+
+
+# Firing schedule and voltages (per droplet)
+
+@_node('PAPER_HEIGHT', 'PRINTER_RESOLUTION')
+def n_dots(height, resolution):
+    return int(height * resolution)
+
+
+@_node('PAPER_HEIGHT', 'INCHES_2_METERS', 'n_dots')
+def y_positions(height, inches, n):
+    y_max = height * inches / 2
+    return np.linspace(-y_max, y_max, n)
+
+
+@_node('DROPLET_VELOCITY', 'CAPACITOR_LENGTH', 'CAPACITOR_DISTANCE')
+def accel_per_meter(vx, length, distance):
+    """Transverse acceleration per metre of target deflection, whatever the charge."""
+    return vx**2 / (length * (length/2 + distance))
+
+
+@_node('q_over_m', 'CAPACITOR_WIDTH', 'accel_per_meter')
+def volts_per_meter(qm, width, accel):
+    """K_deflect * sign(q): the ideal voltage per metre of target deflection."""
+    return (1.0 / abs(qm)) * width * accel * np.sign(qm)
+
+
+@_node('y_positions', 'volts_per_meter')
+def voltage(y, gain):
+    return y * gain
+
+
+@_node('y_positions')
+def target_y(y):
+    return y
+
+
+@_node('n_dots')
+def n_droplets(n):
+    return n
+
+
+@_node('y_positions', 'accel_per_meter')
+def a_y(y, accel):
+    return y * accel
+
+
+@_custom_node('voltage', VOLTAGES)
+def custom_voltage(custom):
+    return custom
+
+
+@_custom_node('target_y', VOLTAGES, 'volts_per_meter')
+def custom_target_y(custom, gain):
+    return custom / gain
+
+
+@_custom_node('n_droplets', VOLTAGES)
+def custom_n_droplets(custom):
+    return len(custom)
+
+
+@_custom_node('a_y', 'q_over_m', 'voltage', 'CAPACITOR_WIDTH')
+def custom_a_y(qm, v, width):
+    return qm * v / width
+
+
+@_node('n_droplets', 'CAPACITOR_LENGTH', 'DROPLET_VELOCITY')
+def fire_time(n, length, vx):
+    return np.arange(n) * (length / vx)
+
+
+# Plate collisions and landings, as in trajectory.solve_plate_collisions
+
+@_node('gap', 'a_y')
+def t_inside(g, a):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.sqrt(2 * g / np.abs(a))
+    return np.where(g == 0.0, 0.0, t)
+
+
+@_node('t_inside', 't_cap', 'plates_reachable')
+def hit(t_in, t_c, reachable):
+    return (t_in <= t_c) & reachable
+
+
+@_node('CAPACITOR_WIDTH', 'R', 'a_y', 't_cap', 'plates_reachable')
+def margin(width, r, a, t_c, reachable):
+    return np.where(reachable, width/2 - r - 0.5 * np.abs(a) * t_c**2, np.inf)
+
+
+@_node('hit', 't_gun_to_cap', 't_inside')
+def t_strike(h, t_gun, t_in):
+    return np.where(h, np.maximum(t_gun + t_in, 0.0), np.nan)
+
+
+@_node('t_strike', 't_gun_to_cap', 't_cap', 'a_y')
+def y_strike(t_s, t_gun, t_c, a):
+    return 0.5 * a * np.minimum(t_s - t_gun, t_c)**2
+
+
+@_node('fire_time', 't_strike')
+def strike_time(t_fire, t_s):
+    return t_fire + t_s
+
+
+@_node('t_strike', 'DROPLET_VELOCITY')
+def strike_x(t_s, vx):
+    return vx * t_s
+
+
+@_node('hit', 'a_y', 'landing_gain')
+def landing_y(h, a, gain):
+    return np.where(h, np.nan, a * gain)
+
+
+@_node('hit', 'fire_time', 'T_total_flight')
+def land_time(h, t_fire, t_total):
+    return np.where(h, np.nan, t_fire + t_total)
+
+
+def _dependencies(graph):
+    """The parameters (and VOLTAGES) that every node of `graph` depends on, directly or through other nodes."""
+    def parameters(name):
+        if name not in graph:
+            return frozenset([name])
+        return frozenset().union(*(parameters(source) for source in graph[name][0]))
+    return {name: parameters(name) for name in graph}
+
+
+# Node graphs and their dependencies, firing the full column and a custom voltage sequence
+GRAPH = _NODES
+CUSTOM_GRAPH = {**_NODES, **_CUSTOM_NODES}
+DEPENDS_ON = _dependencies(GRAPH)
+CUSTOM_DEPENDS_ON = _dependencies(CUSTOM_GRAPH)
+
+
+class IncrementalSimulation:
+    """simulate() for a sequence of configurations, recomputing only what each edit invalidates.
+
+    Call simulate() with every configuration in turn (e.g. the points of a
+    sweep): parameters that differ from the previous call invalidate the
+    nodes that depend on them, and only those are evaluated again. Results
+    match simulation.simulate() up to rounding, but their arrays are read-only
+    views of the cached nodes that later calls reuse. `recomputed` lists the
+    nodes evaluated by the last call.
+    """
+
+    def __init__(self, voltages=None):
+        self.config = None
+        self._voltages = None if voltages is None else np.asarray(voltages, dtype=float)
+        self._values = {}
+        self.recomputed = []
+
+    @property
+    def _graph(self):
+        return GRAPH if self._voltages is None else CUSTOM_GRAPH
+
+    def set_voltages(self, voltages):
+        """Fires a custom voltage sequence from now on (None: the full column)."""
+        # Nodes that change form, and everything downstream of them, go along with the old sequence
+        self._invalidate({VOLTAGES}, CUSTOM_DEPENDS_ON)
+        self._voltages = None if voltages is None else np.asarray(voltages, dtype=float)
+
+    def _invalidate(self, changed, depends_on=None):
+        if depends_on is None:
+            depends_on = DEPENDS_ON if self._voltages is None else CUSTOM_DEPENDS_ON
+        for name in [name for name in self._values if depends_on[name] & changed]:
+            del self._values[name]
+
+    def value(self, name):
+        """Current value of node or parameter `name`."""
+        if name == VOLTAGES:
+            return self._voltages
+        if name not in self._graph:
+            return getattr(self.config, name)
+        if name not in self._values:
+            inputs, func = self._graph[name]
+            value = func(*(self.value(source) for source in inputs))
+            if isinstance(value, np.ndarray):
+                value = value.view()
+                value.flags.writeable = False   # Shared by every result until invalidated
+            self._values[name] = value
+            self.recomputed.append(name)
+        return self._values[name]
+
+    def simulate(self, config=None):
+        p = as_config(config)
+        if self.config is None:
+            self._values.clear()
+        elif p is not self.config:
+            self._invalidate({name for name in PARAMETER_NAMES if getattr(p, name) != getattr(self.config, name)})
+        self.config = p
+        self.recomputed = []
+
+        return SimulationResult(
+            fire_time=self.value('fire_time'),
+            voltage=self.value('voltage'),
+            target_y=self.value('target_y'),
+            landing_y=self.value('landing_y'),
+            land_time=self.value('land_time'),
+            hit_plate=self.value('hit'),
+            strike_time=self.value('strike_time'),
+            strike_x=self.value('strike_x'),
+            strike_y=self.value('y_strike'),
+            clearance_margin=self.value('margin'),
+        )
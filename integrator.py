@@ -0,0 +1,235 @@
+import numpy as np
+from dataclasses import dataclass
+from printer_config import as_config
+
+# The state of every droplet is integrated over the flight axis x instead of
+# time: all droplets then share one step grid, the capacitor edges fall
+# exactly on step boundaries (so the field switches on and off between
+# steps), and every droplet reaches the paper at x = TOTAL_DISTANCE.
+# State rows: t (s), y (m), vx (m/s), vy (m/s); one column per droplet.
+T, Y, VX, VY = range(4)
+
+# Absolute tolerances per state row for the adaptive integrator
+ATOL = np.array([1e-12, 1e-10, 1e-7, 1e-7])[:, None]
+
+# Smallest adaptive step, as a fraction of its flight segment, before giving up
+MIN_STEP_FRACTION = 1e-12
+
+# Dormand-Prince 5(4) tableau
+DP_C = (0, 1/5, 3/10, 4/5, 8/9, 1, 1)
+DP_A = (
+    (),
+    (1/5,),
+    (3/40, 9/40),
+    (44/45, -56/15, 32/9),
+    (19372/6561, -25360/2187, 64448/6561, -212/729),
+    (9017/3168, -355/33, 46732/5247, 49/176, -5103/18656),
+    (35/384, 0, 500/1113, 125/192, -2187/6784, 11/84),
+)
+DP_B5 = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84, 0])
+DP_B4 = np.array([5179/57600, 0, 7571/16695, 393/640, -92097/339200, 187/2100, 1/40])
+
+
+@dataclass
+class FlightResult:
+    """Numerically integrated flights (NaN where a quantity does not apply)."""
+    landing_y: np.ndarray
+    flight_time: np.ndarray     # Gun to paper
+    landing_vy: np.ndarray
+    hit_plate: np.ndarray
+    t_strike: np.ndarray        # Flight time at the plate strike
+    x_strike: np.ndarray
+    y_strike: np.ndarray
+    margin: np.ndarray          # Smallest gap between droplet surface and plate inside the capacitor
+    n_steps: int
+
+
+class _Forces:
+    """dstate/dx for one printer configuration, with the field on or off."""
+
+    def __init__(self, p, voltages, drag, gravity):
+        self.a_field = (p.DROPLET_CHARGE / p.m) * np.asarray(voltages, dtype=float) / p.CAPACITOR_WIDTH
+        self.g = p.GRAVITY if gravity else 0.0
+        self.drag = drag and p.AIR_DENSITY > 0
+        # Schiller-Naumann drag: a = -k v with k = 9 mu / (2 rho_d R^2) * (1 + 0.15 Re^0.687)
+        self.k_stokes = 9 * p.AIR_VISCOSITY / (2 * p.DROPLET_DENSITY * p.R**2)
+        self.re_per_speed = p.AIR_DENSITY * p.DROPLET_DIAMETER / p.AIR_VISCOSITY
+
+    def __call__(self, state, field_on):
+        vx, vy = state[VX], state[VY]
+        ay = (self.a_field - self.g) if field_on else -self.g
+        inv_vx = 1.0 / vx
+        derivative = np.empty_like(state)
+        derivative[T] = inv_vx
+        derivative[Y] = vy * inv_vx
+        if self.drag:
+            speed = np.sqrt(vx * vx + vy * vy)
+            k = self.k_stokes * (1 + 0.15 * (self.re_per_speed * speed)**0.687)
+            derivative[VX] = -k                     # (-k vx) / vx
+            derivative[VY] = (ay - k * vy) * inv_vx
+        else:
+            derivative[VX] = 0.0
+            derivative[VY] = ay * inv_vx
+        return derivative
+
+
+def _rk4_step(forces, state, h, field_on):
+    k1 = forces(state, field_on)
+    k2 = forces(state + 0.5 * h * k1, field_on)
+    k3 = forces(state + 0.5 * h * k2, field_on)
+    k4 = forces(state + h * k3, field_on)
+    return state + (h / 6) * (k1 + 2 * k2 + 2 * k3 + k4)
+
+
+def _dp_step(forces, state, h, field_on):
+    """One Dormand-Prince step: (5th-order state, embedded error estimate)."""
+    k = []
+    for a in DP_A:
+        stage = state
+        for a_j, k_j in zip(a, k):
+            if a_j:
+                stage = stage + h * a_j * k_j
+        k.append(forces(stage, field_on))
+    k = np.stack(k)
+    new_state = state + h * np.tensordot(DP_B5, k, axes=1)
+    error = h * np.tensordot(DP_B5 - DP_B4, k, axes=1)
+    return new_state, error
+
+
+def _hermite(s, h, f0, d0, f1, d1):
+    """Cubic Hermite interpolant on a step of length h at fraction s, and its d/ds."""
+    s2, s3 = s * s, s * s * s
+    value = (2*s3 - 3*s2 + 1) * f0 + (s3 - 2*s2 + s) * h * d0 + (-2*s3 + 3*s2) * f1 + (s3 - s2) * h * d1
+    slope = (6*s2 - 6*s) * f0 + (3*s2 - 4*s + 1) * h * d0 + (-6*s2 + 6*s) * f1 + (3*s2 - 2*s) * h * d1
+    return value, slope
+
+
+def _segments(p):
+    """(x_start, x_end, field_on) pieces of the flight, clipped to the gun-to-paper range."""
+    D = p.TOTAL_DISTANCE
+    cap_start = min(max(p.L_gun_to_cap, 0.0), D)
+    cap_end = min(max(p.L_gun_to_cap + p.CAPACITOR_LENGTH, 0.0), D)
+    pieces = [(0.0, cap_start, False), (cap_start, cap_end, True), (cap_end, D, False)]
+    return [piece for piece in pieces if piece[1] > piece[0]]
+
+
+def integrate_flights(voltages, config=None, method='rk4', steps_per_segment=8, rtol=1e-6,
+                      drag=True, gravity=True):
+    """Integrates every droplet of a batch from the gun to the paper at once.
+
+    `method` is 'rk4' (fixed steps_per_segment steps per flight segment) or
+    'rk45' (adaptive Dormand-Prince, one step size shared by the batch and
+    set by its worst droplet). drag=False and gravity=False reduce the model
+    to the analytic one used by calculate_positions. Plate strikes are found
+    on the step grid inside the capacitor and located within the step by
+    Hermite interpolation.
+    """
+    p = as_config(config)
+    forces = _Forces(p, voltages, drag, gravity)
+    n = forces.a_field.size
+    state = np.zeros((4, n))
+    state[VX] = p.DROPLET_VELOCITY
+
+    half_gap = p.CAPACITOR_WIDTH / 2 - p.R
+    margin = np.full(n, np.inf)
+    hit = np.zeros(n, dtype=bool)
+    strike = np.full((3, n), np.nan)   # t, x, y at the strike
+    n_steps = 0
+
+    def check_plates(x_prev, prev, x_next, new):
+        # Margin is evaluated at both ends of every in-capacitor step
+        m_prev = half_gap - np.abs(prev[Y])
+        m_next = half_gap - np.abs(new[Y])
+        np.minimum(margin, np.minimum(m_prev, m_next), out=margin)
+        first = ~hit & (m_next < 0)
+        if first.any():
+            a, b = prev[:, first], new[:, first]
+            h = x_next - x_prev
+            y_plate = np.sign(b[Y]) * half_gap
+            # Strike inside the step: Newton on the cubic Hermite interpolant of y(x),
+            # which is exact for the parabola of a drag-free flight
+            s = np.where(m_prev[first] > 0, m_prev[first] / (m_prev[first] - m_next[first]), 0.0)
+            slopes = (a[VY] / a[VX], b[VY] / b[VX])
+            for _ in range(4):
+                y, dy = _hermite(s, h, a[Y], slopes[0], b[Y], slopes[1])
+                s = np.clip(s - (y - y_plate) / np.where(dy != 0, dy, np.inf), 0.0, 1.0)
+            strike[0, first] = _hermite(s, h, a[T], 1 / a[VX], b[T], 1 / b[VX])[0]
+            strike[1, first] = x_prev + s * h
+            strike[2, first] = _hermite(s, h, a[Y], slopes[0], b[Y], slopes[1])[0]
+            hit[first] = True
+
+    for x_start, x_end, field_on in _segments(p):
+        if method == 'rk4':
+            h = (x_end - x_start) / steps_per_segment
+            for i in range(steps_per_segment):
+                new = _rk4_step(forces, state, h, field_on)
+                stalled = ~hit & ~((new[VX] > 0) & np.isfinite(new).all(axis=0))
+                if stalled.any():
+                    raise ValueError(f"rk4 lost {np.count_nonzero(stalled)} droplets (stopped or not finite) "
+                                     f"at x = {x_start + (i + 1) * h:.6g} m with steps_per_segment="
+                                     f"{steps_per_segment}; cannot integrate the flights of config "
+                                     f"{p.overrides() or 'defaults'}")
+                if field_on:
+                    check_plates(x_start + i * h, state, x_start + (i + 1) * h, new)
+                state = new
+            n_steps += steps_per_segment
+        elif method == 'rk45':
+            x, h = x_start, (x_end - x_start) / steps_per_segment
+            h_min = MIN_STEP_FRACTION * (x_end - x_start)
+            while x < x_end:
+                h = min(h, x_end - x)
+                new, error = _dp_step(forces, state, h, field_on)
+                scale = ATOL + rtol * np.maximum(np.abs(state), np.abs(new))
+                with np.errstate(invalid='ignore'):
+                    err = np.max(np.abs(error) / scale)
+                if not np.isfinite(err):
+                    err = np.inf    # A droplet stopped or blew up: shrink the step until h_min gives up
+                if err > 1 and h < h_min:
+                    raise ValueError(f"rk45 step fell below {h_min:.3g} m at x = {x:.6g} m without meeting "
+                                     f"rtol={rtol:g}; cannot integrate the flights of config "
+                                     f"{p.overrides() or 'defaults'}")
+                if err <= 1:
+                    if field_on:
+                        check_plates(x, state, x + h, new)
+                    x, state = x + h, new
+                    n_steps += 1
+                h *= min(5.0, max(0.2, 0.9 * (err + 1e-300)**-0.2))
+        else:
+            raise ValueError(f"Unknown integration method {method!r}")
+
+    return FlightResult(
+        landing_y=np.where(hit, np.nan, state[Y]),
+        flight_time=np.where(hit, np.nan, state[T]),
+        landing_vy=np.where(hit, np.nan, state[VY]),
+        hit_plate=hit,
+        t_strike=strike[0],
+        x_strike=strike[1],
+        y_strike=strike[2],
+        margin=margin,
+        n_steps=n_steps,
+    )
+
+
+def analytic_error(config=None, method='rk4', **options):
+    """Largest deviations of the drag- and gravity-free integration from the analytic solution.
+
+    Returns a dict with the landing position (m), flight time (s) and plate
+    strike time (s) errors and whether both agree on every plate strike.
+    Only meaningful where the capacitor lies between gun and paper, which the
+    analytic model assumes.
+    """
+    from simulation import simulate
+    reference = simulate(config)
+    flights = integrate_flights(reference.voltage, config, method=method, drag=False, gravity=False, **options)
+    landed = ~reference.hit_plate & ~flights.hit_plate
+    struck = reference.hit_plate & flights.hit_plate
+
+    def max_abs(a, b):
+        return float(np.max(np.abs(a - b), initial=0.0))
+
+    return {
+        'landing_y': max_abs(flights.landing_y[landed], reference.landing_y[landed]),
+        'flight_time': max_abs(flights.flight_time[landed], (reference.land_time - reference.fire_time)[landed]),
+        't_strike': max_abs(flights.t_strike[struck], (reference.strike_time - reference.fire_time)[struck]),
+        'hits_agree': bool(np.array_equal(flights.hit_plate, reference.hit_plate)),
+    }
@@ -0,0 +1,326 @@
+import itertools
+import numpy as np
+from dataclasses import dataclass
+from printer_config import as_config
+from simulation import SimulationResult
+
+COULOMB_CONSTANT = 8.9875517923E9    # 1 / (4 pi eps0) [N m^2 / C^2]
+
+# Up to this many droplets the O(n^2) pairwise kernel beats the cell list
+PAIRWISE_MAX = 64
+
+# Droplets still in flight after this many nominal flight times are given up as lost
+MAX_FLIGHT_FACTOR = 10
+
+# Default Coulomb cutoff in droplet pitches (Vx * T_interval, the spacing of the stream). The
+# droplets beyond it pull from both sides and add up to less than 7% of the nearest one's force
+CUTOFF_PITCHES = 8
+
+
+@dataclass
+class InteractionResult(SimulationResult):
+    """SimulationResult plus the droplets lost to repulsion: driven back past the nozzle or stalled."""
+    lost: np.ndarray
+
+    @property
+    def n_failed(self):
+        return int(np.count_nonzero(self.hit_plate | self.lost))
+
+    @property
+    def failed_indices(self):
+        return np.flatnonzero(self.hit_plate | self.lost)
+
+
+def _pairwise(positions, live, cutoff):
+    """Sum over live j of (r_i - r_j) / |r_i - r_j|^3, every pair of every group evaluated."""
+    n = positions.shape[-2]
+    diff = positions[..., :, None, :] - positions[..., None, :, :]
+    r2 = np.einsum('...ijk,...ijk->...ij', diff, diff)
+    r2[..., np.arange(n), np.arange(n)] = np.inf
+    r2[~(live[..., :, None] & live[..., None, :])] = np.inf
+    if cutoff is not None:
+        r2[r2 > cutoff * cutoff] = np.inf
+    return np.einsum('...ijk,...ij->...ik', diff, r2**-1.5)
+
+
+def _cell_list(positions, cutoff):
+    """Same sum restricted to pairs closer than `cutoff`, found through a cell list.
+
+    Positions are binned into cells of side `cutoff`, so only droplets in the
+    same or adjacent cells are paired and the cost grows linearly with the
+    number of droplets at a fixed density.
+    """
+    n, dim = positions.shape
+    cells = np.floor(positions / cutoff).astype(np.int64)
+    cells -= cells.min(axis=0) - 1           # One empty cell of padding on each side
+    shape = cells.max(axis=0) + 2
+    strides = np.cumprod(np.concatenate([[1], shape[::-1][:-1]]))[::-1]   # Row-major
+    keys = cells @ strides
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+
+    i_parts, j_parts = [], []
+    for offset in itertools.product((-1, 0, 1), repeat=dim):
+        neighbour = keys + np.dot(offset, strides)
+        start = np.searchsorted(sorted_keys, neighbour, side='left')
+        counts = np.searchsorted(sorted_keys, neighbour, side='right') - start
+        total = counts.sum()
+        if total == 0:
+            continue
+        # CSR expansion: droplet i is paired with every droplet of its neighbour cell
+        i = np.repeat(np.arange(n), counts)
+        first = np.repeat(start - (np.cumsum(counts) - counts), counts)
+        i_parts.append(i)
+        j_parts.append(order[np.arange(total) + first])
+    i = np.concatenate(i_parts)
+    j = np.concatenate(j_parts)
+
+    diff = positions[i] - positions[j]
+    r2 = np.einsum('ij,ij->i', diff, diff)
+    keep = (i != j) & (r2 < cutoff * cutoff)
+    weights = r2[keep]**-1.5
+    i, diff = i[keep], diff[keep]
+    return np.stack([np.bincount(i, weights=diff[:, k] * weights, minlength=n) for k in range(dim)], axis=1)
+
+
+def default_cutoff(config=None):
+    """The Coulomb cutoff distance used unless one is given: CUTOFF_PITCHES droplet pitches (m)."""
+    p = as_config(config)
+    return CUTOFF_PITCHES * p.DROPLET_VELOCITY * p.T_interval
+
+
+def coulomb_accelerations(positions, charge, mass, cutoff=None, method='auto', live=None):
+    """Mutual Coulomb acceleration of equal droplets at `positions` (..., n, dims), in m/s^2.
+
+    Leading axes hold independent groups whose droplets do not interact with
+    each other; `live` (..., n) leaves out droplets that no longer take part
+    (their acceleration is zero). cutoff=None or inf keeps every pair.
+    `method` is 'pairwise', 'cells' (needs a finite `cutoff`) or 'auto',
+    which uses the pairwise kernel up to PAIRWISE_MAX droplets per group or
+    when there is no cutoff.
+    """
+    positions = np.asarray(positions, dtype=float)
+    if cutoff is not None and not np.isfinite(cutoff):
+        cutoff = None
+    if live is None:
+        live = np.ones(positions.shape[:-1], dtype=bool)
+    if method == 'auto':
+        method = 'pairwise' if cutoff is None or positions.shape[-2] <= PAIRWISE_MAX else 'cells'
+    if method == 'pairwise':
+        field = _pairwise(positions, live, cutoff)
+    elif method == 'cells':
+        if cutoff is None:
+            raise ValueError("The cell-list kernel needs a finite cutoff")
+        field = np.zeros_like(positions)
+        points = positions[live]
+        if len(points) > 1:
+            # One cell list for all groups, laid side by side too far apart to interact
+            group = np.ravel_multi_index(np.nonzero(live)[:-1], live.shape[:-1]) if live.ndim > 1 else 0
+            points[:, 0] += group * (np.ptp(points[:, 0]) + 2 * cutoff)
+            field[live] = _cell_list(points, cutoff)
+    else:
+        raise ValueError(f"Unknown Coulomb kernel {method!r}")
+    return (COULOMB_CONSTANT * charge * charge / mass) * field
+
+
+def _field_drift(x, y, vx, vy, a, dt, cap_start, cap_end):
+    """Exact drift over dt under the capacitor field, which acts along y only while inside.
+
+    Returns the new y and vy and the times within the step at which the droplet
+    is inside the capacitor, [t_in, t_out] (empty when t_out == t_in).
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_start = (cap_start - x) / vx
+        t_end = (cap_end - x) / vx
+    # Either edge can come first: repulsion may turn a droplet around
+    t_in = np.fmin(np.fmax(np.fmin(t_start, t_end), 0.0), dt)
+    t_out = np.fmin(np.fmax(np.fmax(t_start, t_end), 0.0), dt)
+    tau = t_out - t_in
+    y_new = y + vy * dt + a * tau * (0.5 * tau + dt - t_out)
+    return y_new, vy + a * tau, t_in, t_out
+
+
+def _plate_crossing(y_in, vy, a, y_plate):
+    """Smallest u >= 0 with y_in + vy u + a u^2 / 2 = y_plate (inf if there is none)."""
+    c = y_in - y_plate
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        root = np.sqrt(vy * vy - 2 * a * c)
+        candidates = np.stack([(-vy - root) / a, (-vy + root) / a, -c / vy])
+        candidates[:2, a == 0] = np.inf
+        candidates[2, a != 0] = np.inf
+    candidates[~(candidates >= 0)] = np.inf
+    return candidates.min(axis=0)
+
+
+def simulate_interacting(config=None, voltages=None, steps_per_interval=8, cutoff=None, method='auto',
+                         coulomb=True, chunk_size=128, overlap=None):
+    """Simulates a print job with mutual Coulomb repulsion between droplets in flight.
+
+    Droplets are fired every T_interval as in simulate(), but all droplets in
+    flight are advanced together in steps of T_interval / steps_per_interval:
+    the Coulomb forces between live droplets are applied as kick-drift-kick
+    half-step kicks, and the drift through the capacitor field is integrated
+    exactly (including entering or leaving it mid-step). Droplets leave the
+    system when they land, touch a plate, or are lost (pushed back past the
+    nozzle, or still in flight after MAX_FLIGHT_FACTOR nominal flight times).
+    With coulomb=False the result matches simulate() to rounding error.
+
+    Droplets interact within `cutoff` metres (default default_cutoff(), a
+    few droplet pitches; np.inf keeps every pair). With 'auto' `method`, a
+    stream with more than PAIRWISE_MAX droplets in flight switches to the
+    cell-list kernel, whose cost grows linearly with the firing rate.
+
+    A droplet only feels the few droplets in flight with it, so the job is cut
+    into chunks of chunk_size droplets that are stepped side by side, each one
+    flanked by `overlap` droplets (default 4 * MAX_DROPS_IN_FLIGHT) on both
+    sides that recreate the stream around it and are then discarded.
+    chunk_size=None steps the whole job as one stream.
+    """
+    p = as_config(config)
+    if voltages is None:
+        voltages = p.V_required_full
+        target_y = p.y_positions
+    else:
+        voltages = np.asarray(voltages, dtype=float)
+        target_y = voltages / (p.K_deflect * np.sign(p.DROPLET_CHARGE))
+    n = len(voltages)
+    if cutoff is None:
+        cutoff = default_cutoff(p)
+
+    # Chunks as rows: slot j of chunk b is droplet b * chunk_size - overlap + j,
+    # fired at j * T_interval; slots outside the job or with a NaN voltage are never fired
+    if chunk_size is None or chunk_size >= n:
+        chunk_size, overlap = max(n, 1), 0
+    elif overlap is None:
+        overlap = 4 * p.MAX_DROPS_IN_FLIGHT
+    n_chunks = -(-n // chunk_size)
+    m = chunk_size + 2 * overlap
+    index = np.arange(n_chunks)[:, None] * chunk_size - overlap + np.arange(m)
+    in_job = (index >= 0) & (index < n)
+    voltage = voltages[np.clip(index, 0, max(n - 1, 0))]
+    valid = in_job & ~np.isnan(voltage)
+    voltage = np.where(valid, voltage, 0.0)
+    fire_time = np.arange(m) * p.T_interval
+
+    dt = p.T_interval / steps_per_interval
+    cap_start, cap_end = p.L_gun_to_cap, p.L_gun_to_cap + p.CAPACITOR_LENGTH
+    half_gap = p.CAPACITOR_WIDTH / 2 - p.R
+    a_field = (p.DROPLET_CHARGE / p.m) * voltage / p.CAPACITOR_WIDTH
+    D = p.TOTAL_DISTANCE
+    max_flight = MAX_FLIGHT_FACTOR * p.T_total_flight
+
+    position = np.zeros((n_chunks, m, 2))
+    velocity = np.zeros((n_chunks, m, 2))
+    velocity[..., 0] = p.DROPLET_VELOCITY
+    alive = np.zeros((n_chunks, m), dtype=bool)
+
+    landing_y = np.full((n_chunks, m), np.nan)
+    land_time = np.full((n_chunks, m), np.nan)
+    hit_plate = np.zeros((n_chunks, m), dtype=bool)
+    strike = np.full((3, n_chunks, m), np.nan)    # time, x, y
+    margin = np.full((n_chunks, m), np.inf)
+    lost = np.zeros((n_chunks, m), dtype=bool)
+
+    def coulomb_acc(lo, hi):
+        """Coulomb acceleration of the window of slots [lo, hi); zero for droplets that are gone."""
+        if not coulomb or hi - lo < 2:
+            return 0.0
+        return coulomb_accelerations(position[:, lo:hi], p.DROPLET_CHARGE, p.m, cutoff, method,
+                                     live=alive[:, lo:hi])
+
+    lo = fired = 0
+    step = 0
+    acc = None
+    while lo < m:
+        t = step * dt
+        # Fire every droplet due by now; it starts at the gun with no deflection
+        window_changed = acc is None
+        while fired < m and fire_time[fired] <= t + 0.5 * dt:
+            alive[:, fired] = valid[:, fired]
+            fired += 1
+            window_changed = True
+        if window_changed:
+            acc = coulomb_acc(lo, fired)
+
+        # Kick, exact drift through the field, kick; every window slice is a view
+        pos, vel, live = position[:, lo:fired], velocity[:, lo:fired], alive[:, lo:fired]
+        vel += (0.5 * dt) * acc
+        x0, y0, vy0 = pos[..., 0].copy(), pos[..., 1].copy(), vel[..., 1].copy()
+        a = a_field[:, lo:fired] * live
+        pos[..., 1], vel[..., 1], t_in, t_out = _field_drift(x0, y0, vel[..., 0], vy0, a, dt, cap_start, cap_end)
+        pos[..., 0] += dt * vel[..., 0]
+
+        # Plate check over the part of the step spent in the field: |y| peaks at
+        # an end of it or where the parabola turns
+        tau = t_out - t_in
+        y_in = y0 + vy0 * t_in
+        with np.errstate(divide='ignore', invalid='ignore'):
+            u_turn = np.fmin(np.fmax(-vy0 / a, 0.0), tau)
+        y_turn = y_in + u_turn * (vy0 + 0.5 * a * u_turn)
+        y_out = y_in + tau * (vy0 + 0.5 * a * tau)
+        peak = np.maximum(np.maximum(np.abs(y_in), np.abs(y_turn)), np.abs(y_out))
+        gap = np.where(live & (tau > 0), half_gap - peak, np.inf)
+        np.minimum(margin[:, lo:fired], gap, out=margin[:, lo:fired])
+        ended = (gap < 0).any()
+        if ended:
+            struck = np.nonzero(gap < 0)
+            y_s, vy_s, a_s = y_in[struck], vy0[struck], a[struck]
+            u_top = _plate_crossing(y_s, vy_s, a_s, half_gap)
+            u_bottom = _plate_crossing(y_s, vy_s, a_s, -half_gap)
+            u = np.where(np.abs(y_s) >= half_gap, 0.0, np.minimum(u_top, u_bottom))
+            s = t_in[struck] + u
+            b, j = struck[0], struck[1] + lo
+            strike[0, b, j] = t + s
+            strike[1, b, j] = x0[struck] + vel[..., 0][struck] * s
+            strike[2, b, j] = np.where(u_top <= u_bottom, half_gap, -half_gap)
+            hit_plate[b, j] = True
+            live[struck] = False
+
+        # Land at x = D, backing up along the step's velocity
+        arrived = live & (pos[..., 0] >= D)
+        if arrived.any():
+            landed = np.nonzero(arrived)
+            b, j = landed[0], landed[1] + lo
+            overshoot = (pos[..., 0][landed] - D) / vel[..., 0][landed]
+            land_time[b, j] = t + dt - overshoot
+            landing_y[b, j] = pos[..., 1][landed] - vel[..., 1][landed] * overshoot
+            live[landed] = False
+            ended = True
+
+        # Lost: pushed back past the nozzle, or stalled in flight
+        gone = live & ((pos[..., 0] < 0) | (t + dt - fire_time[lo:fired] > max_flight))
+        if gone.any():
+            lost[:, lo:fired] |= gone
+            live[gone] = False
+            ended = True
+
+        if ended or fired == m:
+            while lo < fired and not alive[:, lo].any():
+                lo += 1
+        # The closing kick's acceleration opens the next step unless new droplets are fired
+        acc = coulomb_acc(lo, fired)
+        velocity[:, lo:fired] += (0.5 * dt) * acc
+        step += 1
+
+    # Keep every chunk's own droplets, on the job's clock
+    keep = in_job & (np.arange(m) >= overlap) & (np.arange(m) < overlap + chunk_size)
+    chunk_start = (index - np.arange(m)) * p.T_interval
+
+    def gather(values):
+        out = np.empty(n, dtype=values.dtype)
+        out[index[keep]] = values[keep]
+        return out
+
+    return InteractionResult(
+        fire_time=np.arange(n) * p.T_interval,
+        voltage=voltages,
+        target_y=target_y,
+        landing_y=gather(landing_y),
+        land_time=gather(land_time + chunk_start),
+        hit_plate=gather(hit_plate),
+        strike_time=gather(strike[0] + chunk_start),
+        strike_x=gather(strike[1]),
+        strike_y=gather(strike[2]),
+        clearance_margin=gather(margin),
+        lost=gather(lost),
+    )
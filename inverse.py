@@ -0,0 +1,128 @@
+import os
+import numpy as np
+from dataclasses import dataclass
+from integrator import integrate_flights
+from printer_config import as_config
+from result_cache import physics_version
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'inverse')
+
+
+@dataclass
+class InverseTable:
+    """Monotone landing position -> deflection voltage table of one printer configuration.
+
+    Samples are sorted by landing position. Between samples the voltage is
+    interpolated linearly; max_error bounds the resulting landing position
+    error (m), as measured at the middle of every segment.
+    """
+    y: np.ndarray
+    voltage: np.ndarray
+    max_error: float
+
+    @property
+    def y_range(self):
+        return float(self.y[0]), float(self.y[-1])
+
+    def voltages(self, target_y):
+        """Voltages that land droplets at `target_y`; NaN where no voltage reaches it."""
+        return np.interp(target_y, self.y, self.voltage, left=np.nan, right=np.nan)
+
+
+def _landing(voltages, p, model):
+    return integrate_flights(voltages, p, **model).landing_y
+
+
+def _midpoint_errors(V0, V1, y0, y1, V_mid, y_mid):
+    """Landing error of interpolating between (V0, y0) and (V1, y1) at each segment's midpoint."""
+    return np.abs(y0 + (y1 - y0) * (V_mid - V0) / (V1 - V0) - y_mid)
+
+
+def _reachable_voltages(p, V_max, model, rounds=40):
+    """(V_low, V_high): the most negative and positive voltages whose droplets still land, by bisection."""
+    inner = np.zeros(2)
+    outer = np.array([-V_max, V_max])
+    if not np.isfinite(_landing(inner[:1], p, model)[0]):
+        raise ValueError("Droplets hit a plate even without deflection")
+    if np.isfinite(_landing(outer, p, model)).all():
+        return -V_max, V_max
+    for _ in range(rounds):
+        mid = 0.5 * (inner + outer)
+        landed = np.isfinite(_landing(mid, p, model))
+        inner = np.where(landed, mid, inner)
+        outer = np.where(landed, outer, mid)
+    return inner[0], inner[1]
+
+
+def build_table(config=None, tol=1e-7, method='rk4', drag=True, gravity=True, n_initial=33, max_rounds=30,
+                span=1.25):
+    """Builds the y -> V table of `config` by batched forward simulation.
+
+    The voltages start on an even grid over the range whose droplets land
+    (found by bisection within `span` times the ideal voltage range for the
+    full paper height). Each round simulates the midpoints of all segments
+    not yet verified in one batch and splits every segment whose midpoint is
+    interpolated worse than `tol` (m). The forward model is integrate_flights
+    with `method`, `drag` and `gravity`.
+    """
+    p = as_config(config)
+    model = dict(method=method, drag=drag, gravity=gravity)
+    V_low, V_high = _reachable_voltages(p, span * p.y_full_max_deflection * p.K_deflect, model)
+    V = np.linspace(V_low, V_high, n_initial)
+    y = _landing(V, p, model)
+
+    errors = np.zeros(len(V) - 1)
+    pending = np.ones(len(V) - 1, dtype=bool)   # Segments whose midpoint is not checked yet
+    for _ in range(max_rounds):
+        k = np.flatnonzero(pending)
+        if not len(k):
+            break
+        V_mid = 0.5 * (V[k] + V[k + 1])
+        y_mid = _landing(V_mid, p, model)
+        if not np.isfinite(y).all() or not np.isfinite(y_mid).all():
+            raise ValueError("A voltage inside the reachable range hits a plate; the response is not monotone")
+        errors[k] = _midpoint_errors(V[k], V[k + 1], y[k], y[k + 1], V_mid, y_mid)
+        pending[k] = False
+
+        # Split the segments that are off by more than tol; both halves are checked next round
+        split = errors[k] > tol
+        k, V_mid, y_mid = k[split], V_mid[split], y_mid[split]
+        errors[k] = 0.0
+        pending[k] = True
+        V = np.insert(V, k + 1, V_mid)
+        y = np.insert(y, k + 1, y_mid)
+        errors = np.insert(errors, k + 1, 0.0)
+        pending = np.insert(pending, k + 1, True)
+    if pending.any():
+        raise RuntimeError(f"Inverse table did not reach {tol} m within {max_rounds} rounds; "
+                           f"the forward model may not be that accurate")
+
+    step = np.diff(y)
+    if not ((step > 0).all() or (step < 0).all()):
+        raise ValueError("Landing position is not monotone in the voltage")
+    order = np.argsort(y)
+    return InverseTable(y=y[order], voltage=V[order], max_error=float(errors.max(initial=0.0)))
+
+
+def inverse_table(config=None, tol=1e-7, method='rk4', drag=True, gravity=True, cache_dir=CACHE_DIR):
+    """The y -> V table of `config`, loaded from `cache_dir` or built and saved there.
+
+    Tables are keyed by the full configuration, the tolerance, the forward
+    model and result_cache.physics_version(), so editing the physics rebuilds
+    them; cache_dir=None disables the cache.
+    """
+    p = as_config(config)
+    model = dict(method=method, drag=drag, gravity=gravity)
+    if cache_dir is None:
+        return build_table(p, tol=tol, **model)
+    path = os.path.join(cache_dir, p.digest(physics=physics_version(), tol=tol, **model) + '.npz')
+    if os.path.exists(path):
+        with np.load(path) as stored:
+            return InverseTable(y=stored['y'], voltage=stored['voltage'], max_error=float(stored['max_error']))
+    table = build_table(p, tol=tol, **model)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write under a temporary name first so a concurrent reader never sees a partial table
+    partial = path[:-len('.npz')] + f'.{os.getpid()}.npz'
+    np.savez(partial, y=table.y, voltage=table.voltage, max_error=table.max_error)
+    os.replace(partial, path)
+    return table
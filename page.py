@@ -0,0 +1,160 @@
+import time
+import numpy as np
+from dataclasses import dataclass
+from printer_config import as_config
+from printhead import simulate_printhead
+from result_store import status_codes
+
+# Default working-set budget of one column chunk
+MEMORY_BUDGET = 256 * 2**20
+
+# Peak bytes per droplet of simulate_printhead by integrator, temporaries included (measured with tracemalloc)
+BYTES_PER_DROPLET = {None: 128, 'rk4': 320, 'rk45': 704}
+
+# Per-column record of PageResult.columns
+COLUMN_COLUMNS = (('column', np.int64), ('pass', np.int64), ('nozzle', np.int64), ('x', np.float64),
+                  ('start_time', np.float64), ('end_time', np.float64), ('n_success', np.int64),
+                  ('n_failed', np.int64))
+
+
+@dataclass
+class PassTiming:
+    """How long the head takes per pass and the paper takes to advance between passes (s)."""
+    n_nozzles: int
+    passes: int
+    pass_time: float    # First firing to the last landing of one full-column sweep
+    feed_time: float    # Paper advance by one swath of n_nozzles * NOZZLE_PITCH at FEED_SPEED
+
+    @property
+    def period(self):
+        return self.pass_time + self.feed_time
+
+    @property
+    def page_time(self):
+        """First firing to the last landing; the paper does not advance after the last pass."""
+        return self.passes * self.pass_time + max(self.passes - 1, 0) * self.feed_time
+
+
+def pass_timing(config=None, n_nozzles=None):
+    """PassTiming of a page of N_columns_total columns for a head of NOZZLE_COUNT (or n_nozzles) nozzles."""
+    p = as_config(config)
+    if not p.FEED_SPEED > 0:
+        raise ValueError(f"FEED_SPEED must be positive to advance the paper, got {p.FEED_SPEED}")
+    n = int(p.NOZZLE_COUNT if n_nozzles is None else n_nozzles)
+    return PassTiming(
+        n_nozzles=n,
+        passes=-(-p.N_columns_total // n),
+        pass_time=(p.N_dots_total - 1) * p.T_interval + p.T_total_flight,
+        feed_time=n * p.NOZZLE_PITCH / p.FEED_SPEED,
+    )
+
+
+def chunk_columns(config=None, memory_budget=MEMORY_BUDGET, integrator=None):
+    """Columns per chunk so that one chunk's droplets stay within memory_budget bytes (at least one)."""
+    p = as_config(config)
+    return max(1, int(memory_budget // (p.N_dots_total * BYTES_PER_DROPLET[integrator])))
+
+
+@dataclass
+class PageChunk:
+    """One chunk of consecutive page columns; each column is one row of `result`."""
+    columns: np.ndarray     # Page column indices
+    start_time: np.ndarray  # Page clock at the first firing of each column's pass
+    x: np.ndarray           # Column position across the paper
+    result: object          # PrintheadResult, times relative to start_time, nozzle_x = x
+
+
+def stream_page(config=None, voltages=None, memory_budget=MEMORY_BUDGET, integrator=None):
+    """Yields the page as PageChunks of whole columns, each within memory_budget.
+
+    Column c is fired by nozzle c % NOZZLE_COUNT in pass c // NOZZLE_COUNT;
+    between passes the paper advances one swath at FEED_SPEED. `voltages`
+    holds one schedule per column, shape (N_columns_total, n_droplets),
+    and may be a memory-mapped array: only one chunk of rows is read at a
+    time. By default every column fires the full column from V_required_full.
+    """
+    p = as_config(config)
+    timing = pass_timing(p)
+    size = chunk_columns(p, memory_budget, integrator)
+    for start in range(0, p.N_columns_total, size):
+        columns = np.arange(start, min(start + size, p.N_columns_total))
+        pass_index, nozzle = np.divmod(columns, timing.n_nozzles)
+        x = (pass_index * timing.n_nozzles + nozzle) * p.NOZZLE_PITCH
+        schedule = p.V_required_full if voltages is None else voltages[start:start + len(columns)]
+        yield PageChunk(
+            columns=columns,
+            start_time=pass_index * timing.period,
+            x=x,
+            result=simulate_printhead(p, schedule, integrator=integrator, nozzle_x=x),
+        )
+
+
+@dataclass
+class PageResult:
+    """Per-column timing and statistics of a whole page."""
+    columns: np.ndarray         # Structured array of COLUMN_COLUMNS, one row per page column
+    timing: PassTiming
+    chunk_size: int             # Columns per chunk
+    chunk_seconds: np.ndarray   # Wall-clock compute time of every chunk
+
+    @property
+    def print_time(self):
+        """Page clock from the first firing to the last droplet landing or striking a plate (s)."""
+        return float(np.max(self.columns['end_time'], initial=0.0))
+
+    @property
+    def feed_time(self):
+        """Total time spent advancing the paper (s)."""
+        return max(self.timing.passes - 1, 0) * self.timing.feed_time
+
+    @property
+    def n_success(self):
+        return int(self.columns['n_success'].sum())
+
+    @property
+    def n_failed(self):
+        return int(self.columns['n_failed'].sum())
+
+    @property
+    def compute_seconds(self):
+        return float(self.chunk_seconds.sum())
+
+
+def simulate_page(config=None, voltages=None, memory_budget=MEMORY_BUDGET, integrator=None, store=None):
+    """Prints a whole page column chunk by column chunk (see stream_page).
+
+    Only per-column summaries are kept, so memory stays within one chunk.
+    `store`, a ResultWriter with PAGE_COLUMNS, receives every droplet with
+    its page-clock times, its dot index as row and its page column.
+    """
+    p = as_config(config)
+    timing = pass_timing(p)
+    table = np.zeros(p.N_columns_total, dtype=list(COLUMN_COLUMNS))
+    seconds = []
+    started = time.perf_counter()
+    for chunk in stream_page(p, voltages, memory_budget, integrator):
+        result = chunk.result
+        rows = table[chunk.columns[0]:chunk.columns[-1] + 1]
+        rows['column'] = chunk.columns
+        rows['pass'], rows['nozzle'] = np.divmod(chunk.columns, timing.n_nozzles)
+        rows['x'] = chunk.x
+        rows['start_time'] = chunk.start_time
+        rows['end_time'] = chunk.start_time + np.nanmax(np.fmax(result.land_time, result.strike_time), axis=1,
+                                                        initial=0.0)
+        rows['n_success'] = result.n_success
+        rows['n_failed'] = result.n_failed
+
+        if store is not None:
+            shift = chunk.start_time[:, None]
+            store.append(fire_time=(result.fire_time + shift).ravel(), voltage=result.voltage.ravel(),
+                         target_y=result.target_y.ravel(), landing_y=result.landing_y.ravel(),
+                         land_time=(result.land_time + shift).ravel(),
+                         status=status_codes(result).ravel(),
+                         row=np.broadcast_to(np.arange(result.n_droplets), result.voltage.shape).ravel(),
+                         column=np.repeat(chunk.columns, result.n_droplets))
+        now = time.perf_counter()
+        seconds.append(now - started)
+        started = now
+
+    return PageResult(columns=table, timing=timing, chunk_size=chunk_columns(p, memory_budget, integrator),
+                      chunk_seconds=np.array(seconds))
@@ -0,0 +1,57 @@
+from math import sqrt, pi
+from dataclasses import dataclass
+
+
+# Kinematics and Physics Calculation Functions (no plotting imports)
+
+def calc_sphere_volume(diameter):
+    """Calculates the volume of a sphere given its diameter."""
+    radius = diameter / 2
+    return (4/3) * pi * (radius ** 3)
+
+def calc_mass(density, volume):
+    """Calculates mass given density and volume."""
+    return density * volume
+
+def calc_accel_vertical(charge, electric_field, mass):
+    """Calculates vertical acceleration from electrostatic force (F=qE)."""
+    return charge * electric_field / mass
+
+def calc_velocity_vertical(accel_y, time):
+    """Calculates vertical velocity (V = a*t)."""
+    return accel_y * time
+
+def calc_electric_field(capacitor_voltage, width):
+    """Calculates electric field strength (E = V/d)."""
+    return capacitor_voltage / width
+
+def calc_capacitor_voltage(electric_field, width):
+    """Calculates required voltage (V = E*d)."""
+    return electric_field * width
+
+# Time and Distance Utilities
+
+def calc_distance(vel_x, time):
+    """Calculates distance traveled (d = v*t)."""
+    return vel_x * time
+
+def calc_time_droplet_2_paper(distance, velocity):
+    """Calculates time taken to travel a distance at constant velocity."""
+    return distance / velocity
+
+def convert_mm_to_int(mm):
+    """Converts a value from millimeters (mm) to meters (m)."""
+    return mm * 1E3
+
+
+# Data Structures
+
+@dataclass
+class Vector:
+    """A simple class for handling 2D vectors."""
+    x: float = 0.0
+    y: float = 0.0
+    
+    def magnitude(self):
+        """Calculates the magnitude (length) of the vector."""
+        return sqrt(self.x ** 2 + self.y ** 2)
\ No newline at end of file
@@ -0,0 +1,362 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.colors import Normalize
+import matplotlib.ticker as ticker
+from dataclasses import dataclass
+from functools import partial
+from drawing import init_gun, mm_formatter
+from printer_config import PrinterConfig, as_config
+from simulation import simulate
+from trajectory import calculate_positions
+from droplet_state import DropletStatus, LANDED, FAILED
+from series_buffer import SeriesBuffer
+from timeline import compile_timeline
+from artist_manager import ArtistManager
+from frame_profiler import NULL_PROFILER
+import render
+
+FRAMES_PER_DOT_INTERVAL = 2
+ANIMATION_SPEED_FACTOR = 50000
+
+
+@dataclass
+class PlateAnimation:
+    """Figure, FuncAnimation callbacks and droplet bookkeeping for one printer configuration."""
+    fig: object
+    init: object
+    animate: object
+    frames: int
+    interval_ms: float
+    droplet_status: DropletStatus
+    params: PrinterConfig
+    manager: ArtistManager
+
+
+def build_animation(config=None, decimate=1, profiler=NULL_PROFILER, cache=None):
+    """Builds the capacitor-plate figure and animation callbacks for `config` overrides.
+
+    `decimate` keeps every n-th frame; events between kept frames are still shown.
+    Pass a FrameProfiler as `profiler` to time the physics of every frame, and
+    a ResultCache as `cache` to reuse the simulated job.
+    """
+    p = as_config(config)
+
+    m = p.m
+    L_gun_to_cap = p.L_gun_to_cap
+    W = p.CAPACITOR_WIDTH
+    D = p.TOTAL_DISTANCE
+    Vx = p.DROPLET_VELOCITY
+    CAPACITOR_LENGTH = p.CAPACITOR_LENGTH
+    DROPLET_CHARGE = p.DROPLET_CHARGE
+
+    T_interval = p.T_interval
+    N_dots_total = p.N_dots_total
+    T_total_flight = p.T_total_flight
+
+    y_positions = p.y_positions
+    V_required_full = p.V_required_full
+
+    # Plate strikes are solved once for the whole job instead of sampled per frame
+    job = simulate(p) if cache is None else cache.simulate(p)
+    strike_flight_time = job.strike_time - job.fire_time
+    animation_indices = np.linspace(0, N_dots_total - 1, N_dots_total, dtype=int)
+    is_animated = np.zeros(N_dots_total, dtype=bool)
+    is_animated[animation_indices] = True
+
+    T_last_fire = (N_dots_total - 1) * T_interval
+    T_last_land = T_last_fire + T_total_flight
+    GLOBAL_TIME_STEP = T_interval / FRAMES_PER_DOT_INTERVAL
+
+    # Every fire, landing and plate strike is assigned to its frame up front
+    timeline = compile_timeline(job.fire_time, V_required_full, T_total_flight, GLOBAL_TIME_STEP,
+                                strike_time=job.strike_time, decimate=decimate)
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 8))
+
+    # Left plot: Simulation
+    ax1.set_xlim(-0.5e-3, D + 0.5e-3)
+    ax1.set_ylim(-W/2 * 1.5, W/2 * 1.5)  # Zoom in to see capacitor region better
+    ax1.xaxis.set_major_formatter(ticker.FuncFormatter(mm_formatter))
+    ax1.yaxis.set_major_formatter(ticker.FuncFormatter(mm_formatter))
+    ax1.set_title('Droplet Simulation')
+    ax1.set_xlabel('Horizontal Distance (mm)')
+    ax1.set_ylabel('Vertical Position (mm)')
+    ax1.grid(True, linestyle=':', alpha=0.6)
+
+    # Highlight capacitor region and plates
+    capacitor_x_start = L_gun_to_cap
+    capacitor_x_end = L_gun_to_cap + CAPACITOR_LENGTH
+
+    # Draw capacitor plates
+    ax1.axhline(y=W/2, xmin=capacitor_x_start/D, xmax=capacitor_x_end/D,
+               color='red', linewidth=3, linestyle='-', label='Capacitor Plates')
+    ax1.axhline(y=-W/2, xmin=capacitor_x_start/D, xmax=capacitor_x_end/D,
+               color='red', linewidth=3, linestyle='-')
+    ax1.axvspan(capacitor_x_start, capacitor_x_end, alpha=0.1, color='red',
+               label='Capacitor Region')
+
+    # Right plot: Voltage Profile
+    ax2.set_title('Applied Voltage Profile')
+    ax2.set_xlabel('Time (ms)')
+    ax2.set_ylabel('Voltage (V)')
+    ax2.grid(True, linestyle=':', alpha=0.6)
+    ax2.axhline(y=0, color='gray', linestyle='-', linewidth=0.5)
+
+    # Set voltage plot limits
+    V_min_actual = np.min(V_required_full)
+    V_max_actual = np.max(V_required_full)
+    V_range = V_max_actual - V_min_actual
+    V_min_plot = V_min_actual - 0.1 * V_range
+    V_max_plot = V_max_actual + 0.1 * V_range
+    ax2.set_ylim(V_min_plot, V_max_plot)
+    ax2.set_xlim(0, T_last_land * 1000)
+
+    init_gun(ax1)
+    ax1.axvline(x=D, color='blue', linestyle='--', linewidth=2, label='Paper Target')
+    ax1.legend(loc='upper right')
+
+    norm = Normalize(vmin=np.min(V_required_full), vmax=np.max(V_required_full))
+
+    # Create simulation plot elements
+    all_flying_droplets = ax1.scatter([], [], s=30, zorder=5, label='Flying Droplets')
+    failed_droplets = ax1.scatter([], [], s=40, marker='x', color='red', zorder=6,
+                                 label='Failed (Hit Plate)')
+    saved_dots_flight, = ax1.plot([], [], 'o', color='green', markersize=6, alpha=1.0,
+                                 label='Successfully Landed')
+
+    # Create voltage plot elements
+    voltage_line, = ax2.plot([], [], 'b-', linewidth=2, label='Applied Voltage')
+    voltage_dot, = ax2.plot([], [], 'ro', markersize=6, alpha=0.8, label='Current Voltage')
+    current_voltage_text = ax2.text(0.02, 0.98, '', transform=ax2.transAxes, fontsize=10,
+                                   bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
+
+    # Time markers for voltage plot
+    ax2.axvline(x=0, color='green', linestyle='--', alpha=0.5, label='Start')
+    ax2.axvline(x=T_last_land*1000, color='red', linestyle='--', alpha=0.5, label='End')
+    ax2.legend(loc='upper right')
+
+    # Pre-calculate voltage profile
+    time_points = np.arange(0, N_dots_total) * T_interval * 1000
+    ax2.plot(time_points, V_required_full, 'k--', alpha=0.3, linewidth=1, label='Complete Profile')
+
+    time_text = ax1.text(0.02, 0.98, '', transform=ax1.transAxes,
+                        bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
+    droplet_index_text = ax1.text(0.02, 0.94, '', transform=ax1.transAxes,
+                                 bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
+    hit_info_text = ax1.text(0.02, 0.02, '', color='red', fontsize=10,
+                            ha='left', va='bottom', transform=ax1.transAxes,
+                            bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
+
+    # Add capacitor constraints text
+    ax1.text(0.02, 0.86, f'Plate Separation: {W*1000:.2f} mm\nMax allowed: ±{W/2*1000:.2f} mm',
+             transform=ax1.transAxes, fontsize=10,
+             bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.8))
+
+    # Statistics
+    success_stats_text = ax1.text(0.02, 0.78, 'Success: 0\nFailed: 0', transform=ax1.transAxes,
+                                 fontsize=10, bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.8))
+
+    # Only these artists are redrawn each frame; everything else is a cached background
+    manager = ArtistManager(fig, [all_flying_droplets, failed_droplets, voltage_dot,
+                                  time_text, droplet_index_text, hit_info_text,
+                                  current_voltage_text, success_stats_text])
+    # New landed dots and voltage steps are baked into the background through these
+    landed_increment, = ax1.plot([], [], 'o', color='green', markersize=6, alpha=1.0, animated=True)
+    voltage_increment, = ax2.plot([], [], 'b-', linewidth=2, animated=True)
+
+    droplet_status = DropletStatus(N_dots_total)
+    landed_dots = SeriesBuffer(2, capacity=N_dots_total)
+    hit_positions_y = SeriesBuffer(capacity=N_dots_total)
+    voltage_trace = SeriesBuffer(2, capacity=N_dots_total)  # (time in ms, voltage)
+
+    def init():
+        # Initialize simulation plot
+        all_flying_droplets.set_offsets(np.empty((0, 2)))
+        failed_droplets.set_offsets(np.empty((0, 2)))
+        saved_dots_flight.set_data([], [])
+
+        # Initialize voltage plot
+        voltage_line.set_data([], [])
+        voltage_dot.set_data([], [])
+
+        time_text.set_text('')
+        droplet_index_text.set_text('')
+        hit_info_text.set_text('')
+        current_voltage_text.set_text('Voltage: 0.00 V')
+        success_stats_text.set_text('Success: 0\nFailed: 0')
+
+        # Reset droplet status
+        manager.invalidate()
+        droplet_status.reset()
+        landed_dots.clear()
+        hit_positions_y.clear()
+        voltage_trace.clear()
+
+        return (all_flying_droplets, failed_droplets, saved_dots_flight,
+                voltage_line, voltage_dot, time_text, droplet_index_text,
+                hit_info_text, current_voltage_text, success_stats_text)
+
+    def animate(frame):
+        t_global = timeline.frame_times[frame]
+        current_firing_index = timeline.firing_index[frame]
+
+        # Update voltage profile
+        fired = timeline.fired(frame)
+        if len(fired):
+            voltage_trace.extend(job.fire_time[fired] * 1000, V_required_full[fired])
+            voltage_line.set_data(*voltage_trace.columns())
+            # Include the previous step so the baked segment joins the existing line
+            voltage_increment.set_data(*(column[-len(fired) - 1:] for column in voltage_trace.columns()))
+            manager.bake(voltage_increment)
+
+        # Update voltage plot
+        if len(voltage_trace):
+            V_current = timeline.voltage[frame]
+            voltage_dot.set_data([job.fire_time[current_firing_index] * 1000], [V_current])
+            current_voltage_text.set_text(f'Voltage: {V_current:.2f} V')
+
+        with profiler.phase('physics'):
+            in_window = timeline.in_flight(frame)
+            t_since_fire = t_global - job.fire_time[in_window]
+
+            # Droplets past their exact strike time have hit a capacitor plate
+            in_window = in_window[~(t_since_fire >= strike_flight_time[in_window])]
+
+            x, y, V, _ = calculate_positions(
+                in_window, t_global - job.fire_time[in_window], V_required_full,
+                charge=DROPLET_CHARGE, mass=m, W=W, Vx=Vx,
+                L_gun_to_cap=L_gun_to_cap, L_cap=CAPACITOR_LENGTH)
+
+            droplet_status.update_flying(in_window, x, y, V)
+
+        animated = is_animated[in_window]
+        flying_positions = np.column_stack((x[animated], y[animated]))
+        flying_voltages = V[animated]
+
+        # Droplet hit capacitor plate
+        struck = timeline.struck(frame)
+        droplet_status.mark_failed(struck, job.strike_x[struck], job.strike_y[struck])
+        struck = struck[is_animated[struck]]
+        failed_positions = np.column_stack((job.strike_x[struck], job.strike_y[struck]))
+
+        # Update flying droplets display
+        if len(flying_positions):
+            all_flying_droplets.set_offsets(flying_positions)
+            colors = plt.cm.coolwarm(norm(flying_voltages))
+            all_flying_droplets.set_color(colors)
+        else:
+            all_flying_droplets.set_offsets(np.empty((0, 2)))
+
+        # Update failed droplets display
+        if len(failed_positions):
+            failed_droplets.set_offsets(failed_positions)
+        else:
+            failed_droplets.set_offsets(np.empty((0, 2)))
+
+        # Successful landings
+        landed = timeline.landed(frame)
+        droplet_status.mark_landed(landed)
+        landed = landed[is_animated[landed]]
+
+        if len(landed):
+            y_target = y_positions[landed]
+
+            # Add to landed dots display
+            landed_dots.extend(D, y_target)
+            saved_dots_flight.set_data(*landed_dots.columns())
+            landed_increment.set_data(np.full(len(y_target), D), y_target)
+            manager.bake(landed_increment)
+
+            hit_positions_y.extend(y_target)
+
+            hit_info_text.set_text(f'LAST HIT: Y={y_target[-1]*1000:.2f} mm')
+
+        if len(struck):
+            hit_info_text.set_text(f'Dot {struck[-1]} HIT CAPACITOR PLATE')
+
+        # Update statistics
+        success_count = droplet_status.count(LANDED)
+        failed_count = droplet_status.count(FAILED)
+        success_stats_text.set_text(f'Success: {success_count}\nFailed: {failed_count}')
+
+        # Update time and index display
+        dot_index_in_sequence = current_firing_index + 1
+
+        time_text.set_text(f'Time: {t_global*1000:.3f} ms')
+        droplet_index_text.set_text(f'Dot: {dot_index_in_sequence}/{N_dots_total}')
+
+        # Show completion message
+        if t_global >= T_last_land:
+            total_failed = droplet_status.count(FAILED)
+            total_success = droplet_status.count(LANDED)
+            hit_info_text.set_text(f'COMPLETE. Success: {total_success}, Failed: {total_failed}')
+
+        return (all_flying_droplets, failed_droplets, saved_dots_flight,
+                voltage_line, voltage_dot, time_text, droplet_index_text,
+                hit_info_text, current_voltage_text, success_stats_text)
+
+    interval_ms = (GLOBAL_TIME_STEP * decimate * 1000) / ANIMATION_SPEED_FACTOR
+
+    return PlateAnimation(fig=fig, init=init, animate=animate, frames=timeline.n_frames,
+                          interval_ms=interval_ms, droplet_status=droplet_status, params=p,
+                          manager=manager)
+
+
+def print_final_statistics(droplet_status, params):
+    """Prints the success/failure summary gathered by the animation."""
+    y_positions = params.y_positions
+    V_required_full = params.V_required_full
+
+    print(f"\n=== FINAL STATISTICS ===")
+    print(f"Total droplets fired: {params.N_dots_total}")
+    failed = droplet_status.indices(FAILED)
+    print(f"Droplets that would hit capacitor plates: {len(failed)}")
+    print(f"Droplets that would successfully reach paper: {droplet_status.count(LANDED)}")
+
+    # Check which positions fail
+    if len(failed):
+        print("\nDroplets that hit plates (indices):")
+        for idx in failed[:10]:  # Show first 10
+            y_target = y_positions[idx]
+            V_applied = V_required_full[idx]
+            print(f"  Index {idx}: y_target={y_target*1000:.2f} mm, V={V_applied:.2f} V")
+        if len(failed) > 10:
+            print(f"  ... and {len(failed)-10} more")
+
+
+def run_animation(config=None, save_path=None, decimate=1, display=True, workers=None, cache=None):
+    """Shows the capacitor-plate animation for `config` overrides of constants.py.
+
+    With display=False nothing is shown and the animation is only rendered to
+    `save_path` (if given) by `workers` processes. Every render process takes
+    the simulated job from `cache` (a ResultCache) when one is given.
+    """
+    p = as_config(config)
+    W = p.CAPACITOR_WIDTH
+
+    print("=== CAPACITOR PLATE CONSTRAINTS ===")
+    print(f"Capacitor width (plate separation): {W*1000:.2f} mm")
+    print(f"Max allowed vertical displacement inside capacitor: ±{W/2*1000:.2f} mm")
+
+    anim = build_animation(config, decimate=decimate, cache=cache)
+
+    T_last_land = (p.N_dots_total - 1) * p.T_interval + p.T_total_flight
+    print(f"\n=== ANIMATION PARAMETERS ===")
+    print(f"Total simulation time: {T_last_land*1000:.3f} ms")
+    print(f"Number of dots: {p.N_dots_total}")
+    print(f"Droplets will be removed if they exceed ±{W/2*1000:.2f} mm in capacitor")
+
+    if display:
+        # Static geometry is drawn once; frames only blit the dynamic artists
+        timer = anim.manager.play(anim.animate, anim.frames, anim.interval_ms, init_func=anim.init)
+
+    if save_path:
+        render.render_video(partial(render.plate_animation, config, decimate, cache), anim.frames, save_path,
+                            fps=50, workers=workers)
+
+    if display:
+        plt.tight_layout()
+        plt.show()
+        timer.stop()
+        print_final_statistics(anim.droplet_status, p)
+    return anim
@@ -0,0 +1,152 @@
+import dataclasses
+import hashlib
+import numpy as np
+from dataclasses import dataclass
+from functools import cached_property
+import constants
+
+
+@dataclass(frozen=True)
+class PrinterConfig:
+    """One printer configuration: the constants.py values plus lazily derived quantities.
+
+    Instances are immutable and hashable, so many configurations can live in
+    one process side by side. Derived properties are computed on first
+    access and cached on the instance; replace() returns a new configuration
+    with fresh caches.
+    """
+    # Droplet Properties
+    DROPLET_DIAMETER: float = constants.DROPLET_DIAMETER
+    DROPLET_CHARGE: float = constants.DROPLET_CHARGE
+    DROPLET_VELOCITY: float = constants.DROPLET_VELOCITY
+    DROPLET_DENSITY: float = constants.DROPLET_DENSITY
+
+    # Printer Configuration
+    PRINTER_RESOLUTION: int = constants.PRINTER_RESOLUTION
+    TOTAL_DISTANCE: float = constants.TOTAL_DISTANCE
+    CAPACITOR_WIDTH: float = constants.CAPACITOR_WIDTH
+    CAPACITOR_LENGTH: float = constants.CAPACITOR_LENGTH
+    CAPACITOR_DISTANCE: float = constants.CAPACITOR_DISTANCE
+    NOZZLE_COUNT: int = constants.NOZZLE_COUNT
+    NOZZLE_PITCH: float = constants.NOZZLE_PITCH
+    FEED_SPEED: float = constants.FEED_SPEED
+
+    # Paper Dimensions
+    PAPER_HEIGHT: float = constants.PAPER_HEIGHT
+    PAPER_WIDTH: float = constants.PAPER_WIDTH
+
+    # Environment
+    AIR_DENSITY: float = constants.AIR_DENSITY
+    AIR_VISCOSITY: float = constants.AIR_VISCOSITY
+    GRAVITY: float = constants.GRAVITY
+
+    # Conversion
+    INCHES_2_METERS: float = constants.INCHES_2_METERS
+
+    # Gun Visualization Geometry
+    GUN_WIDTH: float = constants.GUN_WIDTH
+    GUN_HEIGHT: float = constants.GUN_HEIGHT
+    GUN_X_START: float = constants.GUN_X_START
+    GUN_Y_START: float = constants.GUN_Y_START
+
+    # Animation Parameters
+    FRAMES_PER_DOT_INTERVAL: int = constants.FRAMES_PER_DOT_INTERVAL
+    ANIMATION_SPEED_FACTOR: float = constants.ANIMATION_SPEED_FACTOR
+
+    def replace(self, **overrides):
+        """Copy with the named constants changed, e.g. config.replace(CAPACITOR_LENGTH=1e-3)."""
+        unknown = set(overrides) - set(PARAMETER_NAMES)
+        if unknown:
+            raise KeyError(f"Unknown printer parameters: {sorted(unknown)}")
+        return dataclasses.replace(self, **overrides)
+
+    def overrides(self):
+        """The constants that differ from constants.py, as a dict."""
+        return {name: getattr(self, name) for name in PARAMETER_NAMES
+                if getattr(self, name) != getattr(constants, name)}
+
+    def digest(self, **options):
+        """Hex SHA-256 of every parameter value plus `options` (e.g. model settings).
+
+        Stable across processes and runs, so it can key results stored on disk.
+        """
+        items = [(name, getattr(self, name)) for name in PARAMETER_NAMES] + sorted(options.items())
+        return hashlib.sha256(repr(items).encode()).hexdigest()
+
+    # Droplet Kinematics
+    @cached_property
+    def R(self):
+        return self.DROPLET_DIAMETER / 2
+
+    @cached_property
+    def m(self):
+        return self.DROPLET_DENSITY * (4/3) * np.pi * self.R**3
+
+    @cached_property
+    def q_over_m_abs(self):
+        return abs(self.DROPLET_CHARGE) / self.m
+
+    # Geometry and Timing
+    @cached_property
+    def L_gun_to_cap(self):
+        return self.TOTAL_DISTANCE - self.CAPACITOR_LENGTH - self.CAPACITOR_DISTANCE
+
+    @cached_property
+    def T_interval(self):
+        return self.CAPACITOR_LENGTH / self.DROPLET_VELOCITY
+
+    @cached_property
+    def T_total_flight(self):
+        return self.TOTAL_DISTANCE / self.DROPLET_VELOCITY
+
+    @cached_property
+    def N_dots_total(self):
+        return int(self.PAPER_HEIGHT * self.PRINTER_RESOLUTION)
+
+    @cached_property
+    def N_columns_total(self):
+        return int(self.PAPER_WIDTH * self.PRINTER_RESOLUTION)
+
+    @cached_property
+    def MAX_DROPS_IN_FLIGHT(self):
+        return int(np.ceil(self.T_total_flight / self.T_interval))
+
+    # Deflection constant and the voltage staircase for one full column
+    @cached_property
+    def K_deflect(self):
+        W, L, Vx = self.CAPACITOR_WIDTH, self.CAPACITOR_LENGTH, self.DROPLET_VELOCITY
+        return (1.0 / self.q_over_m_abs) * (W * Vx**2) / (L * (L/2 + self.CAPACITOR_DISTANCE))
+
+    @cached_property
+    def y_full_max_deflection(self):
+        return self.PAPER_HEIGHT * self.INCHES_2_METERS / 2
+
+    @cached_property
+    def y_positions(self):
+        y = np.linspace(-self.y_full_max_deflection, self.y_full_max_deflection, self.N_dots_total)
+        y.flags.writeable = False  # Shared by every user of this config
+        return y
+
+    @cached_property
+    def V_required_full(self):
+        V = self.y_positions * self.K_deflect * np.sign(self.DROPLET_CHARGE)
+        V.flags.writeable = False
+        return V
+
+
+# Names of the physical parameters that can be overridden through a config
+PARAMETER_NAMES = tuple(field.name for field in dataclasses.fields(PrinterConfig))
+
+# Value type of every parameter (int or float)
+PARAMETER_TYPES = {field.name: field.type for field in dataclasses.fields(PrinterConfig)}
+
+DEFAULT_CONFIG = PrinterConfig()
+
+
+def as_config(config=None):
+    """PrinterConfig for `config`: None (defaults), a PrinterConfig, or a dict of overrides."""
+    if config is None:
+        return DEFAULT_CONFIG
+    if isinstance(config, PrinterConfig):
+        return config
+    return DEFAULT_CONFIG.replace(**config)
@@ -0,0 +1,189 @@
+import warnings
+import numpy as np
+from dataclasses import dataclass
+from printer_config import as_config
+from simulation import SimulationResult
+from trajectory import calculate_positions, solve_plate_collisions
+
+# Statistics columns of PrintheadResult.nozzle_table(), one row per nozzle
+NOZZLE_COLUMNS = (('nozzle', np.int64), ('x', np.float64), ('n_droplets', np.int64), ('n_success', np.int64),
+                  ('n_failed', np.int64), ('success_rate', np.float64), ('V_max', np.float64),
+                  ('max_landing_error', np.float64))
+
+# Columns of throughput()
+THROUGHPUT_COLUMNS = (('n_nozzles', np.int64), ('passes', np.int64), ('pass_time', np.float64),
+                      ('feed_time', np.float64), ('page_time', np.float64), ('pages_per_minute', np.float64))
+
+
+@dataclass
+class PrintheadResult:
+    """Per-(nozzle, droplet) arrays for one pass of a multi-nozzle head (NaN where a quantity does not apply).
+
+    Every array has shape (n_nozzles, n_droplets) except nozzle_x, the
+    position of each nozzle across the paper. All nozzles fire in the same
+    slots, so fire_time is a broadcast view of one row.
+    """
+    nozzle_x: np.ndarray
+    fire_time: np.ndarray
+    voltage: np.ndarray
+    target_y: np.ndarray
+    landing_y: np.ndarray
+    land_time: np.ndarray
+    hit_plate: np.ndarray
+    strike_time: np.ndarray
+    strike_x: np.ndarray
+    strike_y: np.ndarray
+    clearance_margin: np.ndarray
+
+    @property
+    def n_nozzles(self):
+        return self.voltage.shape[0]
+
+    @property
+    def n_droplets(self):
+        """Droplets fired per nozzle."""
+        return self.voltage.shape[1]
+
+    @property
+    def n_failed(self):
+        """Plate strikes per nozzle."""
+        return np.count_nonzero(self.hit_plate, axis=1)
+
+    @property
+    def n_success(self):
+        return self.n_droplets - self.n_failed
+
+    @property
+    def pass_time(self):
+        """First firing to the last droplet landing or striking a plate (s)."""
+        return float(np.nanmax(np.fmax(self.land_time, self.strike_time), initial=0.0))
+
+    @property
+    def dots_per_second(self):
+        """Dots landed by the whole head per second of the pass."""
+        return int(self.n_success.sum()) / self.pass_time if self.pass_time > 0 else 0.0
+
+    def nozzle(self, i):
+        """The SimulationResult of nozzle `i` alone."""
+        return SimulationResult(**{name: np.array(getattr(self, name)[i]) for name in (
+            'fire_time', 'voltage', 'target_y', 'landing_y', 'land_time', 'hit_plate', 'strike_time',
+            'strike_x', 'strike_y', 'clearance_margin')})
+
+    def nozzle_table(self):
+        """Structured array of NOZZLE_COLUMNS statistics, one row per nozzle."""
+        table = np.zeros(self.n_nozzles, dtype=list(NOZZLE_COLUMNS))
+        table['nozzle'] = np.arange(self.n_nozzles)
+        table['x'] = self.nozzle_x
+        table['n_droplets'] = self.n_droplets
+        table['n_success'] = self.n_success
+        table['n_failed'] = self.n_failed
+        table['success_rate'] = self.n_success / max(self.n_droplets, 1)
+        table['V_max'] = np.max(np.abs(self.voltage), axis=1, initial=0.0)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)    # Nozzles whose droplets all struck a plate
+            table['max_landing_error'] = np.nanmax(np.abs(self.landing_y - self.target_y), axis=1)
+        return table
+
+
+def nozzle_positions(config=None, n_nozzles=None):
+    """x of every nozzle across the paper: NOZZLE_PITCH apart, nozzle 0 at 0."""
+    p = as_config(config)
+    n = int(p.NOZZLE_COUNT if n_nozzles is None else n_nozzles)
+    return np.arange(n) * p.NOZZLE_PITCH
+
+
+def simulate_printhead(config=None, voltages=None, n_nozzles=None, integrator=None, nozzle_x=None):
+    """One pass of a head of NOZZLE_COUNT nozzles (or `n_nozzles`), all nozzles at once.
+
+    `voltages` is one schedule per nozzle, shape (n_nozzles, n_droplets), or
+    a single (n_droplets,) schedule fired by every nozzle; by default every
+    nozzle fires the full column from V_required_full. `nozzle_x` places the
+    nozzles across the paper (default nozzle_positions()), e.g. at the page
+    columns they print. Nozzles are an array axis: landings and plate
+    strikes broadcast over (nozzle, droplet) without a loop over nozzles.
+    `integrator` 'rk4' or 'rk45' integrates the flattened batch numerically
+    as in simulate(). Nozzles are independent; droplets from different
+    nozzles do not interact.
+    """
+    p = as_config(config)
+    if voltages is None:
+        voltages = p.V_required_full
+    voltages = np.asarray(voltages, dtype=float)
+    if nozzle_x is not None:
+        nozzle_x = np.asarray(nozzle_x, dtype=float)
+    elif n_nozzles is None and voltages.ndim == 2:
+        nozzle_x = nozzle_positions(p, voltages.shape[0])
+    else:
+        nozzle_x = nozzle_positions(p, n_nozzles)
+    if voltages.ndim == 1:
+        voltages = np.broadcast_to(voltages, (len(nozzle_x), len(voltages)))
+    if voltages.ndim != 2 or voltages.shape[0] != len(nozzle_x):
+        raise ValueError(f"Expected voltages of shape ({len(nozzle_x)}, n_droplets), got {voltages.shape}")
+
+    target_y = voltages / (p.K_deflect * np.sign(p.DROPLET_CHARGE))
+    fire_time = np.broadcast_to(np.arange(voltages.shape[1]) * p.T_interval, voltages.shape)
+
+    if integrator is not None:
+        from integrator import integrate_flights
+        flights = integrate_flights(voltages.ravel(), p, method=integrator)
+
+        def shaped(values):
+            return values.reshape(voltages.shape)
+
+        return PrintheadResult(
+            nozzle_x=nozzle_x,
+            fire_time=fire_time,
+            voltage=voltages,
+            target_y=target_y,
+            landing_y=shaped(flights.landing_y),
+            land_time=fire_time + shaped(flights.flight_time),
+            hit_plate=shaped(flights.hit_plate),
+            strike_time=fire_time + shaped(flights.t_strike),
+            strike_x=shaped(flights.x_strike),
+            strike_y=shaped(flights.y_strike),
+            clearance_margin=shaped(flights.margin),
+        )
+
+    kinematics = dict(charge=p.DROPLET_CHARGE, mass=p.m, W=p.CAPACITOR_WIDTH,
+                      Vx=p.DROPLET_VELOCITY, L_gun_to_cap=p.L_gun_to_cap,
+                      L_cap=p.CAPACITOR_LENGTH)
+
+    # Droplet (i, j) is entry i * n_droplets + j of the flattened schedules
+    idx = np.arange(voltages.size).reshape(voltages.shape)
+    _, landing_y, _, _ = calculate_positions(idx, p.T_total_flight, voltages.ravel(), **kinematics)
+    collisions = solve_plate_collisions(voltages, radius=p.R, **kinematics)
+    hit_plate = collisions.hit
+
+    return PrintheadResult(
+        nozzle_x=nozzle_x,
+        fire_time=fire_time,
+        voltage=voltages,
+        target_y=target_y,
+        landing_y=np.where(hit_plate, np.nan, landing_y),
+        land_time=np.where(hit_plate, np.nan, fire_time + p.T_total_flight),
+        hit_plate=hit_plate,
+        strike_time=fire_time + collisions.t_strike,
+        strike_x=collisions.x_strike,
+        strike_y=collisions.y_strike,
+        clearance_margin=collisions.margin,
+    )
+
+
+def throughput(config=None, nozzle_counts=(1, 8, 32, 128, 512)):
+    """Structured array of THROUGHPUT_COLUMNS: page time against head size.
+
+    A head of n nozzles prints n columns per pass, so a page of
+    N_columns_total columns takes ceil(N_columns_total / n) passes of one
+    full-column sweep each (first firing to last landing), with the paper
+    advancing one swath at FEED_SPEED between passes (see page.pass_timing).
+    """
+    from page import pass_timing
+    timings = [pass_timing(config, n) for n in nozzle_counts]
+    table = np.zeros(len(timings), dtype=list(THROUGHPUT_COLUMNS))
+    table['n_nozzles'] = [timing.n_nozzles for timing in timings]
+    table['passes'] = [timing.passes for timing in timings]
+    table['pass_time'] = [timing.pass_time for timing in timings]
+    table['feed_time'] = [timing.feed_time for timing in timings]
+    table['page_time'] = [timing.page_time for timing in timings]
+    table['pages_per_minute'] = 60 / table['page_time']
+    return table
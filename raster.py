@@ -0,0 +1,298 @@
+import struct
+import sys
+import zlib
+import numpy as np
+from dataclasses import dataclass
+from printer_config import as_config
+
+# Rec. 601 luma weights used to turn colour pixels into ink coverage
+LUMA = np.array([0.299, 0.587, 0.114])
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}   # Samples per pixel by colour type
+PNG_LINE_BLOCK = 512                            # Scan lines inflated and unfiltered together
+
+
+# Scan line readers: each yields one row of darkness values (0 = white, 1 = black)
+
+def _pnm_token(f):
+    """Next whitespace-separated header token, skipping # comments."""
+    token = b''
+    while True:
+        c = f.read(1)
+        if not c:
+            return token
+        if c == b'#':
+            f.readline()
+            c = b' '
+        if c.isspace():
+            if token:
+                return token
+        else:
+            token += c
+
+
+def _read_pnm(f):
+    magic = f.read(2)
+    width, height = int(_pnm_token(f)), int(_pnm_token(f))
+    maxval = 1 if magic in (b'P1', b'P4') else int(_pnm_token(f))
+    channels = 3 if magic in (b'P3', b'P6') else 1
+    yield width, height
+
+    for _ in range(height):
+        if magic == b'P1':
+            # Plain PBM digits need not be separated by whitespace
+            row = np.empty(width)
+            for i in range(width):
+                c = f.read(1)
+                while c.isspace() or c == b'#':
+                    if c == b'#':
+                        f.readline()
+                    c = f.read(1)
+                row[i] = int(c)
+            yield row
+        elif magic == b'P4':
+            bits = np.unpackbits(np.frombuffer(f.read((width + 7) // 8), dtype=np.uint8))
+            yield bits[:width].astype(float)
+        elif magic in (b'P2', b'P3'):
+            samples = np.array([int(_pnm_token(f)) for _ in range(width * channels)], dtype=float)
+            yield _darkness(samples.reshape(width, channels), maxval)
+        else:
+            dtype = np.uint8 if maxval < 256 else np.dtype('>u2')
+            data = f.read(width * channels * np.dtype(dtype).itemsize)
+            samples = np.frombuffer(data, dtype=dtype).astype(float)
+            yield _darkness(samples.reshape(width, channels), maxval)
+
+
+def _darkness(pixels, maxval, alpha=None):
+    """Ink coverage of (width, channels) samples, compositing any alpha over white paper."""
+    if pixels.shape[1] == 3:
+        lightness = pixels @ LUMA / maxval
+    else:
+        lightness = pixels[:, 0] / maxval
+    if alpha is not None:
+        lightness = lightness * alpha + (1 - alpha)
+    return 1 - lightness
+
+
+def _unfilter(lines, prior, bpp):
+    """Reverses the PNG filters of consecutive scan lines (filter type byte first): (n_lines, stride) bytes.
+
+    None, Sub and Up lines are undone with whole-line array operations.
+    Average and Paeth predict each byte from the reconstructed one a pixel to
+    the left, so a block holding either is swept along anti-diagonals
+    instead: pixel c of line r only needs line r - 1 up to pixel c and pixel
+    c - 1 of line r, so step k reconstructs pixel k - r of every line r at once.
+    """
+    stride = len(prior)
+    raw = np.frombuffer(b''.join(lines), dtype=np.uint8).reshape(len(lines), stride + 1)
+    kinds = raw[:, 0]
+    if kinds.max(initial=0) > 4:
+        raise ValueError(f'Unknown PNG filter type {kinds.max()}')
+
+    if not np.isin(kinds, (3, 4)).any():
+        out = np.empty((len(lines), stride), dtype=np.uint8)
+        for r, (kind, line) in enumerate(zip(kinds, raw[:, 1:])):
+            if kind == 0:
+                out[r] = line
+            elif kind == 1:
+                # Sub: each byte adds the reconstructed byte one pixel to the left
+                out[r] = (np.cumsum(line.reshape(-1, bpp), axis=0, dtype=np.uint64) % 256).astype(np.uint8).ravel()
+            else:
+                out[r] = line + prior
+            prior = out[r]
+        return out
+
+    # Line r - 1 (r = 0: the prior line) is row r of a skewed grid that holds its pixel c in column
+    # c + r + 1, so pixel c of every line is reconstructed in the same step and every neighbour is a slice
+    n_lines, n_pixels = len(lines), stride // bpp
+    grid = np.zeros((n_lines + 1, n_pixels + n_lines + 1, bpp), dtype=np.int16)
+    data = np.zeros_like(grid)
+    grid[0, 1:n_pixels + 1] = prior.reshape(n_pixels, bpp)
+    for r in range(1, n_lines + 1):
+        data[r, r + 1:r + 1 + n_pixels] = raw[r - 1, 1:].reshape(n_pixels, bpp)
+    kind = np.concatenate([[0], kinds])[:, None]
+    used = [(value, kind == value) for value in range(4) if (kinds == value).any()]
+    paeth = (kinds == 4).any()
+    for k in range(2, n_pixels + n_lines + 1):
+        lo, hi = max(1, k - n_pixels), min(n_lines, k - 1) + 1
+        left, up, up_left = grid[lo:hi, k - 1], grid[lo - 1:hi - 1, k - 1], grid[lo - 1:hi - 1, k - 2]
+        if paeth:
+            pa, pb = np.abs(up - up_left), np.abs(left - up_left)
+            pc = np.abs(left + up - 2 * up_left)
+            predictor = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, up_left))
+        else:
+            predictor = np.zeros_like(left)
+        for value, mask in used:
+            choice = (left + up) >> 1 if value == 3 else (0, left, up)[value]
+            predictor = np.where(mask[lo:hi], choice, predictor)
+        grid[lo:hi, k] = (data[lo:hi, k] + predictor) & 0xFF
+    out = np.empty((n_lines, stride), dtype=np.uint8)
+    for r in range(1, n_lines + 1):
+        out[r - 1] = grid[r, r + 1:r + 1 + n_pixels].ravel()
+    return out
+
+
+def _read_png(f):
+    if f.read(8) != PNG_SIGNATURE:
+        raise ValueError('Not a PNG file')
+    palette = None
+    header = None
+    inflater = zlib.decompressobj()
+    pending = b''
+    prior = None
+    rows_left = 0
+
+    def complete_lines(final=False):
+        # Unfilters the inflated scan lines in blocks of PNG_LINE_BLOCK (the last block may be shorter)
+        nonlocal pending, prior, rows_left
+        while rows_left:
+            n = min(len(pending) // (stride + 1), rows_left, PNG_LINE_BLOCK)
+            if n == 0 or (n < min(rows_left, PNG_LINE_BLOCK) and not final):
+                return
+            lines = [pending[i * (stride + 1):(i + 1) * (stride + 1)] for i in range(n)]
+            pending = pending[n * (stride + 1):]
+            rows = _unfilter(lines, prior, bpp)
+            prior = rows[-1]
+            rows_left -= n
+            for row in rows:
+                yield _png_darkness(row, width, depth, colour, palette)
+
+    while True:
+        length, kind = struct.unpack('>I4s', f.read(8))
+        data = f.read(length)
+        f.read(4)  # CRC
+
+        if kind == b'IHDR':
+            width, height, depth, colour, _, _, interlace = struct.unpack('>IIBBBBB', data)
+            if interlace:
+                raise ValueError('Interlaced PNG files are not supported')
+            channels = PNG_CHANNELS[colour]
+            stride = (width * channels * depth + 7) // 8
+            bpp = max(1, channels * depth // 8)
+            prior = np.zeros(stride, dtype=np.uint8)
+            rows_left = height
+            header = (width, height)
+            yield header
+        elif kind == b'PLTE':
+            palette = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3).astype(float)
+        elif kind == b'IDAT':
+            # Inflate a block of lines at a time so memory stays bounded by the line size, and
+            # keep draining the inflater after the input runs out: it may still hold output
+            while rows_left:
+                inflated = inflater.decompress(data, PNG_LINE_BLOCK * (stride + 1))
+                data = inflater.unconsumed_tail
+                if not inflated and not data:
+                    break
+                pending += inflated
+                yield from complete_lines()
+        elif kind == b'IEND':
+            pending += inflater.flush()
+            yield from complete_lines(final=True)
+            return
+
+
+def _png_darkness(row, width, depth, colour, palette):
+    channels = PNG_CHANNELS[colour]
+    if depth == 16:
+        samples = row.view('>u2').astype(float)
+    elif depth == 8:
+        samples = row.astype(float)
+    else:
+        bits = np.unpackbits(row).reshape(-1, depth)
+        samples = (bits @ (1 << np.arange(depth - 1, -1, -1))).astype(float)
+    samples = samples[:width * channels].reshape(width, channels)
+
+    if colour == 3:
+        return _darkness(palette[samples[:, 0].astype(int)], 255)
+    maxval = (1 << depth) - 1
+    if colour in (4, 6):
+        return _darkness(samples[:, :-1], maxval, alpha=samples[:, -1] / maxval)
+    return _darkness(samples, maxval)
+
+
+def scan_lines(path):
+    """Yields (width, height) and then the image one row of darkness values at a time.
+
+    Reads PBM/PGM/PPM (plain and raw) and non-interlaced PNG. Only the current
+    row (for PNG, one block of PNG_LINE_BLOCK rows) is held in memory.
+    """
+    with open(path, 'rb') as f:
+        magic = f.read(2)
+        f.seek(0)
+        if magic in (b'P1', b'P2', b'P3', b'P4', b'P5', b'P6'):
+            yield from _read_pnm(f)
+        elif magic == PNG_SIGNATURE[:2]:
+            yield from _read_png(f)
+        else:
+            raise ValueError(f'Unsupported image format: {path}')
+
+
+# Firing schedule
+
+@dataclass
+class FiringBatch:
+    """The droplets fired for one image column: one deflection sweep down a page column."""
+    column: int             # Image column = page column of the sweep
+    row: np.ndarray         # Inked image rows = dots along the sweep, counted from the top (+y)
+    slot: np.ndarray        # Firing slot on the page clock, one per T_interval
+    fire_time: np.ndarray
+    target_y: np.ndarray
+    voltage: np.ndarray
+
+
+def firing_schedule(path, config=None, threshold=0.5, table=None):
+    """Streams the firing events that print the bitmap at `path`, one FiringBatch per image column.
+
+    The image is printed upright, one pixel per dot: image column c is page
+    column c, printed by one deflection sweep of N_dots_total slots (one per
+    T_interval) that runs down the paper from +y, so row r is the r-th dot
+    from the top (y_positions[-1 - r]) and is fired in slot r of the sweep.
+    Pixels at least `threshold` dark are inked; blank pixels keep their slot
+    but fire nothing, and columns without ink are skipped. Voltages use the
+    same K_deflect mapping as calculations.py, or come from `table` (an
+    inverse.InverseTable) when given, NaN where the table cannot reach the
+    target. The scan lines are read once and kept at one bit per pixel.
+    """
+    p = as_config(config)
+    lines = scan_lines(path)
+    width, height = next(lines)
+    if width > p.N_columns_total or height > p.N_dots_total:
+        raise ValueError(f"Image is {width} x {height} px but a page only has "
+                         f"{p.N_columns_total} x {p.N_dots_total} dots")
+
+    # y of the r-th dot from the top without building the full column
+    y_max = p.y_full_max_deflection
+    y_pitch = 2 * y_max / max(p.N_dots_total - 1, 1)
+    gain = p.K_deflect * np.sign(p.DROPLET_CHARGE)
+
+    # Inked pixels packed eight columns to a byte, unpacked again eight columns at a time
+    ink = np.zeros((height, -(-width // 8)), dtype=np.uint8)
+    for row, darkness in enumerate(lines):
+        ink[row] = np.packbits(darkness >= threshold)
+
+    for block in range(ink.shape[1]):
+        bits = np.unpackbits(ink[:, block, None], axis=1)
+        for k in range(min(8, width - 8 * block)):
+            row = np.flatnonzero(bits[:, k])
+            if row.size == 0:
+                continue
+            column = 8 * block + k
+            slot = column * p.N_dots_total + row
+            target_y = y_max - row * y_pitch
+            yield FiringBatch(
+                column=column,
+                row=row,
+                slot=slot,
+                fire_time=slot * p.T_interval,
+                target_y=target_y,
+                voltage=target_y * gain if table is None else table.voltages(target_y),
+            )
+
+
+if __name__ == '__main__':
+    n_columns = n_droplets = 0
+    for batch in firing_schedule(sys.argv[1]):
+        n_columns += 1
+        n_droplets += batch.row.size
+    print(f"{n_droplets} droplets on {n_columns} inked columns")
@@ -0,0 +1,102 @@
+import importlib
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import matplotlib
+
+
+def module_animation(module_name):
+    """(fig, init, animate) of a script that builds its animation at module level."""
+    module = importlib.import_module(module_name)
+    return module.fig, getattr(module, 'init', None), module.animate
+
+
+def plate_animation(config=None, decimate=1, cache=None):
+    """(fig, init, animate) of the capacitor-plate animation for `config` overrides."""
+    from plate_animation import build_animation
+    anim = build_animation(config, decimate=decimate, cache=cache)
+    return anim.fig, anim.init, anim.animate
+
+
+def render_frames(factory, start, stop, dpi=None):
+    """Yields RGB frames start..stop-1 of the animation built by `factory`.
+
+    The update functions are stateful (landed dots accumulate), so the frames
+    before `start` are replayed without drawing to reach the same state a
+    serial render would have.
+    """
+    fig, init, animate = factory()
+    if dpi:
+        fig.set_dpi(dpi)
+    if init is not None:
+        init()
+    for frame in range(start):
+        animate(frame)
+
+    for frame in range(start, stop):
+        animate(frame)
+        fig.canvas.draw()
+        yield np.asarray(fig.canvas.buffer_rgba())[..., :3]
+
+
+def _ffmpeg_writer(path, width, height, fps, codec):
+    command = ['ffmpeg', '-y', '-loglevel', 'error',
+               '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f'{width}x{height}', '-r', str(fps),
+               '-i', '-', '-vcodec', codec, '-pix_fmt', 'yuv420p', path]
+    return subprocess.Popen(command, stdin=subprocess.PIPE)
+
+
+def render_segment(factory, start, stop, path, fps=50, dpi=None, codec='h264'):
+    """Renders frames start..stop-1 into their own video file (runs in a worker process)."""
+    matplotlib.use('Agg')
+    writer = None
+    for rgb in render_frames(factory, start, stop, dpi):
+        if writer is None:
+            writer = _ffmpeg_writer(path, rgb.shape[1], rgb.shape[0], fps, codec)
+        writer.stdin.write(np.ascontiguousarray(rgb).tobytes())
+    if writer is not None:
+        writer.stdin.close()
+        if writer.wait() != 0:
+            raise RuntimeError(f'ffmpeg failed while writing {path}')
+    return path
+
+
+def segment_bounds(n_frames, n_segments):
+    """Contiguous (start, stop) frame ranges covering 0..n_frames-1."""
+    edges = np.linspace(0, n_frames, min(n_segments, n_frames) + 1).astype(int)
+    return list(zip(edges[:-1].tolist(), edges[1:].tolist()))
+
+
+def render_video(factory, n_frames, path, fps=50, dpi=None, workers=None, codec='h264'):
+    """Renders an animation to `path` with one process per frame segment.
+
+    Every worker builds its own figure through the picklable `factory` (e.g.
+    partial(plate_animation, config) or partial(module_animation, 'script2')),
+    encodes its segment with ffmpeg, and the segments are joined losslessly
+    with the ffmpeg concat demuxer. The frames are identical to a serial
+    render; workers=1 renders serially, still in a child process so the
+    caller's figures and backend are left alone.
+    """
+    if shutil.which('ffmpeg') is None:
+        raise RuntimeError('ffmpeg is required to render video')
+    workers = workers or os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bounds = segment_bounds(n_frames, workers)
+        segments = [os.path.join(tmp, f'segment_{i:04d}.mp4') for i in range(len(bounds))]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(render_segment, factory, start, stop, segment, fps, dpi, codec)
+                       for (start, stop), segment in zip(bounds, segments)]
+            for future in futures:
+                future.result()
+
+        listing = os.path.join(tmp, 'segments.txt')
+        with open(listing, 'w') as f:
+            f.writelines(f"file '{segment}'\n" for segment in segments)
+        subprocess.run(['ffmpeg', '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0',
+                        '-i', listing, '-c', 'copy', path], check=True)
+    return path
+
@@ -0,0 +1,136 @@
+import dataclasses
+import functools
+import hashlib
+import os
+import numpy as np
+from printer_config import as_config
+
+# Bump when the stored layout changes
+CACHE_VERSION = 1
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'results')
+
+# Least recently used entries are evicted beyond this many bytes
+MAX_BYTES = 512 * 2**20
+
+# Modules whose source defines the simulated physics; editing any of them invalidates every entry
+PHYSICS_MODULES = ('constants', 'printer_config', 'trajectory', 'simulation', 'integrator', 'interaction')
+
+
+@functools.lru_cache(maxsize=None)
+def physics_version():
+    """SHA-256 over the source of PHYSICS_MODULES, computed once per process."""
+    root = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for module in PHYSICS_MODULES:
+        with open(os.path.join(root, module + '.py'), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _result_types():
+    from interaction import InteractionResult
+    from simulation import SimulationResult
+    return {cls.__name__: cls for cls in (SimulationResult, InteractionResult)}
+
+
+class ResultCache:
+    """Content-addressed on-disk cache of simulation results.
+
+    An entry is keyed by the hash of the full configuration (every
+    constants.py value, so overrides included), the model options, the
+    fired voltages when they are not the default column, physics_version()
+    and CACHE_VERSION. Each entry is one .npz file; reading it refreshes its
+    modification time, which orders the LRU eviction that keeps the
+    directory under max_bytes.
+
+    Only the integrators and the interaction model are worth caching: a hit
+    costs a few milliseconds, several times a full analytic simulate(). Pass
+    analytic=True to cache the analytic model as well.
+    """
+
+    def __init__(self, path=CACHE_DIR, max_bytes=MAX_BYTES, analytic=False):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.analytic = analytic
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, config=None, voltages=None, **options):
+        p = as_config(config)
+        if voltages is not None:
+            options['voltages'] = hashlib.sha256(np.ascontiguousarray(voltages, dtype=float).tobytes()).hexdigest()
+        return p.digest(cache_version=CACHE_VERSION, physics=physics_version(), **options)
+
+    def _file(self, key):
+        return os.path.join(self.path, key + '.npz')
+
+    def get(self, key):
+        """The cached result for `key`, or None."""
+        path = self._file(key)
+        try:
+            with np.load(path) as stored:
+                cls = _result_types()[str(stored['kind'])]
+                result = cls(**{field.name: stored[field.name] for field in dataclasses.fields(cls)})
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    def put(self, key, result):
+        os.makedirs(self.path, exist_ok=True)
+        path = self._file(key)
+        # Written under a temporary name so concurrent readers never see a partial entry
+        partial = path[:-len('.npz')] + f'.{os.getpid()}.tmp.npz'
+        np.savez(partial, kind=type(result).__name__,
+                 **{field.name: getattr(result, field.name) for field in dataclasses.fields(result)})
+        os.replace(partial, path)
+        self.evict()
+
+    def entries(self):
+        """[(last use, size, path)] of every entry, least recently used first."""
+        entries = []
+        if os.path.isdir(self.path):
+            for entry in os.scandir(self.path):
+                if entry.name.endswith('.npz') and not entry.name.endswith('.tmp.npz'):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:    # Evicted by another process meanwhile
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return sorted(entries)
+
+    def size_bytes(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, max_bytes=None):
+        """Deletes least recently used entries until the cache fits in max_bytes."""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        self.evict(max_bytes=0)
+
+    def simulate(self, config=None, voltages=None, integrator=None, interactions=False, cutoff=None):
+        """simulation.simulate() through the cache (analytic runs only with analytic=True)."""
+        from simulation import simulate
+        if integrator is None and not interactions and not self.analytic:
+            return simulate(config, voltages=voltages)
+        key = self.key(config, voltages, integrator=integrator, interactions=interactions, cutoff=cutoff)
+        result = self.get(key)
+        if result is None:
+            result = simulate(config, voltages=voltages, integrator=integrator, interactions=interactions,
+                              cutoff=cutoff)
+            self.put(key, result)
+        return result
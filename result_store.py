@@ -0,0 +1,193 @@
+import json
+import os
+import struct
+import numpy as np
+from droplet_state import FAILED, LANDED, LOST, STATUS_NAMES
+
+FORMAT_VERSION = 1
+META_FILE = 'meta.json'
+
+# Per-droplet record written for every simulated droplet
+RECORD_COLUMNS = {
+    'fire_time': np.float64,
+    'voltage': np.float64,
+    'target_y': np.float64,
+    'landing_y': np.float64,
+    'land_time': np.float64,
+    'status': np.int8,          # droplet_state codes: LANDED, FAILED or LOST
+}
+
+# Page runs also record where each droplet belongs in the bitmap
+PAGE_COLUMNS = {'row': np.int32, 'column': np.int32, **RECORD_COLUMNS}
+
+# Every column file starts with a fixed-size .npy header, rewritten with the final length on close
+HEADER_SIZE = 128
+
+
+def _npy_header(dtype, length):
+    """A version 1.0 .npy header for a 1-D array, padded to HEADER_SIZE bytes."""
+    header = repr({'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)), 'fortran_order': False,
+                   'shape': (length,)}).encode('latin1')
+    magic = np.lib.format.magic(1, 0)
+    padding = HEADER_SIZE - len(magic) - 2 - len(header) - 1
+    return magic + struct.pack('<H', HEADER_SIZE - len(magic) - 2) + header + b' ' * padding + b'\n'
+
+
+def status_codes(result):
+    """LANDED/FAILED/LOST per droplet of a SimulationResult (or InteractionResult)."""
+    status = np.where(result.hit_plate, FAILED, LANDED).astype(np.int8)
+    lost = getattr(result, 'lost', None)
+    if lost is not None:
+        status[lost] = LOST
+    return status
+
+
+class ResultWriter:
+    """Streams per-droplet records to a directory of .npy columns plus a meta.json header.
+
+    Records are buffered and written one chunk of chunk_size rows at a time,
+    so a run of any length needs only one chunk of memory. Use as a context
+    manager, or call close(): until then the directory has no meta.json and
+    ResultStore refuses to open it.
+    """
+
+    def __init__(self, path, columns=RECORD_COLUMNS, chunk_size=1 << 16, metadata=None):
+        self.path = path
+        self.columns = {name: np.dtype(dtype) for name, dtype in columns.items()}
+        self.chunk_size = chunk_size
+        self.metadata = dict(metadata or {})
+        self.n_records = 0
+        self.n_chunks = 0
+        self._buffer = {name: np.empty(chunk_size, dtype) for name, dtype in self.columns.items()}
+        self._filled = 0
+
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, META_FILE)):
+            os.remove(os.path.join(path, META_FILE))   # Incomplete until closed again
+        self._files = {}
+        for name, dtype in self.columns.items():
+            f = open(os.path.join(path, name + '.npy'), 'wb')
+            f.write(_npy_header(dtype, 0))
+            self._files[name] = f
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *rest):
+        if exc_type is None:
+            self.close()
+        else:
+            self._close_files()     # No meta.json: a failed run never reads as finished
+
+    def append(self, **columns):
+        """Appends records given as one array (or scalar) per column; every column is required."""
+        missing = set(self.columns) - set(columns)
+        if missing:
+            raise KeyError(f"Missing result columns: {sorted(missing)}")
+        arrays = np.broadcast_arrays(*(np.atleast_1d(columns[name]) for name in self.columns))
+        n = arrays[0].size
+        start = 0
+        while start < n:
+            take = min(n - start, self.chunk_size - self._filled)
+            for name, array in zip(self.columns, arrays):
+                self._buffer[name][self._filled:self._filled + take] = array[start:start + take]
+            self._filled += take
+            start += take
+            if self._filled == self.chunk_size:
+                self._flush()
+
+    def append_result(self, result, fire_time=None, target_y=None, index=None, **extra):
+        """Appends every droplet of a SimulationResult, or those picked by `index`.
+
+        `fire_time` replaces their own firing times (e.g. the page clock of an
+        image column), shifting the landing times with them, and `target_y`
+        their targets; `extra` fills any further columns, such as row and
+        column for PAGE_COLUMNS.
+        """
+        index = slice(None) if index is None else index
+        own_fire_time = result.fire_time[index]
+        shift = 0.0 if fire_time is None else np.asarray(fire_time) - own_fire_time
+        target_y = result.target_y[index] if target_y is None else target_y
+        self.append(fire_time=own_fire_time + shift, voltage=result.voltage[index], target_y=target_y,
+                    landing_y=result.landing_y[index], land_time=result.land_time[index] + shift,
+                    status=status_codes(result)[index], **extra)
+
+    def _flush(self):
+        if self._filled:
+            for name, f in self._files.items():
+                self._buffer[name][:self._filled].tofile(f)
+            self.n_records += self._filled
+            self.n_chunks += 1
+            self._filled = 0
+
+    def _close_files(self):
+        for f in self._files.values():
+            f.close()
+        self._files = None
+
+    def close(self):
+        if self._files is None:
+            return
+        self._flush()
+        for name, f in self._files.items():
+            f.seek(0)
+            f.write(_npy_header(self.columns[name], self.n_records))
+        self._close_files()
+        meta = {
+            'format_version': FORMAT_VERSION,
+            'n_records': self.n_records,
+            'chunk_size': self.chunk_size,
+            'n_chunks': self.n_chunks,
+            'columns': {name: np.lib.format.dtype_to_descr(dtype) for name, dtype in self.columns.items()},
+            'status_names': STATUS_NAMES,
+            'metadata': self.metadata,
+        }
+        with open(os.path.join(self.path, META_FILE), 'w') as f:
+            json.dump(meta, f, indent=1)
+
+
+class ResultStore:
+    """Read-only access to a directory written by ResultWriter.
+
+    Columns are opened as np.memmap on first access, so nothing is read
+    until it is used and slices of huge runs cost no copies.
+    """
+
+    def __init__(self, path):
+        meta_path = os.path.join(path, META_FILE)
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError(f"{path} is not a finished result store (no {META_FILE})")
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta['format_version'] != FORMAT_VERSION:
+            raise ValueError(f"Result store format {meta['format_version']} is not supported")
+        self.path = path
+        self.n_records = meta['n_records']
+        self.chunk_size = meta['chunk_size']
+        self.metadata = meta['metadata']
+        self.column_names = tuple(meta['columns'])
+        self._columns = {}
+
+    def __len__(self):
+        return self.n_records
+
+    def __getitem__(self, name):
+        if name not in self._columns:
+            if name not in self.column_names:
+                raise KeyError(name)
+            self._columns[name] = np.load(os.path.join(self.path, name + '.npy'), mmap_mode='r')
+        return self._columns[name]
+
+    def chunks(self, columns=None, size=None):
+        """Yields {name: view} for consecutive row ranges of `size` rows (default: the write chunk size)."""
+        columns = columns or self.column_names
+        size = size or self.chunk_size
+        for start in range(0, self.n_records, size):
+            yield {name: self[name][start:start + size] for name in columns}
+
+    def status_counts(self):
+        """{status name: count}, computed one chunk at a time."""
+        counts = np.zeros(len(STATUS_NAMES), dtype=np.int64)
+        for chunk in self.chunks(['status']):
+            counts += np.bincount(chunk['status'], minlength=len(STATUS_NAMES))
+        return dict(zip(STATUS_NAMES, counts.tolist()))
@@ -4,7 +4,7 @@ from matplotlib.animation import FuncAnimation
 import matplotlib.ticker as ticker
 from constants import TOTAL_DISTANCE, DROPLET_VELOCITY, CAPACITOR_WIDTH
 from calculations import L_gun_to_cap 
-from helpers import init_capacitor, mm_formatter 
+from drawing import init_capacitor, mm_formatter
 
 t_travel = TOTAL_DISTANCE / DROPLET_VELOCITY
 frames = 100
@@ -3,8 +3,14 @@ import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 from matplotlib.colors import Normalize
 import matplotlib.ticker as ticker
-from helpers import *
+from drawing import *
 from constants import *
+from trajectory import calculate_positions
+from series_buffer import SeriesBuffer
+from timeline import compile_timeline
+from render import render_video, module_animation
+from functools import partial
+from frame_profiler import NULL_PROFILER
 
 R = DROPLET_DIAMETER / 2
 m = DROPLET_DENSITY * (4/3) * np.pi * R**3 
@@ -31,6 +37,8 @@ K_deflect = (1.0 / q_over_m_abs) * (W * Vx**2) / (CAPACITOR_LENGTH * (CAPACITOR_
 y_positions = np.linspace(-y_full_max_deflection, y_full_max_deflection, N_dots_paper)
 animation_indices = np.linspace(0, N_dots_paper - 1, N_dots_total, dtype=int)
 y_positions_visible = y_positions[animation_indices] 
+is_animated = np.zeros(N_dots_total, dtype=bool)
+is_animated[animation_indices] = True
 
 V_required_full = y_positions * K_deflect * np.sign(DROPLET_CHARGE)
 
@@ -40,7 +48,9 @@ FRAMES_PER_DOT_INTERVAL = 2
 T_last_fire = (N_dots_total - 1) * T_interval
 T_last_land = T_last_fire + T_total_flight
 GLOBAL_TIME_STEP = T_interval / FRAMES_PER_DOT_INTERVAL
-TOTAL_ANIMATION_FRAMES = int(np.ceil(T_last_land / GLOBAL_TIME_STEP))
+fire_times = np.arange(N_dots_total) * T_interval
+timeline = compile_timeline(fire_times, V_required_full, T_total_flight, GLOBAL_TIME_STEP)
+TOTAL_ANIMATION_FRAMES = timeline.n_frames
 ANIMATION_SPEED_FACTOR = 50000 
 
 fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 8))  
@@ -82,26 +92,8 @@ hit_info_text = ax1.text(0.02, 0.02, '', color='red', fontsize=10,
 
 paper_progress_text = ax2.text(0.02, 0.98, '', transform=ax2.transAxes, fontsize=12)
 
-hit_positions_y = []
-
-def calculate_position(idx, t_flight):
-    V = V_required_full[idx] 
-    a_y = (DROPLET_CHARGE / m) * (V / W)
-    x = Vx * t_flight
-    
-    if x <= L_gun_to_cap:
-        y = 0.0
-    elif x <= L_gun_to_cap + CAPACITOR_LENGTH:
-        t_inside = t_flight - (L_gun_to_cap / Vx)
-        y = 0.5 * a_y * t_inside**2
-    else:
-        t_inside = CAPACITOR_LENGTH / Vx
-        t_outside = t_flight - (L_gun_to_cap + CAPACITOR_LENGTH) / Vx
-        V_y_exit = a_y * t_inside
-        y_exit = 0.5 * a_y * t_inside**2
-        y = y_exit + V_y_exit * t_outside
-        
-    return x, y, V
+landed_dots = SeriesBuffer(2, capacity=N_dots_total)
+paper_hits = SeriesBuffer(2, capacity=N_dots_total)
 
 def init():
     all_flying_droplets.set_offsets(np.empty((0, 2)))
@@ -111,78 +103,61 @@ def init():
     droplet_index_text.set_text('')
     hit_info_text.set_text('')
     paper_progress_text.set_text('Paper Hits: 0')
+    landed_dots.clear()
+    paper_hits.clear()
     return all_flying_droplets, saved_dots_flight, paper_dots, time_text, droplet_index_text, hit_info_text, paper_progress_text
 
+# Replace with a FrameProfiler to time the physics of every frame
+profiler = NULL_PROFILER
+
 def animate(frame):
-    global hit_positions_y
-    
-    t_global = frame * GLOBAL_TIME_STEP 
-    current_firing_index = int(t_global // T_interval)
-    num_fired = current_firing_index + 1
-    
-    flying_positions = []
-    flying_voltages = []
+    t_global = timeline.frame_times[frame]
+    current_firing_index = timeline.firing_index[frame]
 
-    start_dot_index = max(0, current_firing_index - MAX_DROPS_IN_FLIGHT + 1)
-    end_dot_index = min(num_fired, N_dots_total)
+    in_window = timeline.in_flight(frame)
+    in_window = in_window[is_animated[in_window]]
 
-    for i in range(start_dot_index, end_dot_index):
-        t_fire_time = i * T_interval
-        t_since_fire = t_global - t_fire_time
-        
-        if 0 <= t_since_fire < T_total_flight:
-            x, y, V = calculate_position(i, t_since_fire)
-            
-            if i in animation_indices:
-                flying_positions.append([x, y])
-                flying_voltages.append(V)
-            
-    if flying_positions:
-        flying_positions = np.array(flying_positions)
+    with profiler.phase('physics'):
+        x, y, flying_voltages, _ = calculate_positions(
+            in_window, t_global - fire_times[in_window], V_required_full,
+            mass=m, W=W, Vx=Vx, L_gun_to_cap=L_gun_to_cap)
+    flying_positions = np.column_stack((x, y))
+
+    if len(flying_positions):
         all_flying_droplets.set_offsets(flying_positions)
         colors = plt.cm.coolwarm(norm(flying_voltages))
         all_flying_droplets.set_color(colors)
     else:
         all_flying_droplets.set_offsets(np.empty((0, 2)))
 
-    hit_check_index = int(np.floor((t_global - T_total_flight) / T_interval))
-    
-    if hit_check_index >= 0 and hit_check_index < N_dots_total:
-        t_prev_global = (frame - 1) * GLOBAL_TIME_STEP
-        prev_hit_check_index = int(np.floor((t_prev_global - T_total_flight) / T_interval))
+    landed = timeline.landed(frame)
+    plotted = landed[is_animated[landed]]
+
+    if len(plotted):
+        y_target = y_positions[plotted]
         
-        if hit_check_index != prev_hit_check_index:
-            
-            if hit_check_index in animation_indices:
-                y_target = y_positions[hit_check_index]
-                
-                hit_x = np.append(saved_dots_flight.get_xdata(), D)
-                hit_y = np.append(saved_dots_flight.get_ydata(), y_target)
-                saved_dots_flight.set_data(hit_x, hit_y)
-                
-                hit_positions_y.append(y_target)
-                paper_dots.set_data(np.zeros(len(hit_positions_y)), hit_positions_y)
-                
-                hit_info_text.set_text(f'LAST HIT: Y={y_target*1000:.2f} mm')
-                paper_progress_text.set_text(f'Paper Hits: {len(hit_positions_y)}')
-                
-            elif hit_check_index % 50 == 0: 
-                 hit_info_text.set_text(f'Dot {hit_check_index} landed (not plotted)')
-            else:
-                hit_info_text.set_text('')
-    else:
-        if t_global >= T_last_land:
-            hit_info_text.set_text(f'SIMULATION COMPLETE. Total Time: {T_last_land*1000:.3f} ms')
-            paper_progress_text.set_text(f'Paper Hits: {len(hit_positions_y)} (COMPLETE)')
-        elif t_global < T_total_flight:
+        landed_dots.extend(D, y_target)
+        saved_dots_flight.set_data(*landed_dots.columns())
+        
+        paper_hits.extend(0.0, y_target)
+        paper_dots.set_data(*paper_hits.columns())
+        
+        hit_info_text.set_text(f'LAST HIT: Y={y_target[-1]*1000:.2f} mm')
+        paper_progress_text.set_text(f'Paper Hits: {len(paper_hits)}')
+        
+    elif len(landed):
+        if np.any(landed % 50 == 0):
+            hit_info_text.set_text(f'Dot {landed[landed % 50 == 0][-1]} landed (not plotted)')
+        else:
             hit_info_text.set_text('')
 
-    if current_firing_index < N_dots_total:
-        V_current_firing = V_required_full[current_firing_index]
-        dot_index_in_sequence = current_firing_index + 1
-    else:
-        V_current_firing = V_required_full[N_dots_total - 1]
-        dot_index_in_sequence = N_dots_total
+    if t_global >= T_last_land:
+        hit_info_text.set_text(f'SIMULATION COMPLETE. Total Time: {T_last_land*1000:.3f} ms')
+        paper_progress_text.set_text(f'Paper Hits: {len(paper_hits)} (COMPLETE)')
+    elif t_global < T_total_flight:
+        hit_info_text.set_text('')
+
+    dot_index_in_sequence = current_firing_index + 1
         
     time_text.set_text(f'Draw Time: {t_global*1000:.3f} ms')
     droplet_index_text.set_text(f'Dot Fired: {dot_index_in_sequence} / {N_dots_total}')
@@ -191,16 +166,28 @@ def animate(frame):
 
 interval_ms = (GLOBAL_TIME_STEP * 1000) / ANIMATION_SPEED_FACTOR
 
-print(f"Total theoretical simulation time: {T_last_land*1000:.3f} ms")
+def main(save_path='q2.mp4', display=True, workers=None):
+    """Plays the animation (unless display=False) and renders it to `save_path` (if given)."""
+    print(f"Total theoretical simulation time: {T_last_land*1000:.3f} ms")
+
+    if display:
+        ani = animation.FuncAnimation(
+            fig, animate, init_func=init, 
+            frames=TOTAL_ANIMATION_FRAMES, 
+            interval=interval_ms, 
+            blit=True,
+            repeat=False
+        )
+
+    if save_path:
+        # Segments are rendered in parallel worker processes, each with its own figure
+        render_video(partial(module_animation, 'script2'), TOTAL_ANIMATION_FRAMES, save_path,
+                     fps=50, workers=workers)
+
+    if display:
+        plt.tight_layout()
+        plt.show()
 
-ani = animation.FuncAnimation(
-    fig, animate, init_func=init, 
-    frames=TOTAL_ANIMATION_FRAMES, 
-    interval=interval_ms, 
-    blit=True,
-    repeat=False
-)
 
-ani.save('q2.mp4', writer='ffmpeg', fps=50) 
-plt.tight_layout()
-plt.show()
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,12 @@
 import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib.animation import FuncAnimation
 from mpl_toolkits.mplot3d import Axes3D
-import matplotlib.animation as animation
+from functools import partial
+from render import render_video, module_animation
+from artist_manager import ArtistManager
+from series_buffer import SeriesBuffer
+from trajectory3d import (L1a, L1b, W1, W2, cap1_z_start, cap1_z_end, cap2_z_start, cap2_z_end,
+                          paper_z, calculate_trajectories)
 
 # Parameters
 V1_max = 10000  # 10 kV
@@ -10,17 +14,6 @@ V2_max = 7730   # 7.73 kV
 droplets_vertical = 20  # Reduced for smoother animation
 droplets_horizontal = 15
 
-# Capacitor dimensions
-L1a = 0.01  
-L1b = 0.01 
-W1 = 0.001 
-W2 = 0.001 
-L2 = 0.00125 
-
-# Physical constants
-v_x = 100  # m/s
-q_over_m = 1.397e-4 * v_x**2  # From earlier calculation
-
 # Create figure
 fig = plt.figure(figsize=(16, 8))
 ax1 = fig.add_subplot(121, projection='3d')  # 3D view
@@ -28,14 +21,7 @@ ax2 = fig.add_subplot(222)  # Voltage V1
 ax3 = fig.add_subplot(224)  # Voltage V2
 
 # Initialize storage for animation
-trajectories = []
 current_droplet = 0
-plotted_droplets = []
-
-# Capacitor positions in 3D space
-cap1_z_start, cap1_z_end = 0, L1a
-cap2_z_start, cap2_z_end = L1a, L1a + L1b
-paper_z = L1a + L1b + L2
 
 # Generate H shape coordinates
 def generate_H_coordinates():
@@ -67,6 +53,13 @@ def calculate_voltages(target_x, target_y):
 
 V1_required, V2_required = calculate_voltages(target_x, target_y)
 
+# Landed droplets (x, y), appended one per frame; every dot lies on the paper
+plotted_droplets = SeriesBuffer(2, capacity=len(target_x))
+paper_zs = np.full(len(target_x), paper_z)
+
+# Every droplet's trajectory in one batch, shape (n_droplets, num_points, 3)
+trajectories = calculate_trajectories(V1_required, V2_required, num_points=20)
+
 # Set up 3D plot
 def setup_3d_plot():
     ax1.clear()
@@ -113,104 +106,106 @@ def setup_voltage_plots():
     ax3.grid(True, alpha=0.3)
     ax3.set_ylim(-9, 9)
 
-# Calculate droplet trajectory
-def calculate_trajectory(V1, V2, num_points=20):
-    z_positions = np.linspace(0, paper_z, num_points)
-    x_positions = []
-    y_positions = []
-    
-    for z in z_positions:
-        if z <= cap1_z_end:  # In capacitor 1
-            t = z / v_x
-            # Vertical acceleration in cap1
-            a_y1 = (q_over_m * V1) / W1
-            y = 0.5 * a_y1 * t**2
-            x = 0
-        elif z <= cap2_z_end:  # In capacitor 2
-            t_cap1 = cap1_z_end / v_x
-            a_y1 = (q_over_m * V1) / W1
-            v_y_after_cap1 = a_y1 * t_cap1
-            
-            t_in_cap2 = (z - cap1_z_end) / v_x
-            # Horizontal acceleration in cap2
-            a_x2 = (q_over_m * V2) / W2
-            x = 0.5 * a_x2 * t_in_cap2**2
-            y = 0.5 * a_y1 * t_cap1**2 + v_y_after_cap1 * t_in_cap2
-        else:  # After capacitors, drift to paper
-            t_cap1 = cap1_z_end / v_x
-            t_cap2 = (cap2_z_end - cap1_z_end) / v_x
-            a_y1 = (q_over_m * V1) / W1
-            a_x2 = (q_over_m * V2) / W2
-            
-            v_y_after_cap1 = a_y1 * t_cap1
-            v_x_after_cap2 = a_x2 * t_cap2
-            
-            t_drift = (z - cap2_z_end) / v_x
-            
-            x = 0.5 * a_x2 * t_cap2**2 + v_x_after_cap2 * t_drift
-            y = 0.5 * a_y1 * t_cap1**2 + v_y_after_cap1 * (t_cap2 + t_drift)
-        
-        x_positions.append(x)
-        y_positions.append(y)
-    
-    return x_positions, y_positions, z_positions
+    # Fixed x range: the voltage lines are updated in place, not re-autoscaled
+    ax2.set_xlim(-1, len(target_x))
+    ax3.set_xlim(-1, len(target_x))
+
+# Static scene: drawn once and cached as the blitting background
+setup_3d_plot()
+setup_voltage_plots()
+
+# Persistent artists updated in place by animate()
+trajectory_line, = ax1.plot([], [], [], 'k-', alpha=0.5, linewidth=1)
+current_hit, = ax1.plot([], [], [], 'o', color='red', markersize=7)
+previous_hits, = ax1.plot([], [], [], 'o', color='blue', markersize=3, alpha=0.6)
+new_hit, = ax1.plot([], [], [], 'o', color='blue', markersize=3, alpha=0.6, animated=True)
+V1_line, = ax2.plot([], [], 'b-', linewidth=2)
+V2_line, = ax3.plot([], [], 'r-', linewidth=2)
+V1_marker, = ax2.plot([], [], 'o', color='blue', markersize=7, zorder=5)
+V2_marker, = ax3.plot([], [], 'o', color='red', markersize=7, zorder=5)
+progress_text = ax1.text2D(0.02, 0.98, '', transform=ax1.transAxes, fontsize=12,
+                           bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.8))
+
+manager = ArtistManager(fig, [trajectory_line, current_hit, V1_line, V2_line,
+                              V1_marker, V2_marker, progress_text])
+
+def init():
+    """Resets the droplet counter, the landed dots and every animated artist to the first frame."""
+    global current_droplet
+    current_droplet = 0
+    plotted_droplets.clear()
+    for line in (trajectory_line, current_hit, previous_hits, new_hit):
+        line.set_data_3d([], [], [])
+    for line in (V1_line, V2_line, V1_marker, V2_marker):
+        line.set_data([], [])
+    progress_text.set_text('')
+    manager.invalidate()
 
 # Animation function
 def animate(frame):
-    global current_droplet, plotted_droplets
+    global current_droplet
     
     if current_droplet >= len(target_x):
         return
     
-    setup_3d_plot()
-    setup_voltage_plots()
-    
-    # Plot all previous droplets on paper
-    for i, (x, y) in enumerate(plotted_droplets):
-        ax1.scatter(x, y, paper_z, c='blue', s=10, alpha=0.6)
+    # Plot all previous droplets on paper, baking the newest one into the background
+    n_prev = len(plotted_droplets)
+    if n_prev:
+        x_prev, y_prev = plotted_droplets.columns()
+        previous_hits.set_data_3d(x_prev, y_prev, paper_zs[:n_prev])
+        new_hit.set_data_3d(x_prev[-1:], y_prev[-1:], paper_zs[:1])
+        manager.bake(new_hit)
     
     # Calculate and plot current droplet trajectory
     V1 = V1_required[current_droplet]
     V2 = V2_required[current_droplet]
     
-    x_traj, y_traj, z_traj = calculate_trajectory(V1, V2)
-    ax1.plot(x_traj, y_traj, z_traj, 'k-', alpha=0.5, linewidth=1)
-    ax1.scatter([x_traj[-1]], [y_traj[-1]], [paper_z], c='red', s=50)
+    x_traj, y_traj, z_traj = trajectories[current_droplet].T
+    trajectory_line.set_data_3d(x_traj, y_traj, z_traj)
+    current_hit.set_data_3d([x_traj[-1]], [y_traj[-1]], [paper_z])
     
     # Update voltage plots
-    ax2.plot(range(current_droplet + 1), V1_required[:current_droplet + 1] / 1000, 'b-', linewidth=2)
-    ax3.plot(range(current_droplet + 1), V2_required[:current_droplet + 1] / 1000, 'r-', linewidth=2)
+    V1_line.set_data(range(current_droplet + 1), V1_required[:current_droplet + 1] / 1000)
+    V2_line.set_data(range(current_droplet + 1), V2_required[:current_droplet + 1] / 1000)
     
     # Add current voltage values
-    ax2.scatter([current_droplet], [V1/1000], c='blue', s=50, zorder=5)
-    ax3.scatter([current_droplet], [V2/1000], c='red', s=50, zorder=5)
+    V1_marker.set_data([current_droplet], [V1/1000])
+    V2_marker.set_data([current_droplet], [V2/1000])
     
     # Store plotted droplet
-    plotted_droplets.append((x_traj[-1], y_traj[-1]))
+    plotted_droplets.append(x_traj[-1], y_traj[-1])
     
     current_droplet += 1
     
     # Add progress information
-    ax1.text2D(0.02, 0.98, f'Droplet: {current_droplet}/{len(target_x)}', 
-               transform=ax1.transAxes, fontsize=12,
-               bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.8))
-
-# Create animation
-print("Creating 3D animation...")
-ani = FuncAnimation(fig, animate, frames=len(target_x), 
-                   interval=50, repeat=False, blit=False)
-
-# Save animation (optional)
-ani.save('H_letter_animation.mp4', writer='ffmpeg', fps=20, dpi=100)
-
-plt.tight_layout()
-plt.show()
-
-# Print animation summary
-print(f"\nAnimation Summary:")
-print(f"Total droplets in animation: {len(target_x)}")
-print(f"Left vertical stroke: {droplets_vertical} droplets")
-print(f"Horizontal bar: {droplets_horizontal} droplets") 
-print(f"Right vertical stroke: {droplets_vertical} droplets")
-print(f"Capacitor 1: {L1a*1000} mm long, ±{V1_max/1000} kV")
-print(f"Capacitor 2: {L1b*1000} mm long, ±{V2_max/1000} kV")
\ No newline at end of file
+    progress_text.set_text(f'Droplet: {current_droplet}/{len(target_x)}')
+
+def main(save_path='H_letter_animation.mp4', display=True, workers=None):
+    """Plays the animation (unless display=False) and renders it to `save_path` (if given)."""
+    # Create animation
+    print("Creating 3D animation...")
+    if display:
+        # Only the moving artists are blitted; the capacitors, paper and labels stay cached
+        timer = manager.play(animate, len(target_x), interval_ms=50, init_func=init)
+
+    # Save animation (optional), rendering frame segments in parallel worker processes
+    if save_path:
+        render_video(partial(module_animation, 'script5'), len(target_x), save_path, fps=20, dpi=100,
+                     workers=workers)
+
+    if display:
+        plt.tight_layout()
+        plt.show()
+
+    # Print animation summary
+    print(f"\nAnimation Summary:")
+    print(f"Total droplets in animation: {len(target_x)}")
+    print(f"Left vertical stroke: {droplets_vertical} droplets")
+    print(f"Horizontal bar: {droplets_horizontal} droplets") 
+    print(f"Right vertical stroke: {droplets_vertical} droplets")
+    print(f"Capacitor 1: {L1a*1000} mm long, ±{V1_max/1000} kV")
+    print(f"Capacitor 2: {L1b*1000} mm long, ±{V2_max/1000} kV")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+import numpy as np
+
+
+class SeriesBuffer:
+    """Growable float columns (e.g. x/y of landed dots) with zero-copy views of the filled part.
+
+    Storage doubles when full, so appends are amortized O(1) instead of the
+    full copy np.append makes. Pass the final size as `capacity` to make the
+    buffer fully preallocated.
+    """
+
+    def __init__(self, n_columns=1, capacity=256):
+        self._data = np.empty((n_columns, max(1, capacity)))
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _reserve(self, size):
+        capacity = self._data.shape[1]
+        if size > capacity:
+            while capacity < size:
+                capacity *= 2
+            grown = np.empty((self._data.shape[0], capacity))
+            grown[:, :self._size] = self._data[:, :self._size]
+            self._data = grown
+
+    def append(self, *values):
+        """Appends one row, one value per column."""
+        self._reserve(self._size + 1)
+        self._data[:, self._size] = values
+        self._size += 1
+
+    def extend(self, *columns):
+        """Appends many rows given as one array per column."""
+        columns = np.broadcast_arrays(*(np.atleast_1d(column) for column in columns))
+        n = columns[0].size
+        self._reserve(self._size + n)
+        self._data[:, self._size:self._size + n] = columns
+        self._size += n
+
+    def clear(self):
+        self._size = 0
+
+    def column(self, i):
+        """View of the filled part of column `i` (it does not grow with later appends)."""
+        return self._data[i, :self._size]
+
+    def columns(self):
+        """Views of the filled part of every column."""
+        return tuple(self._data[:, :self._size])
@@ -0,0 +1,126 @@
+import dataclasses
+import numpy as np
+from dataclasses import dataclass
+from printer_config import as_config
+from trajectory import calculate_positions, solve_plate_collisions
+
+
+@dataclass
+class SimulationResult:
+    """Per-droplet arrays for one print job (NaN where a quantity does not apply)."""
+    fire_time: np.ndarray
+    voltage: np.ndarray
+    target_y: np.ndarray
+    landing_y: np.ndarray
+    land_time: np.ndarray
+    hit_plate: np.ndarray
+    strike_time: np.ndarray
+    strike_x: np.ndarray
+    strike_y: np.ndarray
+    clearance_margin: np.ndarray
+
+    @property
+    def n_droplets(self):
+        """Droplets fired: slots with a NaN voltage are empty."""
+        return int(np.count_nonzero(~np.isnan(self.voltage)))
+
+    @property
+    def n_failed(self):
+        return int(np.count_nonzero(self.hit_plate))
+
+    @property
+    def n_success(self):
+        return self.n_droplets - self.n_failed
+
+    @property
+    def failed_indices(self):
+        return np.flatnonzero(self.hit_plate)
+
+
+def _with_blank_slots(result, blank, T_interval):
+    """`result` of the fired droplets spread back over a schedule whose `blank` slots are empty."""
+    fire_time = np.arange(len(blank)) * T_interval
+    shift = fire_time[~blank] - result.fire_time
+    fields = {'fire_time': fire_time}
+    for field in dataclasses.fields(result)[1:]:
+        values = getattr(result, field.name)
+        if field.name in ('land_time', 'strike_time'):
+            values = values + shift
+        fields[field.name] = np.full(len(blank), False if values.dtype == bool else np.nan, dtype=values.dtype)
+        fields[field.name][~blank] = values
+    return SimulationResult(**fields)
+
+
+def simulate(config=None, voltages=None, integrator=None, interactions=False, cutoff=None):
+    """Computes a whole print job, without any animation.
+
+    `config` is a PrinterConfig or a mapping of constants.py names to override
+    values. By default the job is the full column from V_required_full; pass
+    `voltages` to fire a custom sequence instead (one droplet per T_interval).
+    The flights are solved analytically unless `integrator` is 'rk4' or
+    'rk45', which integrate them numerically with air drag and gravity.
+    interactions=True adds the Coulomb repulsion between droplets in flight
+    (see interaction.simulate_interacting), between droplets closer than
+    `cutoff` metres (default interaction.default_cutoff).
+    """
+    p = as_config(config)
+    if interactions:
+        if integrator is not None:
+            raise ValueError("The interaction model steps droplets itself; it takes no integrator")
+        from interaction import simulate_interacting
+        return simulate_interacting(p, voltages, cutoff=cutoff)
+    if cutoff is not None:
+        raise ValueError("A Coulomb cutoff only applies with interactions=True")
+    if voltages is None:
+        voltages = p.V_required_full
+        target_y = p.y_positions
+    else:
+        voltages = np.asarray(voltages, dtype=float)
+        blank = np.isnan(voltages)
+        if blank.any():
+            return _with_blank_slots(simulate(p, voltages[~blank], integrator), blank, p.T_interval)
+        target_y = voltages / (p.K_deflect * np.sign(p.DROPLET_CHARGE))
+
+    idx = np.arange(len(voltages))
+    fire_time = idx * p.T_interval
+
+    if integrator is not None:
+        from integrator import integrate_flights
+        flights = integrate_flights(voltages, p, method=integrator)
+        return SimulationResult(
+            fire_time=fire_time,
+            voltage=voltages,
+            target_y=target_y,
+            landing_y=flights.landing_y,
+            land_time=fire_time + flights.flight_time,
+            hit_plate=flights.hit_plate,
+            strike_time=fire_time + flights.t_strike,
+            strike_x=flights.x_strike,
+            strike_y=flights.y_strike,
+            clearance_margin=flights.margin,
+        )
+
+    kinematics = dict(charge=p.DROPLET_CHARGE, mass=p.m, W=p.CAPACITOR_WIDTH,
+                      Vx=p.DROPLET_VELOCITY, L_gun_to_cap=p.L_gun_to_cap,
+                      L_cap=p.CAPACITOR_LENGTH)
+
+    # Landing position of every droplet, then the ones that never get there
+    _, landing_y, _, _ = calculate_positions(idx, p.T_total_flight, voltages, **kinematics)
+    collisions = solve_plate_collisions(voltages, radius=p.R, **kinematics)
+    hit_plate = collisions.hit
+
+    landing_y = np.where(hit_plate, np.nan, landing_y)
+    land_time = np.where(hit_plate, np.nan, fire_time + p.T_total_flight)
+
+    return SimulationResult(
+        fire_time=fire_time,
+        voltage=voltages,
+        target_y=target_y,
+        landing_y=landing_y,
+        land_time=land_time,
+        hit_plate=hit_plate,
+        strike_time=fire_time + collisions.t_strike,
+        strike_x=collisions.x_strike,
+        strike_y=collisions.y_strike,
+        clearance_margin=collisions.margin,
+    )
@@ -0,0 +1,103 @@
+import functools
+import itertools
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+import constants
+from incremental import IncrementalSimulation
+from simulation import simulate
+
+# Statistics columns added after the swept parameters in every sweep table
+STAT_COLUMNS = (('n_droplets', np.int64), ('n_success', np.int64), ('n_failed', np.int64),
+                ('success_rate', np.float64), ('V_max', np.float64))
+
+# The single-parameter variants animated by script4a-e
+SCRIPT4_VARIANTS = [
+    {'CAPACITOR_DISTANCE': constants.CAPACITOR_DISTANCE * 3},
+    {'CAPACITOR_LENGTH': constants.CAPACITOR_LENGTH * 2},
+    {'DROPLET_DIAMETER': constants.DROPLET_DIAMETER * 10},
+    {'DROPLET_VELOCITY': constants.DROPLET_VELOCITY * 2},
+    {'DROPLET_CHARGE': constants.DROPLET_CHARGE * 5},
+]
+
+
+def grid(**axes):
+    """Cartesian product of parameter values, e.g. grid(CAPACITOR_LENGTH=[...], DROPLET_VELOCITY=[...])."""
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*axes.values())]
+
+
+def _statistics(result):
+    return (result.n_droplets, result.n_success, result.n_failed,
+            result.n_success / result.n_droplets, float(np.max(np.abs(result.voltage))))
+
+
+def evaluate_point(overrides, interactions=False, cache=None, cutoff=None):
+    """Success/failure statistics of one configuration, through `cache` (a ResultCache) if given."""
+    if cache is not None:
+        return _statistics(cache.simulate(overrides, interactions=interactions, cutoff=cutoff))
+    return _statistics(simulate(overrides, interactions=interactions, cutoff=cutoff))
+
+
+def evaluate_block(points, interactions=False, cache=None, cutoff=None):
+    """Statistics of consecutive points; ideal-model points share one IncrementalSimulation.
+
+    Neighbouring points of a grid differ in one parameter, so each one only
+    recomputes what that parameter invalidates. That beats any cache hit, so
+    `cache` only serves the interaction model.
+    """
+    if interactions:
+        return [evaluate_point(point, interactions, cache, cutoff) for point in points]
+    engine = IncrementalSimulation()
+    return [_statistics(engine.simulate(point)) for point in points]
+
+
+def run_sweep(points, workers=None, interactions=False, cache=None, cutoff=None):
+    """Evaluates every override dict in `points` and returns a tidy structured-array table.
+
+    The table has one row per point, one column per swept parameter (filled
+    with the constants.py default where a point does not override it) and
+    the STAT_COLUMNS statistics. Work is spread over a process pool unless
+    `workers` is 1. interactions=True simulates every point with Coulomb
+    repulsion between droplets in flight, within `cutoff` metres (default
+    interaction.default_cutoff); those points are only simulated if they
+    are not already in `cache` (a result_cache.ResultCache).
+    """
+    points = [dict(point) for point in points]
+    workers = workers or os.cpu_count() or 1
+    evaluate = functools.partial(evaluate_block, interactions=interactions, cache=cache, cutoff=cutoff)
+
+    if workers == 1 or len(points) <= 1:
+        stats = evaluate(points)
+    else:
+        # Contiguous blocks, so grid neighbours stay together in one incremental engine
+        size = max(1, -(-len(points) // (workers * 4)))
+        blocks = [points[start:start + size] for start in range(0, len(points), size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            stats = [row for block in pool.map(evaluate, blocks) for row in block]
+
+    names = sorted({name for point in points for name in point})
+    table = np.zeros(len(points), dtype=[(name, np.float64) for name in names] + list(STAT_COLUMNS))
+    for name in names:
+        default = getattr(constants, name)
+        table[name] = [point.get(name, default) for point in points]
+    for (column, _), values in zip(STAT_COLUMNS, zip(*stats)):
+        table[column] = values
+    return table
+
+
+def save_table(table, path):
+    """Writes a sweep table to CSV with a header row."""
+    np.savetxt(path, table, delimiter=',', header=','.join(table.dtype.names), comments='',
+               fmt=['%.6g' if table.dtype[name].kind == 'f' else '%d' for name in table.dtype.names])
+
+
+def print_table(table):
+    """Prints a sweep table as CSV to stdout."""
+    print(','.join(table.dtype.names))
+    for row in table:
+        print(','.join(f'{value:.6g}' for value in row.tolist()))
+
+
+if __name__ == '__main__':
+    print_table(run_sweep(SCRIPT4_VARIANTS))
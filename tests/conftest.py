@@ -0,0 +1,20 @@
+import os
+import sys
+import matplotlib
+import numpy as np
+
+# The modules live at the repository root; render headless
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+matplotlib.use('Agg')
+
+# SimulationResult fields compared to a tolerance by assert_same; hit_plate is compared exactly
+FIELDS = ('fire_time', 'voltage', 'target_y', 'landing_y', 'land_time', 'strike_time', 'strike_x', 'strike_y',
+          'clearance_margin')
+
+
+def assert_same(result, expected, rtol=1e-15):
+    """Asserts two SimulationResults agree: the same plate strikes and every array within rtol."""
+    np.testing.assert_array_equal(result.hit_plate, expected.hit_plate)
+    for name in FIELDS:
+        np.testing.assert_allclose(getattr(result, name), getattr(expected, name), rtol=rtol, atol=1e-30,
+                                   err_msg=name)
@@ -0,0 +1,73 @@
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from artist_manager import ArtistManager
+
+
+def figure():
+    fig = Figure(figsize=(3, 2), dpi=50)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(xlim=(0, 10), ylim=(0, 10))
+    static, = ax.plot([0, 10], [5, 5], color='gray')
+    moving, = ax.plot([], [], 'o', color='red')
+    landed, = ax.plot([], [], '.', color='blue')
+    return fig, static, moving, landed
+
+
+def pixels(fig):
+    return np.asarray(fig.canvas.buffer_rgba()).copy()
+
+
+def full_draw(fig, *animated):
+    for artist in animated:
+        artist.set_animated(False)
+    fig.canvas.draw()
+    return pixels(fig)
+
+
+def test_blitted_frames_match_full_draws():
+    fig, static, moving, landed = figure()
+    manager = ArtistManager(fig, [moving])
+    manager.update()
+    draws = []
+    static.draw = lambda renderer, draw=static.draw: draws.append(1) or draw(renderer)
+    for x in range(1, 9):
+        moving.set_data([x], [x])
+        manager.update()
+    assert draws == []          # The static line comes from the cached background
+    blitted = pixels(fig)
+
+    reference, _, reference_moving, _ = figure()
+    reference_moving.set_data([8], [8])
+    np.testing.assert_array_equal(blitted, full_draw(reference))
+
+
+def test_baked_points_stay_in_the_background():
+    fig, _, moving, landed = figure()
+    manager = ArtistManager(fig, [moving])
+    manager.update()
+    landed.set_animated(True)
+    for x in range(1, 5):
+        landed.set_data([x], [2])    # Only the new dot; earlier ones are already baked
+        manager.bake(landed)
+    moving.set_data([7], [7])
+    manager.update()
+    blitted = pixels(fig)
+
+    reference, _, reference_moving, reference_landed = figure()
+    reference_moving.set_data([7], [7])
+    reference_landed.set_data([1, 2, 3, 4], [2, 2, 2, 2])
+    np.testing.assert_array_equal(blitted, full_draw(reference))
+
+
+def test_invalidate_forces_a_full_draw():
+    fig, _, moving, _ = figure()
+    manager = ArtistManager(fig, [moving])
+    manager.update()
+    manager.invalidate()
+    full = []
+    fig.canvas.mpl_connect('draw_event', lambda event: full.append(1))
+    manager.update()
+    manager.update()
+    assert full == [1]
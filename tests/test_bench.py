@@ -0,0 +1,9 @@
+import tempfile
+
+import bench
+
+
+def test_cached_benchmark_removes_its_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+    assert bench.run_benchmark('simulate_column_cached', repeats=1) > 0
+    assert list(tmp_path.iterdir()) == []
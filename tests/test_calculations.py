@@ -0,0 +1,43 @@
+import math
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+import calculations
+import constants
+import import_budget
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(code):
+    subprocess.run([sys.executable, '-c', code], check=True, cwd=ROOT)
+
+
+def test_import_does_not_load_numpy():
+    run("import sys, calculations; assert 'numpy' not in sys.modules; calculations.T_interval;"
+        "assert 'numpy' not in sys.modules; calculations.V_required_full; assert 'numpy' in sys.modules")
+
+
+def test_star_import_provides_the_lazy_names():
+    run("from calculations import *; assert len(V_required_full) == N_dots_total; TOTAL_ANIMATION_FRAMES")
+
+
+def test_lazy_values_match_the_eager_formulas():
+    y_max = constants.PAPER_HEIGHT * constants.INCHES_2_METERS / 2
+    y = np.linspace(-y_max, y_max, calculations.N_dots_total)
+    np.testing.assert_array_equal(calculations.y_positions, y)
+    np.testing.assert_array_equal(calculations.V_required_full,
+                                  y * calculations.K_deflect * np.sign(constants.DROPLET_CHARGE))
+    assert calculations.V_max_practical == np.max(np.abs(calculations.V_required_full))
+    step = calculations.T_interval / constants.FRAMES_PER_DOT_INTERVAL
+    T_last_land = (calculations.N_dots_total - 1) * calculations.T_interval + calculations.T_total_flight
+    assert calculations.TOTAL_ANIMATION_FRAMES == int(math.ceil(T_last_land / step))
+    assert calculations.V_required_full is calculations.V_required_full     # Memoized
+    assert 'V_required_full' in dir(calculations)
+
+
+def test_import_budget_measures_a_fresh_interpreter():
+    assert 0 < import_budget.measure_import('constants', repeats=1) < 1000
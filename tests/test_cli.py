@@ -0,0 +1,55 @@
+import argparse
+import numpy as np
+import pytest
+
+from cli import main, parse_grid, parse_overrides
+from printer_config import DEFAULT_CONFIG, as_config
+from raster import firing_schedule
+from result_store import ResultStore
+
+
+def test_overrides_take_the_parameter_type():
+    overrides = parse_overrides(['NOZZLE_COUNT=8', 'PRINTER_RESOLUTION=300', 'FRAMES_PER_DOT_INTERVAL=20',
+                                 'DROPLET_CHARGE=-2e-13'])
+    assert overrides == {'NOZZLE_COUNT': 8, 'PRINTER_RESOLUTION': 300, 'FRAMES_PER_DOT_INTERVAL': 20,
+                         'DROPLET_CHARGE': -2e-13}
+    assert type(overrides['NOZZLE_COUNT']) is int
+    assert type(overrides['DROPLET_CHARGE']) is float
+
+
+def test_default_valued_override_keeps_the_digest():
+    config = as_config(parse_overrides(['PRINTER_RESOLUTION=300']))
+    assert config.digest() == DEFAULT_CONFIG.digest()
+
+
+@pytest.mark.parametrize('assignment', ['NOZZLE_COUNT=8.5', 'NOZZLE_COUNT=', 'DROPLET_CHARGE=abc'])
+def test_bad_value_names_the_parameter(assignment):
+    with pytest.raises(argparse.ArgumentTypeError, match=assignment.partition('=')[0]):
+        parse_overrides([assignment])
+
+
+def test_unknown_parameter():
+    with pytest.raises(argparse.ArgumentTypeError, match='NOT_A_PARAMETER'):
+        parse_overrides(['NOT_A_PARAMETER=1'])
+
+
+def test_grid_values_take_the_parameter_type():
+    grid = parse_grid(['PRINTER_RESOLUTION=150,300', 'CAPACITOR_LENGTH=1e-3,2e-3'])
+    assert grid == {'PRINTER_RESOLUTION': [150, 300], 'CAPACITOR_LENGTH': [1e-3, 2e-3]}
+    assert all(type(value) is int for value in grid['PRINTER_RESOLUTION'])
+    with pytest.raises(argparse.ArgumentTypeError, match='NOZZLE_COUNT'):
+        parse_grid(['NOZZLE_COUNT=1,2.5'])
+
+
+def test_image_runs_keep_the_slot_schedule_at_any_memory_budget(tmp_path):
+    path = tmp_path / 'bar.pbm'
+    path.write_text('P1\n9 40\n' + '\n'.join(['1 0 1 1 0 0 0 0 1'] * 20 + ['0 0 0 0 0 0 0 0 0'] * 20) + '\n')
+    for memory_mb in (256, 0.01):
+        main(['simulate', '--image', str(path), '--store', str(tmp_path / str(memory_mb)), '--no-cache',
+              '--memory-mb', str(memory_mb)])
+    whole, runs = ResultStore(tmp_path / '256'), ResultStore(tmp_path / '0.01')
+    batches = list(firing_schedule(path))
+    assert len(whole) == len(runs) == sum(batch.row.size for batch in batches) == 80
+    np.testing.assert_array_equal(whole['fire_time'], np.concatenate([batch.fire_time for batch in batches]))
+    for name in whole.column_names:
+        np.testing.assert_array_equal(runs[name], whole[name], err_msg=name)
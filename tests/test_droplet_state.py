@@ -0,0 +1,39 @@
+import numpy as np
+
+from droplet_state import FAILED, FLYING, LANDED, PENDING, DropletStatus
+
+
+def test_counts_follow_every_transition():
+    store = DropletStatus(10)
+    assert store.count(PENDING) == 10
+    store.update_flying(np.arange(6), x=np.arange(6) * 1e-3, y=0.0, V=np.linspace(-1, 1, 6))
+    store.update_flying(np.arange(2, 6), x=1e-2, y=1e-4, V=5.0)      # Already flying: no double count
+    assert (store.count(PENDING), store.count(FLYING)) == (4, 6)
+    store.mark_failed([1, 3], x=[5e-3, 6e-3], y=[5e-4, -5e-4])
+    store.mark_landed(np.array([0, 2, 4]))
+    counts = store.counts()
+    assert (counts['pending'], counts['flying'], counts['landed'], counts['failed']) == (4, 1, 3, 2)
+    np.testing.assert_array_equal(store.indices(FAILED), [1, 3])
+    np.testing.assert_array_equal(store.indices(LANDED), [0, 2, 4])
+    assert sum(counts.values()) == store.n_droplets
+
+
+def test_positions_of_flying_and_failed_droplets():
+    store = DropletStatus(4)
+    store.update_flying([0, 1], x=[1e-3, 2e-3], y=[1e-5, -1e-5], V=[10.0, -10.0])
+    np.testing.assert_array_equal(store.position[:2], [[1e-3, 1e-5], [2e-3, -1e-5]])
+    np.testing.assert_array_equal(store.voltage[:2], [10.0, -10.0])
+    store.mark_failed(1, x=3e-3, y=-5e-4)
+    np.testing.assert_array_equal(store.failure_position[1], [3e-3, -5e-4])
+    assert np.isnan(store.position[1]).all() and np.isnan(store.voltage[1])
+    assert np.isnan(store.position[2:]).all()
+
+    store.reset()
+    assert store.count(PENDING) == 4
+    assert np.isnan(store.failure_position).all()
+
+
+def test_empty_updates_are_no_ops():
+    store = DropletStatus(3)
+    store.mark_landed(np.array([], dtype=int))
+    assert store.count(PENDING) == 3
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+import frame_profiler
+from frame_profiler import FrameProfiler, profile_frames
+
+
+class Clock:
+    """perf_counter stand-in that only moves when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, ms):
+        self.now += ms / 1e3
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(frame_profiler.time, 'perf_counter', clock)
+    return clock
+
+
+class Canvas:
+    def __init__(self, clock, ms):
+        self.clock, self.ms = clock, ms
+
+    def draw(self):
+        self.clock.advance(self.ms)
+
+
+class Figure:
+    def __init__(self, canvas):
+        self.canvas = canvas
+
+
+def test_phases_are_attributed_per_frame(clock):
+    profiler = FrameProfiler(budget_ms=10.5)
+    bake = profiler.wrap_draw(lambda: clock.advance(4.0))
+
+    def animate(frame):
+        with profiler.phase('physics'):
+            clock.advance(2.0)
+        if frame == 1:
+            bake()              # Drawing inside animate counts as drawing
+        clock.advance(1.0)
+
+    profile_frames(Figure(Canvas(clock, 3.0)), lambda: clock.advance(5.0), animate, range(3), profiler)
+    table = profiler.frame_table()
+    np.testing.assert_array_equal(table['frame'], [0, 1, 2])
+    np.testing.assert_allclose(table['physics_ms'], [2.0, 2.0, 2.0])
+    np.testing.assert_allclose(table['artists_ms'], [1.0, 1.0, 1.0])
+    np.testing.assert_allclose(table['draw_ms'], [3.0, 7.0, 3.0])
+    np.testing.assert_allclose(table['total_ms'], [6.0, 10.0, 6.0])
+    assert profiler.init_ms == pytest.approx(5.0)
+    assert len(profiler.over_budget()) == 0
+
+
+def test_over_budget_and_csv(clock, tmp_path):
+    profiler = FrameProfiler(budget_ms=5.5)
+    profile_frames(Figure(Canvas(clock, 1.0)), None, lambda frame: clock.advance(frame), range(8), profiler)
+    np.testing.assert_array_equal(profiler.over_budget()['frame'], [5, 6, 7])
+    assert '3 frames over the 5.5 ms budget, worst at frame 7' in profiler.summary()
+
+    profiler.save_csv(tmp_path / 'frames.csv')
+    saved = np.genfromtxt(tmp_path / 'frames.csv', delimiter=',', names=True)
+    np.testing.assert_allclose(saved['total_ms'], profiler.frame_table()['total_ms'])
@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Importing None from sys.modules raises ImportError, as on a worker without matplotlib
+NO_MATPLOTLIB = "import sys; sys.modules['matplotlib'] = None; "
+
+
+def run(code):
+    subprocess.run([sys.executable, '-c', code], check=True, cwd=ROOT)
+
+
+@pytest.mark.parametrize('module', ['physics', 'helpers', 'calculations', 'trajectory', 'simulation', 'sweep'])
+def test_physics_core_imports_without_matplotlib(module):
+    run(NO_MATPLOTLIB + f"import {module}")
+
+
+def test_helpers_keep_the_physics_api():
+    run(NO_MATPLOTLIB + "import helpers, math; "
+        "assert helpers.calc_sphere_volume(2.0) == 4 / 3 * math.pi; "
+        "assert helpers.calc_electric_field(10.0, 2.0) == 5.0; "
+        "assert helpers.Vector(3.0, 4.0).magnitude() == 5.0")
+
+
+def test_drawing_helpers_load_on_first_use():
+    run("import sys, helpers; assert 'matplotlib' not in sys.modules; "
+        "import matplotlib; matplotlib.use('Agg'); import matplotlib.pyplot as plt; "
+        "fig, ax = plt.subplots(); helpers.init_gun(ax); assert len(ax.patches) == 1")
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from conftest import assert_same
+from incremental import IncrementalSimulation
+from printer_config import DEFAULT_CONFIG
+from simulation import simulate
+
+# The nodes group simulate()'s arithmetic differently
+RTOL = 1e-12
+
+# A walk through configurations as a sweep would visit them
+CONFIGS = [
+    DEFAULT_CONFIG,
+    DEFAULT_CONFIG.replace(DROPLET_CHARGE=DEFAULT_CONFIG.DROPLET_CHARGE * 20),
+    DEFAULT_CONFIG.replace(DROPLET_CHARGE=DEFAULT_CONFIG.DROPLET_CHARGE * 40),
+    DEFAULT_CONFIG.replace(DROPLET_CHARGE=DEFAULT_CONFIG.DROPLET_CHARGE * 40, DROPLET_VELOCITY=30.0),
+    DEFAULT_CONFIG.replace(DROPLET_CHARGE=DEFAULT_CONFIG.DROPLET_CHARGE * 40, CAPACITOR_WIDTH=2e-3),
+    DEFAULT_CONFIG.replace(PRINTER_RESOLUTION=150),
+    DEFAULT_CONFIG.replace(TOTAL_DISTANCE=DEFAULT_CONFIG.L_gun_to_cap + DEFAULT_CONFIG.CAPACITOR_LENGTH / 2),
+    DEFAULT_CONFIG,
+]
+
+
+@pytest.mark.parametrize('voltages', [None, np.linspace(-200.0, 250.0, 400)])
+def test_matches_simulate(voltages):
+    engine = IncrementalSimulation(voltages)
+    for config in CONFIGS:
+        assert_same(engine.simulate(config), simulate(config, voltages), rtol=RTOL)
+
+
+def test_charge_edit_keeps_collisions_of_the_full_column():
+    engine = IncrementalSimulation()
+    engine.simulate(DEFAULT_CONFIG)
+    engine.simulate(DEFAULT_CONFIG.replace(DROPLET_CHARGE=DEFAULT_CONFIG.DROPLET_CHARGE / 2))
+    assert sorted(engine.recomputed) == ['q_over_m', 'voltage', 'volts_per_meter']
+
+
+def test_charge_edit_of_custom_voltages_reaches_collisions():
+    engine = IncrementalSimulation(np.linspace(-200.0, 250.0, 400))
+    engine.simulate(DEFAULT_CONFIG)
+    engine.simulate(DEFAULT_CONFIG.replace(DROPLET_CHARGE=DEFAULT_CONFIG.DROPLET_CHARGE / 2))
+    assert {'a_y', 'hit', 'landing_y'} <= set(engine.recomputed)
+    assert 'voltage' not in engine.recomputed
+
+
+def test_set_voltages_switches_schedule():
+    voltages = np.linspace(-200.0, 250.0, 400)
+    engine = IncrementalSimulation()
+    engine.simulate(DEFAULT_CONFIG)
+    engine.set_voltages(voltages)
+    assert_same(engine.simulate(DEFAULT_CONFIG), simulate(DEFAULT_CONFIG, voltages), rtol=RTOL)
+    engine.set_voltages(None)
+    assert_same(engine.simulate(DEFAULT_CONFIG), simulate(DEFAULT_CONFIG), rtol=RTOL)
+
+
+def test_results_cannot_corrupt_the_cache():
+    voltages = np.linspace(-200.0, 250.0, 400)
+    engine = IncrementalSimulation(voltages)
+    result = engine.simulate(DEFAULT_CONFIG)
+    with pytest.raises(ValueError, match='read-only'):
+        result.landing_y[:] = 0.0
+    assert voltages.flags.writeable     # The caller's own array is left alone
+    assert_same(engine.simulate(DEFAULT_CONFIG.replace(DROPLET_VELOCITY=30.0)),
+                simulate(DEFAULT_CONFIG.replace(DROPLET_VELOCITY=30.0), voltages), rtol=RTOL)
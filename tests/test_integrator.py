@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from integrator import analytic_error, integrate_flights
+from printer_config import DEFAULT_CONFIG
+from simulation import simulate
+
+
+@pytest.mark.parametrize('method', ['rk4', 'rk45'])
+@pytest.mark.parametrize('config', [DEFAULT_CONFIG, DEFAULT_CONFIG.replace(CAPACITOR_WIDTH=2e-3)])
+def test_drag_free_flights_match_the_analytic_model(method, config):
+    errors = analytic_error(config, method)
+    assert errors['hits_agree']
+    assert errors['landing_y'] < 1e-15
+    assert errors['flight_time'] < 1e-15
+    assert errors['t_strike'] < 1e-15
+
+
+def test_drag_and_gravity_stay_close_to_the_analytic_model():
+    reference = simulate()
+    flights = integrate_flights(reference.voltage, method='rk45')
+    landed = ~reference.hit_plate & ~flights.hit_plate
+    assert landed.any()
+    np.testing.assert_allclose(flights.landing_y[landed], reference.landing_y[landed], atol=1e-4)
+
+
+def test_rk45_gives_up_on_a_stopped_droplet():
+    config = DEFAULT_CONFIG.replace(AIR_VISCOSITY=1e-2)     # Drag stops the droplets before the paper
+    with np.errstate(divide='ignore', invalid='ignore'), pytest.raises(ValueError, match='AIR_VISCOSITY'):
+        integrate_flights(DEFAULT_CONFIG.V_required_full[:10], config, method='rk45')
+
+
+def test_rk4_gives_up_on_a_stopped_droplet():
+    config = DEFAULT_CONFIG.replace(AIR_VISCOSITY=1e-2)     # Fixed steps carry vx through zero
+    with np.errstate(all='ignore'), pytest.raises(ValueError, match='AIR_VISCOSITY'):
+        integrate_flights(DEFAULT_CONFIG.V_required_full[:10], config, method='rk4')
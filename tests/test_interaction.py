@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+import interaction
+from interaction import coulomb_accelerations, default_cutoff, simulate_interacting
+from printer_config import as_config
+from simulation import simulate
+
+# A short capacitor fires fast enough to keep ~150 droplets in flight, beyond PAIRWISE_MAX
+DENSE = {'CAPACITOR_LENGTH': 0.02e-3, 'DROPLET_CHARGE': -1e-12}
+
+
+@pytest.mark.parametrize('dim', [2, 3])
+def test_cell_list_matches_pairwise_within_cutoff(dim):
+    rng = np.random.default_rng(dim)
+    positions = rng.uniform(0, 1e-3, (400, dim))
+    cutoff = 1e-4
+    pairwise = coulomb_accelerations(positions, 1e-12, 1e-9, cutoff, method='pairwise')
+    cells = coulomb_accelerations(positions, 1e-12, 1e-9, cutoff, method='cells')
+    np.testing.assert_allclose(cells, pairwise, rtol=1e-10, atol=1e-12 * np.abs(pairwise).max())
+
+
+def test_cell_list_keeps_groups_and_dead_droplets_apart():
+    rng = np.random.default_rng(0)
+    positions = rng.uniform(0, 1e-3, (3, 200, 2))
+    live = rng.random((3, 200)) > 0.2
+    pairwise = coulomb_accelerations(positions, 1e-12, 1e-9, 2e-4, method='pairwise', live=live)
+    cells = coulomb_accelerations(positions, 1e-12, 1e-9, 2e-4, method='cells', live=live)
+    np.testing.assert_allclose(cells, pairwise, rtol=1e-10, atol=1e-12 * np.abs(pairwise).max())
+    assert not cells[~live].any()
+
+
+def test_without_coulomb_matches_the_analytic_model():
+    p = as_config({'DROPLET_CHARGE': -1e-12})
+    reference = simulate(p)
+    result = simulate_interacting(p, coulomb=False)
+    np.testing.assert_array_equal(result.hit_plate, reference.hit_plate)
+    np.testing.assert_allclose(result.landing_y, reference.landing_y, rtol=1e-9, atol=1e-15)
+    np.testing.assert_allclose(result.land_time, reference.land_time, rtol=1e-12)
+    assert not result.lost.any()
+
+
+def test_dense_stream_uses_the_cell_list_by_default(monkeypatch):
+    p = as_config(DENSE)
+    assert p.MAX_DROPS_IN_FLIGHT > interaction.PAIRWISE_MAX
+    voltages = p.V_required_full[1500:1800]
+    options = dict(chunk_size=None, steps_per_interval=2)
+    calls = []
+    cell_list = interaction._cell_list
+    monkeypatch.setattr(interaction, '_cell_list', lambda *args: calls.append(1) or cell_list(*args))
+    cells = simulate_interacting(p, voltages, **options)
+    assert calls
+
+    pairwise = simulate_interacting(p, voltages, cutoff=default_cutoff(p), method='pairwise', **options)
+    np.testing.assert_array_equal(cells.hit_plate, pairwise.hit_plate)
+    np.testing.assert_allclose(cells.landing_y, pairwise.landing_y, rtol=1e-9, atol=1e-15)
+
+
+def test_cutoff_needs_the_interaction_model():
+    with pytest.raises(ValueError):
+        simulate(cutoff=1e-3)
+
+
+def test_empty_slots_space_the_stream_out():
+    p = as_config({})
+    voltages = p.V_required_full[1500:1800:10]
+    schedule = np.full(10 * len(voltages), np.nan)
+    schedule[::10] = voltages
+    # Ten pitches apart the droplets are beyond the cutoff and fly as if alone
+    spaced = simulate_interacting(p, schedule)
+    alone = simulate(p, schedule)
+    assert spaced.n_droplets == len(voltages)
+    np.testing.assert_array_equal(spaced.hit_plate, alone.hit_plate)
+    np.testing.assert_allclose(spaced.landing_y, alone.landing_y, rtol=1e-9, atol=1e-15)
+    assert not spaced.lost.any()
+    packed = simulate_interacting(p, voltages)
+    assert packed.n_failed != alone.n_failed
@@ -0,0 +1,52 @@
+import numpy as np
+
+import inverse
+from integrator import integrate_flights
+from inverse import build_table, inverse_table
+from printer_config import DEFAULT_CONFIG
+
+
+def targets(table, n=50):
+    return np.linspace(*table.y_range, n)[1:-1]
+
+
+def test_drag_free_table_is_the_ideal_deflection_constant():
+    table = build_table(drag=False, gravity=False)
+    y = targets(table)
+    ideal = y * DEFAULT_CONFIG.K_deflect * np.sign(DEFAULT_CONFIG.DROPLET_CHARGE)
+    np.testing.assert_allclose(table.voltages(y), ideal, rtol=0, atol=1e-12 * np.abs(ideal).max())
+
+
+def test_table_voltages_land_on_target():
+    tol = 1e-7
+    table = build_table(tol=tol)
+    assert table.max_error <= tol
+    assert np.all(np.diff(table.y) > 0)
+    y = targets(table)
+    landing_y = integrate_flights(table.voltages(y), DEFAULT_CONFIG).landing_y
+    np.testing.assert_allclose(landing_y, y, rtol=0, atol=tol)
+
+
+def test_unreachable_targets_are_nan():
+    table = build_table()
+    low, high = table.y_range
+    assert np.isnan(table.voltages([low - 1e-6, high + 1e-6])).all()
+
+
+def test_cached_table_is_reused(tmp_path):
+    built = inverse_table(cache_dir=tmp_path)
+    assert len(list(tmp_path.iterdir())) == 1
+    loaded = inverse_table(cache_dir=tmp_path)
+    np.testing.assert_array_equal(loaded.y, built.y)
+    np.testing.assert_array_equal(loaded.voltage, built.voltage)
+    assert loaded.max_error == built.max_error
+    other = inverse_table(DEFAULT_CONFIG.replace(CAPACITOR_WIDTH=2e-3), cache_dir=tmp_path)
+    assert len(list(tmp_path.iterdir())) == 2
+    assert other.y_range != built.y_range
+
+
+def test_physics_edit_rebuilds_the_cached_table(tmp_path, monkeypatch):
+    inverse_table(cache_dir=tmp_path)
+    monkeypatch.setattr(inverse, 'physics_version', lambda: 'edited')
+    inverse_table(cache_dir=tmp_path)
+    assert len(list(tmp_path.iterdir())) == 2
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from page import BYTES_PER_DROPLET, pass_timing, simulate_page, stream_page
+from printer_config import DEFAULT_CONFIG
+from result_store import PAGE_COLUMNS, ResultStore, ResultWriter, status_codes
+from simulation import simulate
+
+# A 30-column strip printed by an 8-nozzle head, 4 passes
+CONFIG = DEFAULT_CONFIG.replace(PAPER_WIDTH=0.1, NOZZLE_COUNT=8)
+BUDGET = 5 * CONFIG.N_dots_total * BYTES_PER_DROPLET[None]   # 5 columns per chunk
+
+
+def test_chunks_cover_the_page_once():
+    chunks = list(stream_page(CONFIG, memory_budget=BUDGET))
+    assert [len(chunk.columns) for chunk in chunks] == [5] * 6
+    columns = np.concatenate([chunk.columns for chunk in chunks])
+    np.testing.assert_array_equal(columns, np.arange(CONFIG.N_columns_total))
+    x = np.concatenate([chunk.x for chunk in chunks])
+    np.testing.assert_allclose(x, columns * CONFIG.NOZZLE_PITCH)
+
+    expected = simulate(CONFIG)
+    for chunk in chunks:
+        np.testing.assert_array_equal(chunk.result.nozzle_x, chunk.x)
+        np.testing.assert_array_equal(chunk.result.nozzle_table()['x'], chunk.x)
+        np.testing.assert_array_equal(chunk.result.hit_plate, np.broadcast_to(expected.hit_plate,
+                                                                              chunk.result.hit_plate.shape))
+
+
+def test_passes_are_separated_by_the_paper_feed():
+    page = simulate_page(CONFIG, memory_budget=BUDGET)
+    timing = page.timing
+    assert timing.passes == 4
+    np.testing.assert_array_equal(page.columns['pass'], np.arange(30) // 8)
+    np.testing.assert_array_equal(page.columns['nozzle'], np.arange(30) % 8)
+    np.testing.assert_allclose(page.columns['start_time'], page.columns['pass'] * timing.period)
+    assert timing.feed_time == 8 * CONFIG.NOZZLE_PITCH / CONFIG.FEED_SPEED
+    assert page.feed_time == 3 * timing.feed_time
+    assert page.print_time <= timing.page_time
+    assert page.print_time > timing.page_time - timing.pass_time
+
+    expected = simulate(CONFIG)
+    assert page.n_failed == 30 * expected.hit_plate.sum()
+    assert page.n_success == 30 * (~expected.hit_plate).sum()
+    assert len(page.chunk_seconds) == 6
+
+
+@pytest.mark.parametrize('feed_speed', [0.0, -0.1])
+def test_paper_that_does_not_feed_is_rejected(feed_speed):
+    with pytest.raises(ValueError, match='FEED_SPEED'):
+        pass_timing(CONFIG.replace(FEED_SPEED=feed_speed))
+
+
+def test_page_store_and_custom_schedules(tmp_path):
+    rng = np.random.default_rng(2)
+    voltages = rng.uniform(-3000.0, 3000.0, (CONFIG.N_columns_total, 100))
+    budget = 7 * 100 * BYTES_PER_DROPLET[None]
+    with ResultWriter(tmp_path, PAGE_COLUMNS) as store:
+        page = simulate_page(CONFIG, voltages, memory_budget=budget, store=store)
+
+    stored = ResultStore(tmp_path)
+    assert len(stored) == voltages.size
+    np.testing.assert_array_equal(stored['voltage'], voltages.ravel())
+    np.testing.assert_array_equal(stored['column'], np.repeat(np.arange(30), 100))
+    np.testing.assert_array_equal(stored['row'], np.tile(np.arange(100), 30))
+    for column in (0, 13, 29):
+        expected = simulate(CONFIG, voltages[column])
+        rows = slice(column * 100, (column + 1) * 100)
+        start = page.columns['start_time'][column]
+        np.testing.assert_array_equal(stored['status'][rows], status_codes(expected))
+        np.testing.assert_allclose(stored['fire_time'][rows], expected.fire_time + start, rtol=1e-15)
+        np.testing.assert_allclose(stored['landing_y'][rows], expected.landing_y, rtol=1e-15)
@@ -0,0 +1,60 @@
+import dataclasses
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import calculations
+import constants
+from printer_config import DEFAULT_CONFIG, PARAMETER_NAMES, PrinterConfig, as_config
+
+
+def test_defaults_match_constants_and_calculations():
+    for name in PARAMETER_NAMES:
+        assert getattr(DEFAULT_CONFIG, name) == getattr(constants, name)
+    for name in ('m', 'L_gun_to_cap', 'T_interval', 'T_total_flight', 'N_dots_total', 'MAX_DROPS_IN_FLIGHT',
+                 'K_deflect'):
+        assert getattr(DEFAULT_CONFIG, name) == pytest.approx(getattr(calculations, name), rel=1e-15)
+    np.testing.assert_allclose(DEFAULT_CONFIG.V_required_full, calculations.V_required_full, rtol=1e-15)
+
+
+def test_replace_gives_an_independent_config():
+    wider = DEFAULT_CONFIG.replace(CAPACITOR_WIDTH=2e-3)
+    assert DEFAULT_CONFIG.CAPACITOR_WIDTH == constants.CAPACITOR_WIDTH
+    assert wider.K_deflect == pytest.approx(2 * DEFAULT_CONFIG.K_deflect)
+    assert wider.overrides() == {'CAPACITOR_WIDTH': 2e-3}
+    assert DEFAULT_CONFIG.overrides() == {}
+    assert wider == as_config({'CAPACITOR_WIDTH': 2e-3}) and hash(wider) == hash(as_config({'CAPACITOR_WIDTH': 2e-3}))
+    assert as_config(wider) is wider and as_config(None) is DEFAULT_CONFIG
+
+
+def test_configs_are_immutable_and_cached():
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        DEFAULT_CONFIG.CAPACITOR_WIDTH = 2e-3
+    with pytest.raises(KeyError):
+        DEFAULT_CONFIG.replace(NOT_A_PARAMETER=1.0)
+    assert DEFAULT_CONFIG.V_required_full is DEFAULT_CONFIG.V_required_full
+    with pytest.raises(ValueError):
+        DEFAULT_CONFIG.V_required_full[0] = 0.0
+    fresh = PrinterConfig()
+    assert 'V_required_full' not in vars(fresh)
+    fresh.V_required_full
+    assert 'V_required_full' in vars(fresh)
+
+
+def test_digest_keys_parameters_and_options():
+    digest = DEFAULT_CONFIG.digest()
+    assert digest == PrinterConfig().digest() == as_config({}).digest()
+    assert len(digest) == 64
+    assert DEFAULT_CONFIG.replace(CAPACITOR_WIDTH=2e-3).digest() != digest
+    assert DEFAULT_CONFIG.digest(integrator='rk4') != digest
+    assert DEFAULT_CONFIG.digest(a=1, b=2) == DEFAULT_CONFIG.digest(b=2, a=1)
+
+
+def test_digest_is_stable_across_processes():
+    code = "from printer_config import DEFAULT_CONFIG; print(DEFAULT_CONFIG.digest(integrator='rk4'))"
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.strip()
+    assert output == DEFAULT_CONFIG.digest(integrator='rk4')
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from conftest import assert_same
+from printer_config import DEFAULT_CONFIG
+from printhead import nozzle_positions, simulate_printhead, throughput
+from simulation import simulate
+
+@pytest.mark.parametrize('integrator', [None, 'rk4'])
+def test_every_nozzle_matches_simulate(integrator):
+    rng = np.random.default_rng(1)
+    voltages = rng.uniform(-3000.0, 3000.0, (4, 200))    # Some of each nozzle strike a plate
+    head = simulate_printhead(voltages=voltages, integrator=integrator)
+    assert head.n_nozzles == 4
+    np.testing.assert_allclose(head.nozzle_x, nozzle_positions(n_nozzles=4))
+    for i in range(4):
+        assert_same(head.nozzle(i), simulate(voltages=voltages[i], integrator=integrator))
+    table = head.nozzle_table()
+    np.testing.assert_array_equal(table['n_failed'], head.hit_plate.sum(axis=1))
+    np.testing.assert_allclose(table['V_max'], np.abs(voltages).max(axis=1))
+
+
+def test_shared_schedule_is_fired_by_every_nozzle():
+    head = simulate_printhead(DEFAULT_CONFIG.replace(NOZZLE_COUNT=3))
+    assert head.voltage.shape == (3, DEFAULT_CONFIG.N_dots_total)
+    expected = simulate()
+    for i in range(3):
+        assert_same(head.nozzle(i), expected)
+    np.testing.assert_array_equal(head.n_failed, expected.hit_plate.sum())
+
+
+def test_schedule_shape_must_match_the_nozzles():
+    with pytest.raises(ValueError, match='shape'):
+        simulate_printhead(voltages=np.zeros((3, 10)), n_nozzles=2)
+
+
+def test_throughput_scales_with_the_head():
+    table = throughput(nozzle_counts=(1, 8))
+    columns = DEFAULT_CONFIG.N_columns_total
+    np.testing.assert_array_equal(table['passes'], [columns, -(-columns // 8)])
+    assert table['pages_per_minute'][1] > 7 * table['pages_per_minute'][0]
@@ -0,0 +1,145 @@
+import struct
+import zlib
+import numpy as np
+import pytest
+from PIL import Image
+from printer_config import DEFAULT_CONFIG
+from raster import LUMA, firing_schedule, scan_lines
+from simulation import simulate
+
+
+def decode(path):
+    lines = scan_lines(path)
+    width, height = next(lines)
+    image = np.array(list(lines))
+    assert image.shape == (height, width)
+    return image
+
+
+def expected_darkness(image):
+    """Darkness of a PIL image with alpha composited over white, as scan_lines defines it."""
+    rgba = np.asarray(image.convert('RGBA'), dtype=float) / 255
+    lightness = rgba[..., :3] @ LUMA
+    return 1 - (lightness * rgba[..., 3] + 1 - rgba[..., 3])
+
+
+def random_image(mode, size=(37, 23), seed=0):
+    rng = np.random.default_rng(seed)
+    if mode == 'P':
+        image = Image.fromarray(rng.integers(0, 256, size[::-1] + (3,), dtype=np.uint8), 'RGB')
+        return image.quantize(16)
+    if mode == '1':
+        return Image.fromarray(rng.random(size[::-1]) > 0.5)
+    bands = len(Image.new(mode, (1, 1)).getbands())
+    shape = size[::-1] + ((bands,) if bands > 1 else ())
+    return Image.fromarray(rng.integers(0, 256, shape, dtype=np.uint8), mode)
+
+
+@pytest.mark.parametrize('mode', ['1', 'L', 'LA', 'RGB', 'RGBA', 'P'])
+def test_png_matches_pil(tmp_path, mode):
+    image = random_image(mode)
+    path = tmp_path / 'image.png'
+    image.save(path)
+    np.testing.assert_allclose(decode(path), expected_darkness(Image.open(path)), atol=1e-12)
+
+
+@pytest.mark.parametrize('mode, suffix', [('1', '.pbm'), ('L', '.pgm'), ('RGB', '.ppm')])
+def test_raw_pnm_matches_pil(tmp_path, mode, suffix):
+    image = random_image(mode)
+    path = tmp_path / f'image{suffix}'
+    image.save(path)
+    np.testing.assert_allclose(decode(path), expected_darkness(Image.open(path)), atol=1e-12)
+
+
+def test_plain_pnm(tmp_path):
+    pixels = np.array([[0, 1, 1], [1, 0, 0]])
+    (tmp_path / 'plain.pbm').write_text('P1\n# comment\n3 2\n011\n1 0 0\n')
+    np.testing.assert_array_equal(decode(tmp_path / 'plain.pbm'), pixels)
+    (tmp_path / 'plain.pgm').write_text('P2\n3 2\n4\n4 0 0\n0 4 2\n')
+    np.testing.assert_allclose(decode(tmp_path / 'plain.pgm'), [[0, 1, 1], [1, 0, 0.5]])
+
+
+def _filter_line(kind, line, prior, bpp):
+    """Reference PNG filter of one scan line; filters predict from the unfiltered bytes."""
+    x, b = line.astype(int), prior.astype(int)
+    a = np.concatenate([np.zeros(bpp, dtype=int), x[:-bpp]])
+    c = np.concatenate([np.zeros(bpp, dtype=int), b[:-bpp]])
+    p = a + b - c
+    pa, pb, pc = np.abs(p - a), np.abs(p - b), np.abs(p - c)
+    paeth = np.where((pa <= pb) & (pa <= pc), a, np.where(pb <= pc, b, c))
+    predictor = (0 * x, a, b, (a + b) // 2, paeth)[kind]
+    return bytes([kind]) + ((x - predictor) & 0xFF).astype(np.uint8).tobytes()
+
+
+def _write_png(path, pixels, kinds, idat_size):
+    """8-bit RGB PNG with the given filter type per line, split into IDAT chunks of idat_size bytes."""
+    height, width, _ = pixels.shape
+    prior = np.zeros(width * 3, dtype=np.uint8)
+    stream = []
+    for row, kind in zip(pixels, kinds):
+        line = row.astype(np.uint8).ravel()
+        stream.append(_filter_line(kind, line, prior, 3))
+        prior = line
+    compressed = zlib.compress(b''.join(stream), 9)
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+        for start in range(0, len(compressed), idat_size):
+            f.write(chunk(b'IDAT', compressed[start:start + idat_size]))
+        f.write(chunk(b'IEND', b''))
+
+
+@pytest.mark.parametrize('idat_size', [7, 1 << 30])
+def test_png_every_filter_type_and_chunking(tmp_path, idat_size):
+    rng = np.random.default_rng(1)
+    # More lines than one unfilter block, so the last lines come from draining the inflater
+    pixels = rng.integers(0, 256, (600, 41, 3))
+    pixels[:300] //= 64      # Compressible upper half
+    kinds = rng.integers(0, 5, len(pixels))
+    path = tmp_path / 'filters.png'
+    _write_png(path, pixels, kinds, idat_size)
+    np.testing.assert_allclose(decode(path), 1 - pixels @ LUMA / 255, atol=1e-12)
+
+
+def test_png_highly_compressed_single_idat_keeps_its_last_lines(tmp_path):
+    # A few input bytes inflate to many lines; the inflater must be drained after the input runs out
+    pixels = np.zeros((3000, 50, 3), dtype=int)
+    pixels[-1] = 255
+    path = tmp_path / 'blank.png'
+    _write_png(path, pixels, np.zeros(len(pixels), dtype=int), 1 << 30)
+    np.testing.assert_allclose(decode(path), 1 - pixels @ LUMA / 255, atol=1e-12)
+
+
+# An 'F' is asymmetric both ways: a transposed or mirrored print is not an 'F'
+GLYPH_F = np.array([
+    [1, 1, 1, 1, 1],
+    [1, 0, 0, 0, 0],
+    [1, 1, 1, 1, 0],
+    [1, 0, 0, 0, 0],
+    [1, 0, 0, 0, 0],
+    [1, 0, 0, 0, 0],
+    [1, 0, 0, 0, 0],
+])
+
+
+def test_glyph_prints_upright(tmp_path):
+    path = tmp_path / 'f.pbm'
+    height, width = GLYPH_F.shape
+    path.write_text(f"P1\n{width} {height}\n" + '\n'.join(' '.join(map(str, row)) for row in GLYPH_F) + '\n')
+
+    p = DEFAULT_CONFIG
+    y_pitch = 2 * p.y_full_max_deflection / (p.N_dots_total - 1)
+    printed = np.zeros_like(GLYPH_F)
+    for batch in firing_schedule(path, p):
+        assert np.all(np.diff(batch.fire_time) > 0)     # The sweep runs down from the top
+        assert batch.fire_time[0] >= batch.column * p.N_dots_total * p.T_interval
+        rows = np.rint((p.y_full_max_deflection - batch.target_y) / y_pitch).astype(int)
+        landing_y = simulate(p, batch.voltage).landing_y
+        landed = np.isfinite(landing_y)     # Dots at the very top may strike a plate
+        np.testing.assert_allclose(landing_y[landed], batch.target_y[landed], rtol=1e-12)
+        printed[rows, batch.column] = 1
+    np.testing.assert_array_equal(printed, GLYPH_F)
+    assert next(firing_schedule(path, p)).target_y[0] == p.y_full_max_deflection
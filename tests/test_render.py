@@ -0,0 +1,32 @@
+from functools import partial
+import numpy as np
+import pytest
+from render import module_animation, plate_animation, render_frames, segment_bounds
+
+
+def _segment(factory, start, stop):
+    return [frame.copy() for frame in render_frames(factory, start, stop, dpi=30)]
+
+
+@pytest.mark.parametrize('n_frames, n_segments', [(100, 8), (7, 3), (3, 8), (1, 1)])
+def test_segments_cover_every_frame_once(n_frames, n_segments):
+    bounds = segment_bounds(n_frames, n_segments)
+    assert len(bounds) == min(n_frames, n_segments)
+    assert bounds[0][0] == 0 and bounds[-1][1] == n_frames
+    assert all(stop == next_start for (_, stop), (next_start, _) in zip(bounds, bounds[1:]))
+    assert all(stop > start for start, stop in bounds)
+
+
+def test_script5_segment_is_deterministic_in_a_reused_process():
+    # A pool worker may render several segments with the same cached module
+    factory = partial(module_animation, 'script5')
+    serial = _segment(factory, 0, 8)
+    again = _segment(factory, 5, 8)
+    assert all(np.array_equal(a, b) for a, b in zip(serial[5:], again))
+
+
+def test_plate_segment_matches_serial_render():
+    factory = partial(plate_animation, None, 50)
+    serial = _segment(factory, 0, 6)
+    again = _segment(factory, 3, 6)
+    assert all(np.array_equal(a, b) for a, b in zip(serial[3:], again))
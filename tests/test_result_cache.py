@@ -0,0 +1,44 @@
+import dataclasses
+import numpy as np
+from result_cache import ResultCache
+from simulation import simulate
+from sweep import run_sweep
+
+
+def assert_same_result(a, b):
+    assert type(a) is type(b)
+    for field in dataclasses.fields(a):
+        np.testing.assert_array_equal(getattr(a, field.name), getattr(b, field.name))
+
+
+def test_analytic_runs_bypass_the_cache_by_default(tmp_path):
+    cache = ResultCache(tmp_path)
+    assert_same_result(cache.simulate({'DROPLET_CHARGE': -1e-12}), simulate({'DROPLET_CHARGE': -1e-12}))
+    assert cache.entries() == []
+    assert cache.hits == cache.misses == 0
+
+
+def test_cached_result_round_trips(tmp_path):
+    cache = ResultCache(tmp_path, analytic=True)
+    first = cache.simulate({'DROPLET_CHARGE': -1e-12})
+    second = cache.simulate({'DROPLET_CHARGE': -1e-12})
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert_same_result(first, second)
+
+    integrated = ResultCache(tmp_path).simulate(voltages=first.voltage[:50], integrator='rk4')
+    assert_same_result(integrated, simulate(voltages=first.voltage[:50], integrator='rk4'))
+
+
+def test_ideal_sweep_ignores_the_cache(tmp_path):
+    points = [{'DROPLET_CHARGE': q} for q in (-1e-12, -2e-12, -5e-12)]
+    cache = ResultCache(tmp_path)
+    np.testing.assert_array_equal(run_sweep(points, workers=1, cache=cache), run_sweep(points, workers=1))
+    assert cache.entries() == []
+
+
+def test_eviction_keeps_the_cache_under_its_budget(tmp_path):
+    cache = ResultCache(tmp_path, analytic=True)
+    for q in (-1e-12, -2e-12, -3e-12):
+        cache.simulate({'DROPLET_CHARGE': q})
+    cache.evict(max_bytes=cache.size_bytes() - 1)
+    assert len(cache.entries()) == 2
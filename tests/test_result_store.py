@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from droplet_state import FAILED, LANDED, STATUS_NAMES
+from result_store import PAGE_COLUMNS, ResultStore, ResultWriter, status_codes
+from simulation import simulate
+
+
+def test_round_trip_across_chunks(tmp_path):
+    result = simulate()
+    with ResultWriter(tmp_path, chunk_size=1000, metadata={'run': 'test'}) as writer:
+        writer.append_result(result)
+        writer.append_result(result, fire_time=result.fire_time + 1.0)
+    assert writer.n_chunks == 7
+
+    store = ResultStore(tmp_path)
+    n = len(result.voltage)
+    assert len(store) == 2 * n
+    assert store.metadata == {'run': 'test'}
+    assert isinstance(store['voltage'], np.memmap)
+    np.testing.assert_array_equal(store['voltage'][:n], result.voltage)
+    np.testing.assert_array_equal(store['voltage'][n:], result.voltage)
+    np.testing.assert_array_equal(store['landing_y'][:n], result.landing_y)
+    np.testing.assert_allclose(store['fire_time'][n:], result.fire_time + 1.0, rtol=1e-15)
+    np.testing.assert_allclose(store['land_time'][n:], result.land_time + 1.0, rtol=1e-15)
+    np.testing.assert_array_equal(store['status'][:n], status_codes(result))
+
+    chunks = list(store.chunks(['status'], size=2500))
+    assert [len(chunk['status']) for chunk in chunks] == [2500, 2500, 1600]
+    counts = store.status_counts()
+    assert counts[STATUS_NAMES[FAILED]] == 2 * result.hit_plate.sum()
+    assert counts[STATUS_NAMES[LANDED]] == 2 * (~result.hit_plate).sum()
+
+
+def test_unfinished_store_cannot_be_opened(tmp_path):
+    writer = ResultWriter(tmp_path)
+    writer.append_result(simulate())
+    with pytest.raises(FileNotFoundError):
+        ResultStore(tmp_path)
+    writer.close()
+    assert len(ResultStore(tmp_path)) == len(simulate().voltage)
+
+
+def test_store_of_a_failed_run_cannot_be_opened(tmp_path):
+    with pytest.raises(RuntimeError, match='interrupted'):
+        with ResultWriter(tmp_path, chunk_size=1000) as writer:
+            writer.append_result(simulate())
+            raise RuntimeError('interrupted')
+    with pytest.raises(FileNotFoundError):
+        ResultStore(tmp_path)
+
+
+def test_missing_column_is_rejected(tmp_path):
+    with ResultWriter(tmp_path, PAGE_COLUMNS) as writer:
+        with pytest.raises(KeyError, match='column'):
+            writer.append_result(simulate(), row=0)
+        writer.append_result(simulate(), row=np.arange(3300), column=4)
+    store = ResultStore(tmp_path)
+    assert store['row'].dtype == np.int32
+    np.testing.assert_array_equal(store['column'], 4)
@@ -0,0 +1,40 @@
+import numpy as np
+
+from series_buffer import SeriesBuffer
+
+
+def test_appends_grow_past_the_capacity():
+    buffer = SeriesBuffer(2, capacity=3)
+    for i in range(10):
+        buffer.append(i, -i)
+    assert len(buffer) == 10
+    np.testing.assert_array_equal(buffer.column(0), np.arange(10))
+    np.testing.assert_array_equal(buffer.column(1), -np.arange(10))
+
+
+def test_extend_broadcasts_and_views_are_snapshots():
+    buffer = SeriesBuffer(2, capacity=4)
+    buffer.extend([1.0, 2.0, 3.0], 0.5)
+    x, y = buffer.columns()
+    np.testing.assert_array_equal(y, [0.5, 0.5, 0.5])
+    buffer.extend(np.arange(100), np.arange(100))     # Reallocates
+    np.testing.assert_array_equal(x, [1.0, 2.0, 3.0])
+    assert len(buffer) == 103
+    np.testing.assert_array_equal(buffer.column(0)[3:], np.arange(100))
+
+
+def test_views_share_memory_until_regrowth():
+    buffer = SeriesBuffer(1, capacity=8)
+    buffer.extend([1.0, 2.0])
+    first = buffer.column(0)
+    buffer.append(3.0)
+    assert np.shares_memory(first, buffer.column(0))
+
+
+def test_clear_keeps_the_storage():
+    buffer = SeriesBuffer(1)
+    buffer.extend(np.arange(5))
+    buffer.clear()
+    assert len(buffer) == 0 and buffer.column(0).size == 0
+    buffer.append(7.0)
+    np.testing.assert_array_equal(buffer.column(0), [7.0])
@@ -0,0 +1,64 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import constants
+from printer_config import DEFAULT_CONFIG
+from simulation import simulate
+
+
+def test_landed_droplets_hit_their_targets():
+    result = simulate()
+    assert result.n_droplets == int(constants.PAPER_HEIGHT * constants.PRINTER_RESOLUTION)
+    assert result.n_success + result.n_failed == result.n_droplets
+    assert 0 < result.n_failed < result.n_droplets
+    landed = ~result.hit_plate
+    np.testing.assert_allclose(result.landing_y[landed], result.target_y[landed], rtol=1e-12)
+    np.testing.assert_allclose(np.diff(result.fire_time), constants.CAPACITOR_LENGTH / constants.DROPLET_VELOCITY)
+    np.testing.assert_array_equal(result.failed_indices, np.flatnonzero(result.hit_plate))
+
+
+def test_strikes_happen_inside_the_capacitor():
+    voltages = np.linspace(-5000.0, 5000.0, 201)
+    result = simulate(voltages=voltages)
+    hit = result.hit_plate
+    assert hit.any() and not hit.all()
+    assert not hit[100]                                 # 0 V flies straight
+    np.testing.assert_array_equal(hit, hit[::-1])       # Symmetric in the sign of the voltage
+    L_gun_to_cap = constants.TOTAL_DISTANCE - constants.CAPACITOR_LENGTH - constants.CAPACITOR_DISTANCE
+    assert np.all(result.strike_x[hit] >= L_gun_to_cap)
+    assert np.all(result.strike_x[hit] <= L_gun_to_cap + constants.CAPACITOR_LENGTH)
+    assert np.all(np.abs(result.strike_y[hit]) <= constants.CAPACITOR_WIDTH / 2 * (1 + 1e-12))
+    assert np.isnan(result.landing_y[hit]).all() and np.isnan(result.strike_time[~hit]).all()
+
+
+def test_overrides():
+    wider = simulate({'CAPACITOR_WIDTH': constants.CAPACITOR_WIDTH * 4})
+    assert wider.n_failed < simulate().n_failed
+    with pytest.raises(KeyError):
+        simulate({'NOT_A_PARAMETER': 1.0})
+
+
+def test_headless():
+    code = "import sys, simulation; simulation.simulate(); assert 'matplotlib' not in sys.modules"
+    subprocess.run([sys.executable, '-c', code], check=True, cwd=os.path.dirname(os.path.dirname(__file__)))
+
+
+@pytest.mark.parametrize('integrator', [None, 'rk4'])
+def test_nan_slots_fire_nothing(integrator):
+    voltages = DEFAULT_CONFIG.V_required_full[1500:1800:10]
+    schedule = np.full(10 * len(voltages), np.nan)
+    schedule[::10] = voltages
+    result = simulate(voltages=schedule, integrator=integrator)
+    packed = simulate(voltages=voltages, integrator=integrator)
+    assert result.n_droplets == len(voltages)
+    assert result.n_failed == packed.n_failed
+    np.testing.assert_allclose(result.fire_time, np.arange(len(schedule)) * DEFAULT_CONFIG.T_interval)
+    np.testing.assert_array_equal(result.landing_y[::10], packed.landing_y)
+    np.testing.assert_allclose(result.land_time[::10] - result.fire_time[::10], packed.land_time - packed.fire_time,
+                               rtol=1e-12)
+    blank = np.isnan(schedule)
+    assert np.isnan(result.landing_y[blank]).all() and not result.hit_plate[blank].any()
@@ -0,0 +1,37 @@
+import numpy as np
+
+import constants
+from simulation import simulate
+from sweep import SCRIPT4_VARIANTS, grid, run_sweep, save_table
+
+
+def test_grid_is_the_cartesian_product():
+    points = grid(CAPACITOR_LENGTH=[1e-3, 2e-3], DROPLET_VELOCITY=[10.0, 20.0, 30.0])
+    assert len(points) == 6
+    assert points[0] == {'CAPACITOR_LENGTH': 1e-3, 'DROPLET_VELOCITY': 10.0}
+    assert points[-1] == {'CAPACITOR_LENGTH': 2e-3, 'DROPLET_VELOCITY': 30.0}
+
+
+def test_rows_match_simulate():
+    table = run_sweep(SCRIPT4_VARIANTS, workers=1)
+    names = sorted(name for point in SCRIPT4_VARIANTS for name in point)
+    assert table.dtype.names[:len(names)] == tuple(names)
+    for row, point in zip(table, SCRIPT4_VARIANTS):
+        result = simulate(point)
+        for name in names:
+            assert row[name] == point.get(name, getattr(constants, name))
+        assert row['n_droplets'] == result.n_droplets
+        assert row['n_failed'] == result.n_failed
+        assert row['success_rate'] == result.n_success / result.n_droplets
+        assert row['V_max'] == np.max(np.abs(result.voltage))
+
+
+def test_process_pool_gives_the_same_table(tmp_path):
+    points = grid(CAPACITOR_WIDTH=[1e-3, 2e-3, 4e-3], DROPLET_VELOCITY=[10.0, 20.0])
+    serial = run_sweep(points, workers=1)
+    np.testing.assert_array_equal(run_sweep(points, workers=2), serial)
+
+    save_table(serial, tmp_path / 'sweep.csv')
+    saved = np.genfromtxt(tmp_path / 'sweep.csv', delimiter=',', names=True)
+    assert saved.dtype.names == serial.dtype.names
+    np.testing.assert_allclose(saved['n_failed'], serial['n_failed'])
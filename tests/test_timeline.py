@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from timeline import compile_timeline
+
+T_INTERVAL = 1e-4
+T_FLIGHT = 5.3e-4   # Not a multiple of the frame step, so no event sits on a frame boundary
+
+
+def events_by_brute_force(times, frame_times):
+    """Droplets whose event falls in (frame_times[f-1], frame_times[f]] for every frame f."""
+    lower = np.concatenate([[-np.inf], frame_times[:-1]])
+    upper = np.concatenate([frame_times[:-1], [np.inf]])
+    return [np.flatnonzero((times > lo) & (times <= hi)) for lo, hi in zip(lower, upper)]
+
+
+@pytest.mark.parametrize('decimate', [1, 3, 40])
+def test_every_event_is_in_exactly_one_frame(decimate):
+    fire_time = np.arange(25) * T_INTERVAL
+    voltage = np.linspace(-1.0, 1.0, 25)
+    strike_time = np.full(25, np.nan)
+    strike_time[[3, 17]] = fire_time[[3, 17]] + 2.1e-4
+    timeline = compile_timeline(fire_time, voltage, T_FLIGHT, T_INTERVAL / 4, strike_time, decimate=decimate)
+    assert timeline.frame_times[-1] >= fire_time[-1] + T_FLIGHT
+
+    land_time = np.where(np.isnan(strike_time), fire_time + T_FLIGHT, np.nan)
+    for kind, times in (('fired', fire_time), ('landed', land_time), ('struck', strike_time)):
+        expected = events_by_brute_force(times, timeline.frame_times)
+        for frame in range(timeline.n_frames):
+            np.testing.assert_array_equal(getattr(timeline, kind)(frame), expected[frame], err_msg=kind)
+    assert sum(len(timeline.landed(f)) for f in range(timeline.n_frames)) == 23
+    assert sum(len(timeline.struck(f)) for f in range(timeline.n_frames)) == 2
+
+
+def test_in_flight_window_and_voltage():
+    fire_time = np.arange(25) * T_INTERVAL
+    voltage = np.arange(25.0)
+    timeline = compile_timeline(fire_time, voltage, T_FLIGHT, T_INTERVAL / 4)
+    for frame, t in enumerate(timeline.frame_times):
+        flying = np.flatnonzero((fire_time <= t) & (t - fire_time < T_FLIGHT))
+        np.testing.assert_array_equal(timeline.in_flight(frame), flying)
+        fired = np.flatnonzero(fire_time <= t)
+        assert timeline.voltage[frame] == voltage[fired[-1]]
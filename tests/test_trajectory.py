@@ -0,0 +1,71 @@
+import numpy as np
+
+from trajectory import (AFTER_CAPACITOR, BEFORE_CAPACITOR, INSIDE_CAPACITOR, calculate_positions,
+                        solve_plate_collisions)
+
+KINEMATICS = dict(charge=-1.5e-13, mass=6.5e-11, W=1e-3, Vx=20.0, L_gun_to_cap=8e-3, L_cap=1.5e-3)
+
+
+def scalar_position(V, t_flight, charge, mass, W, Vx, L_gun_to_cap, L_cap):
+    """The per-droplet calculate_position the animations used to call in a loop."""
+    a_y = (charge / mass) * (V / W)
+    x = Vx * t_flight
+    if x <= L_gun_to_cap:
+        return x, 0.0, BEFORE_CAPACITOR
+    if x <= L_gun_to_cap + L_cap:
+        return x, 0.5 * a_y * (t_flight - L_gun_to_cap / Vx)**2, INSIDE_CAPACITOR
+    t_inside = L_cap / Vx
+    t_outside = t_flight - (L_gun_to_cap + L_cap) / Vx
+    return x, 0.5 * a_y * t_inside**2 + a_y * t_inside * t_outside, AFTER_CAPACITOR
+
+
+def test_matches_the_scalar_kernel():
+    voltages = np.linspace(-400.0, 400.0, 41)
+    idx = np.arange(len(voltages))[:, None]
+    t_flight = np.linspace(0.0, 1.2e-3, 97)[None, :]
+    x, y, V, region = calculate_positions(idx, t_flight, voltages, **KINEMATICS)
+    assert x.shape == y.shape == V.shape == region.shape == (41, 97)
+    for i in range(0, 41, 5):
+        for j in range(97):
+            expected = scalar_position(voltages[i], t_flight[0, j], **KINEMATICS)
+            assert x[i, j] == expected[0]
+            assert np.isclose(y[i, j], expected[1], rtol=1e-13, atol=0)
+            assert region[i, j] == expected[2]
+            assert V[i, j] == voltages[i]
+    assert set(np.unique(region)) == {BEFORE_CAPACITOR, INSIDE_CAPACITOR, AFTER_CAPACITOR}
+
+
+def test_broadcasts_flat_batches():
+    voltages = np.array([-100.0, 0.0, 250.0])
+    _, y, _, _ = calculate_positions([0, 1, 2, 2], [1e-3, 1e-3, 1e-3, 2e-4], voltages, **KINEMATICS)
+    assert y[1] == 0.0 and y[3] == 0.0
+    assert np.sign(y[0]) == -np.sign(y[2])
+
+
+def test_plate_collisions_match_fine_sampling():
+    radius = 2.5e-5
+    voltages = np.linspace(-2e5, 2e5, 61)
+    collisions = solve_plate_collisions(voltages, radius=radius, **KINEMATICS)
+    t_enter = KINEMATICS['L_gun_to_cap'] / KINEMATICS['Vx']
+    t = t_enter + np.linspace(0.0, KINEMATICS['L_cap'] / KINEMATICS['Vx'], 20001)
+    _, y, _, _ = calculate_positions(np.arange(61)[:, None], t[None, :], voltages, **KINEMATICS)
+    touching = np.abs(y) + radius >= KINEMATICS['W'] / 2
+    hit = touching.any(axis=1)
+    assert hit.any() and not hit.all()
+    np.testing.assert_array_equal(collisions.hit, hit)
+
+    dt = t[1] - t[0]
+    first = t[np.argmax(touching[hit], axis=1)]
+    np.testing.assert_allclose(collisions.t_strike[hit], first, rtol=0, atol=dt)
+    np.testing.assert_allclose(collisions.x_strike[hit], KINEMATICS['Vx'] * collisions.t_strike[hit])
+    np.testing.assert_allclose(np.abs(collisions.y_strike[hit]), KINEMATICS['W'] / 2 - radius)
+    np.testing.assert_allclose(collisions.margin, KINEMATICS['W'] / 2 - radius - np.abs(y[:, -1]), atol=1e-12)
+    assert np.isnan(collisions.t_strike[~hit]).all()
+
+
+def test_fast_pass_cannot_tunnel_through_a_plate():
+    # Crosses the whole gap in far less than one 10 us animation frame
+    collisions = solve_plate_collisions([1e7], radius=0.0, **KINEMATICS)
+    t_enter = KINEMATICS['L_gun_to_cap'] / KINEMATICS['Vx']
+    assert collisions.hit[0]
+    assert t_enter < collisions.t_strike[0] < t_enter + 1e-5
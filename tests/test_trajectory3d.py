@@ -0,0 +1,43 @@
+import numpy as np
+
+import trajectory3d
+from trajectory3d import calculate_landings, calculate_trajectories
+
+
+def scalar_trajectory(V1, V2, num_points=20):
+    """The per-point loop script5 used before, one droplet at a time."""
+    q_over_m, v_x = trajectory3d.q_over_m, trajectory3d.v_x
+    L1a, L1b, W1, W2 = trajectory3d.L1a, trajectory3d.L1b, trajectory3d.W1, trajectory3d.W2
+    a_y1, a_x2 = q_over_m * V1 / W1, q_over_m * V2 / W2
+    t_cap1, t_cap2 = L1a / v_x, L1b / v_x
+    points = []
+    for z in np.linspace(0, trajectory3d.paper_z, num_points):
+        if z <= L1a:
+            x, y = 0.0, 0.5 * a_y1 * (z / v_x)**2
+        elif z <= L1a + L1b:
+            t_in = (z - L1a) / v_x
+            x, y = 0.5 * a_x2 * t_in**2, 0.5 * a_y1 * t_cap1**2 + a_y1 * t_cap1 * t_in
+        else:
+            t_drift = (z - L1a - L1b) / v_x
+            x = 0.5 * a_x2 * t_cap2**2 + a_x2 * t_cap2 * t_drift
+            y = 0.5 * a_y1 * t_cap1**2 + a_y1 * t_cap1 * (t_cap2 + t_drift)
+        points.append((x, y, z))
+    return np.array(points)
+
+
+def test_batch_matches_the_scalar_loop():
+    rng = np.random.default_rng(3)
+    V1, V2 = rng.uniform(-5.0, 5.0, (2, 30))
+    trajectories = calculate_trajectories(V1, V2, num_points=33)
+    assert trajectories.shape == (30, 33, 3)
+    for i in range(30):
+        np.testing.assert_allclose(trajectories[i], scalar_trajectory(V1[i], V2[i], 33), rtol=1e-12, atol=1e-18)
+
+
+def test_landings_are_the_last_trajectory_point():
+    V1, V2 = np.array([-2.0, 0.0, 3.0]), np.array([1.0, -4.0, 0.0])
+    x, y = calculate_landings(V1, V2)
+    end = calculate_trajectories(V1, V2)[:, -1]
+    np.testing.assert_allclose(x, end[:, 0], rtol=1e-12)
+    np.testing.assert_allclose(y, end[:, 1], rtol=1e-12)
+    assert x[2] == 0.0 and y[1] == 0.0
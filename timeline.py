@@ -0,0 +1,93 @@
+import numpy as np
+from dataclasses import dataclass
+
+
+@dataclass
+class Timeline:
+    """Per-frame animation table: in-flight window, fire/land/strike events and voltage.
+
+    Events are stored CSR-style: the droplets of kind `k` whose event time
+    falls in (frame_times[f-1], frame_times[f]] are
+    k_events[k_offsets[f]:k_offsets[f+1]], so a frame never misses an event
+    however coarse the frame step is.
+    """
+    frame_times: np.ndarray
+    firing_index: np.ndarray    # Last droplet fired at each frame
+    window_start: np.ndarray    # In-flight droplets are window_start <= i < window_end
+    window_end: np.ndarray
+    voltage: np.ndarray         # Deflection voltage applied at each frame
+    fire_events: np.ndarray
+    fire_offsets: np.ndarray
+    land_events: np.ndarray
+    land_offsets: np.ndarray
+    strike_events: np.ndarray
+    strike_offsets: np.ndarray
+
+    @property
+    def n_frames(self):
+        return len(self.frame_times)
+
+    def fired(self, frame):
+        return self.fire_events[self.fire_offsets[frame]:self.fire_offsets[frame + 1]]
+
+    def landed(self, frame):
+        return self.land_events[self.land_offsets[frame]:self.land_offsets[frame + 1]]
+
+    def struck(self, frame):
+        return self.strike_events[self.strike_offsets[frame]:self.strike_offsets[frame + 1]]
+
+    def in_flight(self, frame):
+        return np.arange(self.window_start[frame], self.window_end[frame])
+
+
+def _bucket_events(event_times, frame_times):
+    """Groups droplets by the frame their event falls in; NaN times are dropped."""
+    droplets = np.flatnonzero(~np.isnan(event_times))
+    # Frame f covers (t[f-1], t[f]]; anything after the last frame lands in it
+    frames = np.searchsorted(frame_times, event_times[droplets], side='left')
+    frames = np.minimum(frames, len(frame_times) - 1)
+
+    order = np.argsort(frames, kind='stable')
+    offsets = np.searchsorted(frames[order], np.arange(len(frame_times) + 1), side='left')
+    return droplets[order], offsets
+
+
+def compile_timeline(fire_time, voltage, T_total_flight, time_step, strike_time=None, decimate=1):
+    """Precomputes the animation timeline for droplets fired at `fire_time`.
+
+    Frames are `time_step * decimate` apart and run until the last droplet has
+    landed. Droplets with a finite `strike_time` (absolute time) hit a plate
+    then instead of landing.
+    """
+    fire_time = np.asarray(fire_time, dtype=float)
+    voltage = np.asarray(voltage, dtype=float)
+    if strike_time is None:
+        strike_time = np.full(len(fire_time), np.nan)
+    land_time = np.where(np.isnan(strike_time), fire_time + T_total_flight, np.nan)
+
+    frame_step = time_step * decimate
+    T_last_land = fire_time[-1] + T_total_flight
+    n_frames = int(np.ceil(T_last_land / frame_step)) + 1
+    frame_times = np.arange(n_frames) * frame_step
+
+    fired_count = np.searchsorted(fire_time, frame_times, side='right')
+    firing_index = np.clip(fired_count - 1, 0, len(fire_time) - 1)
+    window_start = np.searchsorted(fire_time, frame_times - T_total_flight, side='right')
+
+    fire_events, fire_offsets = _bucket_events(fire_time, frame_times)
+    land_events, land_offsets = _bucket_events(land_time, frame_times)
+    strike_events, strike_offsets = _bucket_events(np.asarray(strike_time, dtype=float), frame_times)
+
+    return Timeline(
+        frame_times=frame_times,
+        firing_index=firing_index,
+        window_start=window_start,
+        window_end=fired_count,
+        voltage=voltage[firing_index],
+        fire_events=fire_events,
+        fire_offsets=fire_offsets,
+        land_events=land_events,
+        land_offsets=land_offsets,
+        strike_events=strike_events,
+        strike_offsets=strike_offsets,
+    )
@@ -0,0 +1,90 @@
+import numpy as np
+from dataclasses import dataclass
+from constants import DROPLET_DIAMETER, DROPLET_CHARGE, DROPLET_VELOCITY, CAPACITOR_WIDTH, CAPACITOR_LENGTH
+from calculations import m, L_gun_to_cap
+
+# Region codes returned by calculate_positions
+BEFORE_CAPACITOR = 0
+INSIDE_CAPACITOR = 1
+AFTER_CAPACITOR = 2
+
+REGION_NAMES = ('before_capacitor', 'inside_capacitor', 'after_capacitor')
+
+
+def calculate_positions(idx, t_flight, V_required, charge=DROPLET_CHARGE, mass=m,
+                        W=CAPACITOR_WIDTH, Vx=DROPLET_VELOCITY,
+                        L_gun_to_cap=L_gun_to_cap, L_cap=CAPACITOR_LENGTH):
+    """Vectorized droplet position for arrays of droplet indices and flight times.
+
+    `idx` and `t_flight` may have any broadcastable shapes. Returns the arrays
+    (x, y, V, region) where region holds BEFORE/INSIDE/AFTER_CAPACITOR codes.
+    """
+    idx, t_flight = np.broadcast_arrays(np.asarray(idx, dtype=np.intp),
+                                        np.asarray(t_flight, dtype=float))
+    V = np.asarray(V_required, dtype=float)[idx]
+    a_y = (charge / mass) * (V / W)
+    x = Vx * t_flight
+
+    before = x <= L_gun_to_cap
+    inside = ~before & (x <= L_gun_to_cap + L_cap)
+
+    # Time spent inside the capacitor and drifting after it
+    t_cap = L_cap / Vx
+    t_inside = t_flight - (L_gun_to_cap / Vx)
+    t_outside = t_flight - (L_gun_to_cap + L_cap) / Vx
+    V_y_exit = a_y * t_cap
+    y_exit = 0.5 * a_y * t_cap**2
+
+    y = np.select([before, inside],
+                  [0.0, 0.5 * a_y * t_inside**2],
+                  y_exit + V_y_exit * t_outside)
+    region = np.select([before, inside],
+                       [BEFORE_CAPACITOR, INSIDE_CAPACITOR],
+                       AFTER_CAPACITOR).astype(np.int8)
+
+    return x, y, V, region
+
+
+@dataclass
+class PlateCollisions:
+    """Closed-form plate collision result for every droplet of a job."""
+    hit: np.ndarray        # True where the droplet strikes a plate
+    t_strike: np.ndarray   # Flight time since firing of the strike (NaN if none)
+    x_strike: np.ndarray   # Droplet centre at the strike (NaN if none)
+    y_strike: np.ndarray
+    margin: np.ndarray     # Closest approach of the droplet surface to a plate (<= 0 on a strike)
+
+
+def solve_plate_collisions(V, radius=DROPLET_DIAMETER / 2, charge=DROPLET_CHARGE, mass=m,
+                           W=CAPACITOR_WIDTH, Vx=DROPLET_VELOCITY,
+                           L_gun_to_cap=L_gun_to_cap, L_cap=CAPACITOR_LENGTH):
+    """Exact capacitor plate collisions for an array of deflection voltages.
+
+    Inside the capacitor |y| = 0.5*|a_y|*t_inside**2 grows monotonically, so a
+    droplet of the given radius strikes a plate iff its surface reaches W/2
+    before its centre leaves the capacitor, and the closest approach is at the
+    exit. No time sampling is involved, so nothing can tunnel through a plate.
+    """
+    V = np.asarray(V, dtype=float)
+    a_y = (charge / mass) * (V / W)
+    t_cap = L_cap / Vx
+    gap = np.maximum(W/2 - radius, 0.0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_inside = np.sqrt(2 * gap / np.abs(a_y))
+    t_inside = np.where(gap == 0.0, 0.0, t_inside)
+
+    # The plates only matter if the capacitor is not entirely behind the gun
+    reachable = L_gun_to_cap + L_cap >= 0
+    hit = (t_inside <= t_cap) & reachable
+    margin = W/2 - radius - 0.5 * np.abs(a_y) * t_cap**2
+    margin = np.where(reachable, margin, np.inf)
+
+    # A gun placed inside the capacitor starts some way into the parabola
+    t_strike = np.where(hit, np.maximum(L_gun_to_cap / Vx + t_inside, 0.0), np.nan)
+    t_in_cap = np.minimum(t_strike - L_gun_to_cap / Vx, t_cap)
+    x_strike = Vx * t_strike
+    y_strike = 0.5 * a_y * t_in_cap**2
+
+    return PlateCollisions(hit=hit, t_strike=t_strike, x_strike=x_strike,
+                           y_strike=y_strike, margin=margin)
@@ -0,0 +1,61 @@
+import numpy as np
+
+# Two-capacitor printhead used by the 3D letter demo (script5)
+# Capacitor dimensions
+L1a = 0.01      # Capacitor 1 length (vertical deflection)
+L1b = 0.01      # Capacitor 2 length (horizontal deflection)
+W1 = 0.001
+W2 = 0.001
+L2 = 0.00125    # Drift from capacitor 2 to the paper
+
+# Physical constants
+v_x = 100  # m/s
+q_over_m = 1.397e-4 * v_x**2  # From earlier calculation
+
+# Capacitor positions along the flight axis
+cap1_z_start, cap1_z_end = 0, L1a
+cap2_z_start, cap2_z_end = L1a, L1a + L1b
+paper_z = L1a + L1b + L2
+
+
+def _deflection(t, V1, V2, q_over_m, W1, W2, t_cap1, t_cap2):
+    """(x, y) at flight times `t` (broadcast against V1, V2)."""
+    a_y1 = q_over_m * V1 / W1
+    a_x2 = q_over_m * V2 / W2
+
+    # y accelerates inside capacitor 1, then coasts at its exit velocity
+    t_in_cap1 = np.minimum(t, t_cap1)
+    y = 0.5 * a_y1 * t_in_cap1**2 + a_y1 * t_cap1 * np.maximum(t - t_cap1, 0)
+
+    # x accelerates inside capacitor 2, then coasts at its exit velocity
+    t_in_cap2 = np.clip(t - t_cap1, 0, t_cap2)
+    x = 0.5 * a_x2 * t_in_cap2**2 + a_x2 * t_cap2 * np.maximum(t - t_cap1 - t_cap2, 0)
+    return x, y
+
+
+def calculate_trajectories(V1, V2, num_points=20, q_over_m=q_over_m, v_x=v_x,
+                           W1=W1, W2=W2, L1a=L1a, L1b=L1b, L2=L2):
+    """Trajectories of all droplets, shape (n_droplets, num_points, 3) with columns x, y, z.
+
+    Every droplet is sampled at the same num_points z positions from the gun
+    (z = 0) to the paper, and the whole tensor is one broadcast evaluation.
+    """
+    V1 = np.atleast_1d(np.asarray(V1, dtype=float))[:, None]
+    V2 = np.atleast_1d(np.asarray(V2, dtype=float))[:, None]
+    z = np.linspace(0, L1a + L1b + L2, num_points)
+
+    x, y = _deflection(z / v_x, V1, V2, q_over_m, W1, W2, L1a / v_x, L1b / v_x)
+
+    trajectories = np.empty((max(len(V1), len(V2)), num_points, 3))
+    trajectories[..., 0] = x
+    trajectories[..., 1] = y
+    trajectories[..., 2] = z
+    return trajectories
+
+
+def calculate_landings(V1, V2, q_over_m=q_over_m, v_x=v_x, W1=W1, W2=W2, L1a=L1a, L1b=L1b, L2=L2):
+    """Paper hit positions (x, y) only, without sampling the flight path."""
+    V1 = np.asarray(V1, dtype=float)
+    V2 = np.asarray(V2, dtype=float)
+    t_paper = (L1a + L1b + L2) / v_x
+    return _deflection(t_paper, V1, V2, q_over_m, W1, W2, L1a / v_x, L1b / v_x)